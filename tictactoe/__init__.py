@@ -1,6 +1,37 @@
-from .config import GameConfig
-from .game import Game
-from .grid import Grid
-from .player import Player
-from .referee import Referee
-from . import __main__
+"""Tic-Tac-Toe: Remastered.
+
+Classes are imported from their modules on first access, so importing the
+package, e.g. to run `ttt`, only loads what is actually used.
+"""
+import importlib
+
+
+# Public names of the package and the modules defining them.
+_EXPORTS = {
+    'BitGrid': 'bitgrid',
+    'GameConfig': 'config',
+    'Game': 'game',
+    'GameResult': 'game',
+    'Grid': 'grid',
+    'Move': 'move',
+    'Player': 'player',
+    'Referee': 'referee',
+    'SparseGrid': 'sparsegrid',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module('.' + _EXPORTS[name], __name__), name)
+    elif name == '__main__':
+        value = importlib.import_module('.__main__', __name__)
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    globals()[name] = value  # Later lookups don't go through __getattr__.
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
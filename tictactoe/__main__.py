@@ -1,16 +1,33 @@
-from tictactoe import Game, GameConfig
+import sys
+
 
 def main(args=None):
-    """Main program routine."""    
+    """Main program routine.
+
+    `ttt -v` shows messages of loading and initializing the game and
+    `ttt serve` hosts games over TCP instead, see `tictactoe.server`.
+    Arguments are checked by hand, as argparse would double the startup time,
+    and modules are imported once they are needed.
+    """
+    args = sys.argv[1:] if args is None else args
+    if args and args[0] == 'serve':
+        from tictactoe import server
+        return server.main(args[1:])
+
+    verbose = '-v' in args or '--verbose' in args
+
     print("=======================\nTic-Tac-Toe: Remastered\n=======================")
 
-    config = GameConfig('config.json')  
-    # Note that config.json is exptected to be found in project root.
+    from tictactoe.config import GameConfig
+    config = GameConfig('config.json', verbose)
+    # Note that config.json is looked up in current directory and project root.
 
     if config.is_valid():
         # Intialize Game instance when we are sure the config is valid.
-        game = Game(config)
-        game.run()
+        from tictactoe.game import Game
+        from tictactoe.renderer import AnsiRenderer
+        with Game(config, AnsiRenderer(verbose=verbose)) as game:
+            game.run()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,231 @@
+import random
+
+from .lines import DIRECTIONS, flat_line_index
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, boards are kept in lists without it.
+    np = None
+
+
+class BatchGrid:
+    """Batch of grids which are checked and played on together.
+
+    With NumPy the boards are one int8 array of shape (B, size, size). Wins
+    are found with sliding window sums along the four line directions and
+    legal moves, full grids and moves are computed for all boards at once.
+    Without NumPy, or with `use_numpy` set to False, boards are lists of flat
+    positions checked with the line index, so the same code runs everywhere.
+
+    Positions hold 0 when free, otherwise the seat of the player, counted
+    from 1 in order of turns. Moves are flat positions, i.e. `x * size + y`,
+    and -1 stands for no move on a board.
+
+    Args:
+        batch (int): Number of boards B.
+        size (int): Size of the grids.
+        players (int): Number of players.
+        win_length (int): Number of positions in a winning line, from 2 up to
+            the size of the grids.
+        win_condition (str): Either "standard" or "corners".
+        seed (int): Seed of the random generator of `random_moves` (optional).
+        use_numpy (bool): Use NumPy if it's installed.
+
+    Attributes:
+        boards: Array of shape (B, size, size) or B lists of flat positions.
+        numpy (bool): True if the boards are a NumPy array.
+    """
+    def __init__(self, batch, size, players=2, win_length=3,
+                 win_condition='standard', seed=None, use_numpy=True):
+        if not 2 <= win_length <= size:
+            raise ValueError('Winning lines need 2 up to {} positions.'.format(size))
+        self.batch = batch
+        self.size = size
+        self.players = players
+        self.win_length = win_length
+        self.win_condition = win_condition
+        self.numpy = use_numpy and np is not None
+        if self.numpy:
+            self.rng = np.random.default_rng(seed)
+        else:
+            self.rng = random.Random(seed)
+            self.lines = flat_line_index(size, win_length, win_condition).lines
+        self.reset()
+
+    def reset(self):
+        """Free all positions of all boards."""
+        if self.numpy:
+            self.boards = np.zeros((self.batch, self.size, self.size), np.int8)
+        else:
+            self.boards = [ [0] * self.size ** 2 for _ in range(self.batch) ]
+
+    def load(self, i, grid, chars):
+        """Copy a Grid to board i.
+
+        Args:
+            i (int): Number of the board.
+            grid (Grid): The grid instance to be copied.
+            chars (list): Chars of the players in order of their turns.
+        """
+        cells = [ chars.index(value) + 1 if value else 0
+                  for row in grid for value in row ]
+        if self.numpy:
+            self.boards[i] = np.array(cells, np.int8).reshape(self.size, self.size)
+        else:
+            self.boards[i] = cells
+
+    def cells(self, i):
+        """Return list of flat positions of board i."""
+        if self.numpy:
+            return self.boards[i].ravel().tolist()
+        return list(self.boards[i])
+
+    def legal_moves(self):
+        """Return masks of free positions of all boards, as a bool array of
+        shape (B, size * size) or as B lists of bools."""
+        if self.numpy:
+            return self.boards.reshape(self.batch, -1) == 0
+        return [ [ not value for value in board ] for board in self.boards ]
+
+    def full(self):
+        """Return which boards are full, as a bool array or list."""
+        if self.numpy:
+            return self.boards.all(axis=(1, 2))
+        return [ all(board) for board in self.boards ]
+
+    def play(self, moves, seats):
+        """Take positions on all boards.
+
+        Args:
+            moves (sequence): Flat position for every board, -1 to skip it.
+            seats (int or sequence): Seat of the player on every board.
+        """
+        if self.numpy:
+            moves = np.asarray(moves)
+            seats = np.broadcast_to(np.asarray(seats, np.int8), moves.shape)
+            boards = np.flatnonzero(moves >= 0)
+            self.boards.reshape(self.batch, -1)[boards, moves[boards]] = seats[boards]
+            return
+        if isinstance(seats, int):
+            seats = [seats] * self.batch
+        for board, move, seat in zip(self.boards, moves, seats):
+            if move >= 0:
+                board[move] = seat
+
+    def random_moves(self):
+        """Return a random free position of every board or -1 if it's full."""
+        if self.numpy:
+            legal = self.legal_moves()
+            keys = self.rng.random(legal.shape)
+            keys[~legal] = -1
+            moves = keys.argmax(axis=1)
+            moves[~legal.any(axis=1)] = -1
+            return moves
+        moves = []
+        for board in self.boards:
+            free = [ i for i, value in enumerate(board) if not value ]
+            moves.append(self.rng.choice(free) if free else -1)
+        return moves
+
+    def winners(self, seats=None):
+        """Return seat of the winner of every board or 0 if nobody won.
+
+        Boards with lines of several players, which can't come up in a game,
+        return the lowest of their seats.
+
+        Args:
+            seats (iterable): Seats to be checked, defaults to all players.
+        """
+        if seats is None:
+            seats = range(1, self.players + 1)
+        if not self.numpy:
+            return [ self.board_winner(board, seats) for board in self.boards ]
+
+        winners = np.zeros(self.batch, np.int8)
+        for seat in seats:
+            taken = (self.boards == seat).astype(np.int8)
+            won = np.zeros(self.batch, bool)
+            for dx, dy in DIRECTIONS:
+                won |= self.has_run(taken, dx, dy)
+            if self.win_condition == 'corners':
+                won |= (taken[:, 0, 0] & taken[:, 0, -1] & taken[:, -1, 0]
+                        & taken[:, -1, -1]).astype(bool)
+            winners[won & (winners == 0)] = seat
+        return winners
+
+    def has_run(self, taken, dx, dy):
+        """Return which boards have `win_length` taken positions in a line
+        of the direction dx, dy.
+
+        The window sum of every line start is added up from slices of the
+        boards shifted by one position of the line at a time. Sums are int32,
+        so they don't overflow for long lines.
+
+        Args:
+            taken (ndarray): Int8 array of shape (B, size, size) with 1 on
+                positions taken by the player.
+            dx (int): Row step of the direction (0 or 1).
+            dy (int): Col step of the direction (-1, 0 or 1).
+        """
+        k = self.win_length
+        rows = self.size - dx * (k - 1)
+        cols = self.size - abs(dy) * (k - 1)
+        first_col = k - 1 if dy < 0 else 0
+        sums = np.zeros((self.batch, rows, cols), np.int32)
+        for i in range(k):
+            x = dx * i
+            y = first_col + dy * i
+            sums += taken[:, x:x + rows, y:y + cols]
+        return (sums == k).any(axis=(1, 2))
+
+    def board_winner(self, board, seats):
+        """Return seat of the winner of a list board or 0."""
+        winner = 0
+        for line in self.lines:
+            seat = board[line[0]]
+            if seat and seat in seats and (not winner or seat < winner) and \
+               all(board[i] == seat for i in line):
+                winner = seat
+        return winner
+
+
+def play_random(batch, size, players=2, win_length=3, win_condition='standard',
+                seed=None, use_numpy=True):
+    """Play a batch of games with random moves and return list of (winner
+    seat or 0 for a draw, number of turns) of every game.
+
+    All games are stepped together, one turn of every running game per step.
+
+    Args:
+        See `BatchGrid`.
+    """
+    grids = BatchGrid(batch, size, players, win_length, win_condition, seed,
+                      use_numpy)
+    winners = [0] * batch
+    turns = [0] * batch
+    running = list(range(batch))
+    for turn in range(size ** 2):
+        seat = turn % players + 1
+        moves = grids.random_moves()
+        if grids.numpy:
+            stopped = np.ones(batch, bool)
+            stopped[running] = False
+            moves[stopped] = -1
+        else:
+            done = set(range(batch)).difference(running)
+            for i in done:
+                moves[i] = -1
+        grids.play(moves, seat)
+        won = grids.winners([seat])
+        full = grids.full()
+        still_running = []
+        for i in running:
+            turns[i] = turn + 1
+            if won[i]:
+                winners[i] = int(won[i])
+            elif not full[i]:
+                still_running.append(i)
+        running = still_running
+        if not running:
+            break
+    return list(zip(winners, turns))
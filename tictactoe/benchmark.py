@@ -0,0 +1,236 @@
+import argparse
+import json
+import os.path
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from .game import Game
+from .renderer import NullRenderer
+
+
+SIZES = range(3, 11)
+PLAYER_COUNTS = (2, 3, 4)
+ENGINES = ('list', 'bitboard')
+CHARS = 'XO@#'
+
+# Python code of the startup benchmarks, run in new interpreters.
+STARTUP = {
+    'python': 'pass',
+    'import tictactoe': 'import tictactoe',
+    'import tictactoe.__main__': 'import tictactoe.__main__',
+    'game setup': 'from tictactoe import Game, GameConfig; '
+                  'from tictactoe.renderer import NullRenderer; '
+                  'Game(GameConfig("config_example.json"), NullRenderer())',
+}
+
+
+def make_game(size, players, engine='list'):
+    """Return a headless Game with AI players for the given setup."""
+    config = {
+        'grid': {'size': size, 'win_condition': 'standard', 'engine': engine},
+        'players': { 'Player {}'.format(n + 1): {'char': CHARS[n], 'ai': True}
+                     for n in range(players) },
+    }
+    return Game(config, NullRenderer())
+
+
+def make_positions(size, players, count, seed):
+    """Return a list of generated positions as lists of rows.
+
+    Every position is a grid filled with random moves of the players taking
+    turns, stopped at a random point before the grid is full.
+
+    Args:
+        size (int): Size of the grid.
+        players (int): Number of players.
+        count (int): Number of positions.
+        seed (int): Seed of the random generator.
+    """
+    rng = random.Random(seed)
+    positions = []
+    cells = [ (x, y) for x in range(size) for y in range(size) ]
+    for _ in range(count):
+        rows = [ [''] * size for _ in range(size) ]
+        order = rng.sample(cells, rng.randrange(size ** 2))
+        for turn, (x, y) in enumerate(order):
+            rows[x][y] = CHARS[turn % players]
+        positions.append((rows, order[-1] if order else (0, 0)))
+    return positions
+
+
+def hot_paths(game):
+    """Return dict of benchmarked operations taking a position's last move."""
+    grid = game.grid
+    referee = game.referee
+    player = game.players[0]
+    return {
+        'referee.check_for_winner': lambda x, y: referee.check_for_winner(),
+        'referee.check_for_winner(last move)': lambda x, y: referee.check_for_winner(x, y),
+        'grid.is_full': lambda x, y: grid.is_full(),
+        'grid.flat': lambda x, y: grid.flat(),
+        'player.ai_decide': lambda x, y: player.ai_decide(grid),
+    }
+
+
+def measure(game, operation, positions, min_time):
+    """Return ops/sec and peak memory allocated by a single call in bytes.
+
+    Every position is loaded into the grid before the operation is run on it.
+    Positions are repeated until at least `min_time` seconds were measured.
+    """
+    grid = game.grid
+    calls = 0
+    elapsed = 0.0
+    while elapsed < min_time:
+        for rows, (x, y) in positions:
+            grid.data = rows
+            start = time.perf_counter()
+            operation(x, y)
+            elapsed += time.perf_counter() - start
+            calls += 1
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for rows, (x, y) in positions:
+            grid.data = rows
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            operation(x, y)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return calls / elapsed, peak
+
+
+def run(sizes=SIZES, player_counts=PLAYER_COUNTS, engines=ENGINES,
+        positions=50, min_time=0.1, seed=0):
+    """Run the benchmark suite and return its results as a dict.
+
+    Args:
+        sizes (iterable): Grid sizes to benchmark.
+        player_counts (iterable): Numbers of players to benchmark.
+        engines (iterable): Grid engines to benchmark.
+        positions (int): Number of generated positions per setup, at least one.
+        min_time (float): Minimum measured time per operation and setup.
+        seed (int): Seed of generated positions.
+    """
+    if positions < 1:
+        raise ValueError('Benchmarks need at least one position.')
+    results = []
+    for engine in engines:
+        for size in sizes:
+            for players in player_counts:
+                game = make_game(size, players, engine)
+                setup_positions = make_positions(size, players, positions,
+                                                 seed + size * 10 + players)
+                for name, operation in hot_paths(game).items():
+                    ops, peak = measure(game, operation, setup_positions, min_time)
+                    results.append({
+                        'name': name,
+                        'engine': engine,
+                        'size': size,
+                        'players': players,
+                        'ops_per_sec': round(ops, 1),
+                        'peak_bytes': peak,
+                    })
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'positions': positions,
+        'results': results,
+    }
+
+
+def startup(runs=20):
+    """Return dict of median wall time in ms of starting a new interpreter
+    which runs the code of every startup benchmark.
+
+    Args:
+        runs (int): Number of runs of every benchmark.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for name, code in STARTUP.items():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], cwd=root, check=True,
+                           stdout=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        results[name] = round(statistics.median(times) * 1000, 2)
+    return results
+
+
+def compare(baseline, current, threshold=0.1):
+    """Return list of (result, baseline ops/sec) for results slower than the
+    baseline by more than the threshold ratio.
+
+    Args:
+        baseline (dict): Results of an earlier run.
+        current (dict): Results of the current run.
+        threshold (float): Allowed slowdown, e.g. 0.1 for 10 %.
+    """
+    def key(result):
+        return result['name'], result['engine'], result['size'], result['players']
+
+    previous = { key(result): result['ops_per_sec'] for result in baseline['results'] }
+    regressions = []
+    for result in current['results']:
+        ops = previous.get(key(result))
+        if ops and result['ops_per_sec'] < ops * (1 - threshold):
+            regressions.append((result, ops))
+    return regressions
+
+
+def main(args=None):
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description='Benchmark grid, referee and AI hot paths.')
+    parser.add_argument('-o', '--output', help='save results to a json file')
+    parser.add_argument('-c', '--compare', help='compare with results from a json file')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1)
+    parser.add_argument('-n', '--positions', type=int, default=50)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('--min-time', type=float, default=0.1)
+    parser.add_argument('--startup', action='store_true',
+                        help='benchmark startup time of new interpreters instead')
+    args = parser.parse_args(args)
+    if args.positions < 1:
+        parser.error('argument -n/--positions: needs to be at least 1')
+
+    if args.startup:
+        results = startup()
+        for name, ms in results.items():
+            print('{:40} {:>8.2f} ms'.format(name, ms))
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=4)
+        return
+
+    results = run(positions=args.positions, min_time=args.min_time, seed=args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+    for result in results['results']:
+        print('{name:40} {engine:9} {size:2}x{size:<2} {players} players '
+              '{ops_per_sec:>12.1f} ops/s {peak_bytes:>8} B'.format(**result))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold)
+        for result, ops in regressions:
+            print('Regression: {name} ({engine}, {size}x{size}, {players} players) '
+                  '{ops_per_sec:.1f} ops/s, was {0:.1f} ops/s'.format(ops, **result))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
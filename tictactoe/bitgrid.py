@@ -0,0 +1,177 @@
+from functools import lru_cache
+
+from .grid import Grid
+
+
+@lru_cache(maxsize=None)
+def run_masks(size, length):
+    """Return pairs of (shift, start mask) for every line direction.
+
+    The shift moves a bit to the next position of a line in a given direction
+    and the start mask holds all positions on which a line of the given length
+    can start without wrapping around the edge of the grid.
+
+    Args:
+        size (int): Size of the grid.
+        length (int): Number of positions in a winning line.
+    """
+    def mask(rows, cols):
+        bits = 0
+        for x in rows:
+            for y in cols:
+                bits |= 1 << (x * size + y)
+        return bits
+
+    full = range(size)
+    head = range(size - length + 1)   # Line fits to the right or below.
+    tail = range(length - 1, size)    # Line fits to the left.
+    return (
+        (1, mask(full, head)),         # Horizontal
+        (size, mask(head, full)),      # Vertical
+        (size + 1, mask(head, head)),  # Diagonal to the bottom right
+        (size - 1, mask(head, tail)),  # Diagonal to the bottom left
+    )
+
+
+class BitRow:
+    """Read and write view of a single row of a BitGrid.
+
+    Supports the same indexing as a row of the list based Grid, including
+    negative indices, so `grid[x][y]` keeps working for any grid engine.
+    """
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.x = x
+
+    def __getitem__(self, y):
+        return self.grid.cell(self.x, self.grid.index(y))
+
+    def __setitem__(self, y, char):
+        self.grid.update_cells(self.x, y, char)
+
+    def __len__(self):
+        return self.grid.size
+
+    def __iter__(self):
+        for y in range(self.grid.size):
+            yield self.grid.cell(self.x, y)
+
+
+class BitGrid(Grid):
+    """Grid engine which keeps one integer bitmask per player char.
+
+    Position x, y is represented by bit number `x * size + y`. Besides the
+    mask of every player, an occupancy mask of all taken positions is kept, so
+    full and occupied checks, free position enumeration and line checks are
+    done with bitwise operations instead of walking nested lists. The free
+    list of Grid is kept as well for random free positions.
+
+    Attributes:
+        masks (dict): Bitmask of taken positions for every player char.
+        occupied (int): Bitmask of all taken positions.
+        full_mask (int): Bitmask with all positions of the grid set.
+    """
+    def create(self):
+        self.masks = {}
+        self.occupied = 0
+        self.full_mask = (1 << self.size ** 2) - 1
+        self.index_free(list(range(self.size ** 2)))
+        self.moves = []
+        self.zobrist = 0
+
+    def clear(self):
+        self.create()
+
+    @property
+    def data(self):
+        return [ list(BitRow(self, x)) for x in range(self.size) ]
+
+    @data.setter
+    def data(self, rows):
+        self.create()
+        for x, row in enumerate(rows):
+            for y, char in enumerate(row):
+                if len(char) == 1:  # Skip empty and placeholder values
+                    self.update(x, y, char)
+
+    def __getitem__(self, x):
+        return BitRow(self, self.index(x))
+
+    def __len__(self):
+        return self.size
+
+    def cell(self, x, y):
+        """Return char on the given position or empty string if it's free."""
+        bit = 1 << (x * self.size + y)
+        if self.occupied & bit:
+            for char, mask in self.masks.items():
+                if mask & bit:
+                    return char
+        return ''
+
+    def update(self, row, col, char):
+        position = row * self.size + col
+        bit = 1 << position
+        taken = self.occupied & bit
+        if taken:
+            # Clear the previous char of the position.
+            self.zobrist ^= self.zobrist_key(position, self.cell(row, col))
+            for other in self.masks:
+                self.masks[other] &= ~bit
+        if len(char) != 1:
+            # Empty and placeholder values free the position.
+            if taken:
+                self.occupied &= ~bit
+                self.release_free(position)
+                self.moves = [ move for move in self.moves if move != position ]
+            return
+        if taken:
+            self.moves = list(self.moves)  # Char of a move was replaced
+        else:
+            self.take_free(position)
+            self.moves.append(position)
+        self.zobrist ^= self.zobrist_key(position, char)
+        self.masks[char] = self.masks.get(char, 0) | bit
+        self.occupied |= bit
+
+    def is_full(self):
+        return self.occupied == self.full_mask
+
+    def occupied_count(self):
+        return bin(self.occupied).count('1')
+
+    def is_occupied(self, x, y):
+        return bool(self.occupied & (1 << (x * self.size + y)))
+
+    def free_cells(self):
+        free = ~self.occupied & self.full_mask
+        while free:
+            bit = free & -free  # Lowest free position
+            i = bit.bit_length() - 1
+            yield divmod(i, self.size)
+            free ^= bit
+
+    def chars(self):
+        """Return set of chars on the grid."""
+        return { char for char, mask in self.masks.items() if mask }
+
+    def has_run(self, char, length):
+        """Return True if the char occupies `length` positions in a line.
+
+        Every direction is checked at once for the whole grid by AND-ing the
+        player mask with copies of itself shifted along the direction.
+
+        Args:
+            char (str): Player char to be checked.
+            length (int): Number of positions in a winning line.
+        """
+        mask = self.masks.get(char, 0)
+        for shift, starts in run_masks(self.size, length):
+            run = mask & starts
+            for step in range(1, length):
+                run &= mask >> (shift * step)
+                if not run:
+                    break
+            if run:
+                return True
+        return False
@@ -0,0 +1,189 @@
+import hashlib
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from functools import lru_cache
+
+
+TABLE_MAGIC = b'TTTC'
+TABLE_VERSION = 1
+# Magic, version, log2 of the number of slots.
+TABLE_HEADER = struct.Struct('<4sBxxxI')
+# Key XOR stored value and stored value, 0 marks an empty slot.
+TABLE_SLOT = struct.Struct('<QQ')
+# Values are stored shifted by the offset, so -1 and 0 don't mark an empty slot.
+VALUE_OFFSET = 2
+# Number of slots checked for a key before the home slot is replaced.
+PROBES = 8
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+@lru_cache(maxsize=None)
+def params_key(*params):
+    """Return a 64 bit key of the decision parameters which is the same in
+    every process and run."""
+    digest = hashlib.sha1(repr(params).encode()).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+
+def decision_key(grid, *params):
+    """Return 64 bit key of a decision on the grid.
+
+    The Zobrist hash of the grid is combined with a key of everything else
+    the decision depends on, e.g. char of the player to move, order of turns
+    and strategy settings.
+
+    Args:
+        grid (Grid): The grid instance on which the move has to take place.
+        params: Hashable parameters of the decision.
+    """
+    return grid.zobrist ^ params_key(grid.size, *params)
+
+
+class SharedDecisionTable:
+    """Fixed size table of decisions in a memory-mapped file, which worker
+    processes of the same machine can use at once.
+
+    Slots hold the key XOR the value next to the value, so an entry half
+    written by another process fails the key check and is read as missing
+    instead of returning a wrong value. A key is looked up in PROBES slots
+    from its home slot, when all of them are taken the home slot is replaced.
+
+    Args:
+        path (str): Path to the table file, created if it doesn't exist.
+        bits (int): Log2 of the number of slots of a new table file.
+    """
+    def __init__(self, path, bits=16):
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            header = os.pread(fd, TABLE_HEADER.size, 0)
+            if header.strip(b'\0'):
+                magic, version, bits = TABLE_HEADER.unpack(
+                    header.ljust(TABLE_HEADER.size, b'\0'))
+                if magic != TABLE_MAGIC or version != TABLE_VERSION:
+                    raise ValueError('{} is not a decision table file.'.format(path))
+            else:
+                # Processes creating the file at once write the same header.
+                os.ftruncate(fd, TABLE_HEADER.size + TABLE_SLOT.size * (1 << bits))
+                os.pwrite(fd, TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, bits), 0)
+            self.bits = bits
+            self.map = mmap.mmap(fd, TABLE_HEADER.size + TABLE_SLOT.size * (1 << bits))
+        finally:
+            os.close(fd)
+
+    def close(self):
+        self.map.close()
+
+    def slots(self, key):
+        """Yield offsets of the slots checked for a key."""
+        mask = (1 << self.bits) - 1
+        home = ((key * _GOLDEN) & _MASK64) >> (64 - self.bits)
+        for i in range(PROBES):
+            yield TABLE_HEADER.size + ((home + i) & mask) * TABLE_SLOT.size
+
+    def get(self, key):
+        """Return the stored value of a key or None.
+
+        Args:
+            key (int): 64 bit key.
+        """
+        for offset in self.slots(key):
+            check, value = TABLE_SLOT.unpack_from(self.map, offset)
+            if not value:
+                return
+            if check ^ value == key:
+                return value - VALUE_OFFSET
+
+    def put(self, key, value):
+        """Store a value of a key.
+
+        Args:
+            key (int): 64 bit key.
+            value (int): Value from -1 up to 2 ** 64 - 3.
+        """
+        value += VALUE_OFFSET
+        target = None
+        for offset in self.slots(key):
+            check, stored = TABLE_SLOT.unpack_from(self.map, offset)
+            if not stored or check ^ stored == key:
+                target = offset
+                break
+        if target is None:
+            target = next(self.slots(key))
+        TABLE_SLOT.pack_into(self.map, target, key ^ value, value)
+
+
+class DecisionCache:
+    """Bounded cache of AI decisions with least recently used eviction.
+
+    Values are flat positions of moves or -1 when the AI had no decision.
+    With a shared table, decisions missing in the cache are looked up in the
+    table and new decisions are stored in both.
+
+    Args:
+        max_entries (int): Maximum number of cached decisions.
+        shared (SharedDecisionTable): Table shared with other processes
+            (optional).
+
+    Attributes:
+        hits (int): Number of lookups answered by the cache or shared table.
+        misses (int): Number of lookups without a cached decision.
+        evictions (int): Number of decisions dropped to make room.
+        shared_hits (int): Number of hits answered by the shared table.
+    """
+    def __init__(self, max_entries=4096, shared=None):
+        self.max_entries = max_entries
+        self.shared = shared
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared_hits = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Return cached decision of the key or None."""
+        try:
+            value = self.entries[key]
+        except KeyError:
+            value = self.shared.get(key) if self.shared else None
+            if value is None:
+                self.misses += 1
+                return
+            self.shared_hits += 1
+            self.store(key, value)
+        else:
+            self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Cache the decision of the key."""
+        self.store(key, value)
+        if self.shared:
+            self.shared.put(key, value)
+
+    def store(self, key, value):
+        """Keep the decision in this process and evict the least recently
+        used one if the cache is full."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """Return dict of the counters and number of cached decisions."""
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'shared_hits': self.shared_hits,
+        }
@@ -4,38 +4,55 @@ import sys
 from collections import UserDict
 from json import JSONDecodeError
 
+# Names of search based AI strategies accepted by the player.ai setting.
+AI_STRATEGIES = ('alphabeta', 'mcts', 'book')
+
+# Names of grid engines accepted by the grid.engine setting.
+GRID_ENGINES = ('list', 'bitboard', 'sparse')
+
+# Largest grid sizes of the sparse engine and of the other engines.
+MAX_SPARSE_GRID_SIZE = 1000
+MAX_GRID_SIZE = 10
 
 class GameConfig(UserDict):
     """Initializes, validates and holds config variables in a dict.
 
-    It expects to find the config file in project root, i.e. one level above
-    the directory with config.py.
+    The config file is looked up relative to the current directory first and
+    then in project root, i.e. one level above the directory with config.py.
     
     Args:
         filename (string): Filename of the json file with config.
+        verbose (bool): Print a message when loading the config.
 
     Attributes:
         data (dict): Deserialized config.json to be used by the application.
     
     """
-    def __init__(self, filename):
-        print('Loading config from file ...')
+    def __init__(self, filename, verbose=False):
+        if verbose:
+            print('Loading config from file ...')
         self.data = self.from_json(filename)
 
+    @staticmethod
+    def resolve_path(filename):
+        """Return path of the config file in the current directory if it
+        exists there, otherwise its path in project root."""
+        if os.path.exists(filename):
+            return filename
+        # Transform filename to a path one level above the current path.
+        current_path = os.path.abspath(os.path.dirname(__file__))
+        return os.path.join(current_path, '..', filename)
+
     def from_json(self, filename):
         """Loads config from a json file, deserializes it and returns a dict.
 
-        It expects to find the config file one level above current directory.
+        See `resolve_path` for where the config file is looked up.
 
         Args:
             filename (string): Filename of the json file with config.
         """
         try:
-            # Transform filename to a path one level above the current path.
-            current_path = os.path.abspath(os.path.dirname(__file__))
-            config_path = os.path.join(current_path, '../' + filename)
-            # Load the file from the created path.
-            with open(config_path, 'r') as f:
+            with open(self.resolve_path(filename), 'r') as f:
                 config = json.load(f)
                 return config
         except JSONDecodeError as e:
@@ -54,10 +71,12 @@ class GameConfig(UserDict):
         """Runs all validations on the config file and returns True if they pass."""
         grid_size = self.validate_grid_size(self.data)
         win_condition = self.validate_win_condition(self.data)
+        win_length = self.validate_win_length(self.data)
+        engine = self.validate_grid_engine(self.data)
         players = self.validate_players(self.data)
         chars = self.validate_player_chars(players)
-        ai_settings = self.validate_ai_settings(players)
-        if grid_size and players and chars and ai_settings:
+        ai_settings = self.validate_ai_settings(players, self.data['grid'])
+        if grid_size and win_length and engine and players and chars and ai_settings:
             return True
 
     def validate_grid_size(self, config):
@@ -70,11 +89,19 @@ class GameConfig(UserDict):
         try:
             # Check if grid size can be converted to int or raise ValueError.
             grid_size = int(config['grid']['size'])
-            # Check if grid size is between 3 and 10 or exit.
-            if 3 <= grid_size <= 10:
+            # Check if grid size is between 3 and the limit of the engine or exit.
+            if config['grid'].get('engine') == 'sparse':
+                max_size = MAX_SPARSE_GRID_SIZE
+            else:
+                max_size = MAX_GRID_SIZE
+            if 3 <= grid_size <= max_size:
                 return grid_size
+            elif max_size == MAX_GRID_SIZE:
+                print('Grid size must be between 3 and 10.',
+                      'Use the "sparse" grid engine for larger grids.')
+                sys.exit(1)
             else:
-                print('Grid size must be between 3 and 10.')
+                print('Grid size must be between 3 and {}.'.format(max_size))
                 sys.exit(1)
         except KeyError as e:
             print(type(e).__name__, 'Couldn\'t find value for grid', e, 'in your config file.' )
@@ -102,6 +129,50 @@ class GameConfig(UserDict):
             print(type(e).__name__, e)
             sys.exit(1)
 
+    def validate_win_length(self, config):
+        """Validates grid.win_length from the config file and returns it as int.
+
+        The setting is optional and three in a row are needed to win when it's
+        not present in the config. It can't be longer than the grid size.
+
+        Args:
+            config (dict): The deserialized config dict from the config.json file.
+        """
+        try:
+            win_length = config['grid'].get('win_length', 3)
+            if type(win_length) != int:
+                print('If present, setting "win_length" needs to be a number.')
+                sys.exit(1)
+            if 3 <= win_length <= int(config['grid']['size']):
+                return win_length
+            else:
+                print('Setting "win_length" must be between 3 and the grid size.')
+                sys.exit(1)
+        except Exception as e:
+            print(type(e).__name__, e)
+            sys.exit(1)
+
+    def validate_grid_engine(self, config):
+        """Validates grid.engine from the config file and returns it.
+
+        The setting is optional and the list based grid is used when it's not
+        present in the config. The sparse grid supports grids larger than 10x10.
+
+        Args:
+            config (dict): The deserialized config dict from the config.json file.
+        """
+        try:
+            engine = config['grid'].get('engine', 'list')
+            if engine in GRID_ENGINES:
+                return engine
+            else:
+                print('If present, setting "engine" needs to be one of: {}.'\
+                      .format(', '.join(GRID_ENGINES)))
+                sys.exit(1)
+        except Exception as e:
+            print(type(e).__name__, e)
+            sys.exit(1)
+
     def validate_players(self, config):
         """Validates players from the config file and returns a list of
         players dicts if they are all valid.
@@ -150,21 +221,57 @@ class GameConfig(UserDict):
             print(type(e).__name__, e)
             sys.exit(1)
 
-    def validate_ai_settings(self, players):
+    def validate_ai_settings(self, players, grid=None):
         """Validates the players.player.ai settings and returns a list of them
         or True if the setting couldn't be found.
 
+        Besides booleans, the setting can name one of the AI_STRATEGIES. The
+        strategies index every position of the grid, so they can't play on the
+        sparse grid engine or on grids larger than MAX_GRID_SIZE. The
+        optional `time_limit` of a player needs to be a positive number of
+        seconds, optional `iterations`, `workers` and `cache` positive whole
+        numbers, optional `cache_file` a path and players with the "book"
+        strategy need a `book` path.
+
         It ignores KeyError and simply returns True if no player.ai was found
         in the config, because the Player class can handle it later and the ai
         to False.
+
+        Args:
+            players (list): List of player dicts produced by validate_players.
+            grid (dict): Grid settings of the config (optional).
         """
         try:
+            grid = grid or {}
+            large_grid = grid.get('engine') == 'sparse' or \
+                         int(grid.get('size', 3)) > MAX_GRID_SIZE
+            for player in players:
+                time_limit = player.get('time_limit', 1)
+                if type(time_limit) not in (int, float) or time_limit <= 0:
+                    print('If present, player time_limit needs to be a positive number of seconds.')
+                    sys.exit(1)
+                for option in ('iterations', 'workers', 'cache'):
+                    value = player.get(option, 1)
+                    if type(value) != int or value < 1:
+                        print('If present, player {} needs to be a positive whole number.'.format(option))
+                        sys.exit(1)
+                if type(player.get('cache_file', '')) != str:
+                    print('If present, player cache_file needs to be a path.')
+                    sys.exit(1)
+                if player.get('ai') == 'book' and type(player.get('book')) != str:
+                    print('Players with "book" AI need path to an opening book file in "book" setting.')
+                    sys.exit(1)
             # Create a list of `ai` values from the players dictionary.
             ai_settings = [ player['ai'] for player in players ]
-            # Make sure all `ai` values were properly converted into booleans.
+            # Make sure all `ai` values are booleans or names of strategies.
             for setting in ai_settings:
-                if type(setting) != bool:
-                    print('If present, player AI setting needs to be either true or false.')
+                if type(setting) != bool and setting not in AI_STRATEGIES:
+                    print('If present, player AI setting needs to be either true or false.',
+                          'It can also name an AI strategy: {}.'.format(', '.join(AI_STRATEGIES)))
+                    sys.exit(1)
+                if setting in AI_STRATEGIES and large_grid:
+                    print('AI strategy "{}" can\'t play on the sparse grid engine'.format(setting),
+                          'or on grids larger than {}.'.format(MAX_GRID_SIZE))
                     sys.exit(1)
             return ai_settings
         except KeyError as e:
@@ -1,67 +1,219 @@
+from collections import namedtuple
 from random import shuffle
+from time import perf_counter
 
+from .bitgrid import BitGrid
 from .grid import Grid
 from .player import Player
 from .referee import Referee
+from .renderer import AnsiRenderer
+from .sparsegrid import SparseGrid
+
+
+GameResult = namedtuple('GameResult', ['winner', 'draw', 'turns', 'moves'])
+GameResult.__doc__ = """Outcome of a finished game returned by `Game.run`.
+
+Attributes:
+    winner (str): Char of the winning player or None if nobody won.
+    draw (bool): True if the game ended with a full grid without a winner.
+    turns (int): Number of completed turns.
+    moves (list): List of (char, x, y) tuples in the order they were played.
+"""
+
+# Events of a turn in `Game.run` hooks can be added to, in order of a turn.
+# After an invalid move, after_move and after_validation come up again.
+# Output of a turn is formatted into a frame which is written before
+# after_output.
+HOOK_EVENTS = ('before_move', 'after_format', 'after_move', 'after_validation',
+               'after_win_check', 'after_output')
 
 
 class Game:
-    def __init__(self, config):
-        print('Starting new game ...')
+    """Runs games of the players on the grid and watches them by the referee.
+
+    Hooks added with `add_hook` are called as `hook(game, event, player, now)`
+    on events of every turn, with `now` read from the monotonic `perf_counter`
+    clock. Without hooks the main loop only checks that there are none.
+
+    Args:
+        config (GameConfig): Validated config of the game.
+        renderer (Renderer): Output of the game, AnsiRenderer by default.
+        move_log (MoveLogWriter): Writer streaming every move (optional).
+
+    Attributes:
+        hooks (dict): List of hooks of every event with hooks.
+    """
+    # Grid classes available under the grid.engine setting of the config.
+    GRID_ENGINES = {
+        'list': Grid,
+        'bitboard': BitGrid,
+        'sparse': SparseGrid,
+    }
+
+    def __init__(self, config, renderer=None, move_log=None):
+        self.renderer = renderer or AnsiRenderer()
+        self.renderer.info('Starting new game ...')
         self.config = config
+        self.move_log = move_log
         self.completed_turns = 0
+        self.moves = []
+        self.hooks = {}
         self.init_grid()
         self.init_players()
         self.init_referee()
 
     def init_grid(self):
-        self.grid = Grid(self.config['grid']['size'])
+        engine = self.config['grid'].get('engine', 'list')
+        self.grid = self.GRID_ENGINES[engine](self.config['grid']['size'],
+                                               self.renderer)
 
     def init_players(self):
         player_dict = self.config['players']
-        self.players = [ Player(player_dict[player]) for player in player_dict ]
+        self.players = [ Player(player_dict[player], self.config['grid'],
+                                self.renderer)
+                         for player in player_dict ]
+        self.config_order = list(self.players)
 
     def init_referee(self):
         self.referee = Referee(self)
 
+    def reset(self):
+        """Prepare the game to be run again.
+
+        The grid is cleared in place and the players and the referee are kept,
+        so many games can be run back to back on one Game instance.
+        """
+        self.grid.clear()
+        self.completed_turns = 0
+        self.moves = []
+
+    def close(self):
+        """Release worker processes and files of the players. The game can
+        also be used as a context manager which closes it at the end."""
+        for player in self.players:
+            player.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_hook(self, event, hook):
+        """Call hook on every event of the given name, see HOOK_EVENTS."""
+        if event not in HOOK_EVENTS:
+            raise ValueError('Unknown game event: {}'.format(event))
+        self.hooks.setdefault(event, []).append(hook)
+
+    def remove_hook(self, event, hook):
+        """Stop calling a hook added by `add_hook`."""
+        hooks = self.hooks.get(event, [])
+        if hook in hooks:
+            hooks.remove(hook)
+        if not hooks:
+            self.hooks.pop(event, None)
+
+    def call_hooks(self, event, player):
+        """Call hooks of the event with the current time."""
+        now = perf_counter()
+        for hook in self.hooks.get(event, ()):
+            hook(self, event, player, now)
+
+    def seat_players(self):
+        """Randomize who starts and let all players know the order of turns.
+
+        Players are shuffled from the order of the config, so seeded games
+        don't depend on games played before them.
+        """
+        self.players.sort(key=self.config_order.index)
+        shuffle(self.players)
+        turn_order = [ player.char for player in self.players ]
+        for player in self.players:
+            player.turn_order = turn_order
+        if self.move_log is not None:
+            from .movelog import config_hash
+            self.move_log.begin(config_hash(self.config), self.grid.size,
+                                turn_order)
+
     def run(self):
+        """Play the game until somebody wins or the grid is full and return
+        the GameResult. Call `reset` before running the game again."""
         players = self.players
         grid = self.grid
         referee = self.referee
-        
-        shuffle(players)  # Randomize who starts
+        renderer = self.renderer
+        hooks = self.hooks
+
+        self.seat_players()
         round_ = 1
 
         # Main game loop
         while True:
             turn = 1 # Turn count should reset after every round
             for player in players:
-                print('\nRound {}, Turn {}:'.format(round_,turn))
-                grid.show()
-                print('Player', player.char, end=': ')
-
-                # Make move depending on player type
-                if player.ai:
-                    player_input = player.ai_move(grid)  # AI needs to know the grid
-                    print(player_input)
-                else:
-                    player_input = player.move()
-
-                while not referee.validate_input(player_input, player):
-                    # Keep asking for input until Referee accepts it
-                    if player.ai:
-                        player_input = player.ai_move(grid)
-                        print(player_input)
-                    else:
-                        player_input = player.move()
-
-                # Transform validated input into x and y
-                x, y = referee.process_input(player_input)
-
-                grid.update(x, y, player.char)
-                self.completed_turns += 1
-                turn += 1
-                referee.check_for_winner()
-                referee.check_for_full_grid()
+                if hooks:
+                    self.call_hooks('before_move', player)
+                # Output of the whole turn is written at once.
+                with renderer.frame():
+                    renderer.message('\nRound {}, Turn {}:'.format(round_,turn))
+                    grid.show()
+                    renderer.message('Player', player.char, end=': ')
+                    if hooks:
+                        self.call_hooks('after_format', player)
+                    move = None
+                    while move is None:
+                        # Keep asking for input until Referee accepts it
+                        data = self.ask_for_move(player)
+                        if hooks:
+                            self.call_hooks('after_move', player)
+                        move = referee.validate_input(data, player)
+                        if hooks:
+                            self.call_hooks('after_validation', player)
+
+                    turn += 1
+                    result = self.play_move(player, move)
+                    if hooks:
+                        self.call_hooks('after_win_check', player)
+                if hooks:
+                    self.call_hooks('after_output', player)
+                if result:
+                    return result
             # All players made their turn
             round_ +=1
+
+    def play_move(self, player, move):
+        """Apply a move validated by the referee and return GameResult if
+        the move ended the game, otherwise None.
+
+        Args:
+            player (Player): Player who made the move.
+            move (Move): Move returned by `Referee.validate_input`.
+        """
+        x, y = move
+        self.grid.update(x, y, player.char)
+        self.moves.append((player.char, x, y))
+        if self.move_log is not None:
+            self.move_log.write_move(x, y)
+        self.completed_turns += 1
+        winner = self.referee.check_for_winner(x, y)
+        if winner:
+            return self.result(winner)
+        if self.referee.check_for_full_grid():
+            return self.result(None)
+
+    def ask_for_move(self, player):
+        """Return move of the player depending on player type."""
+        if player.ai:
+            player_input = player.ai_move(self.grid)  # AI needs to know the grid
+            self.renderer.message(player_input)
+        else:
+            self.renderer.flush()  # Show everything before waiting for input
+            player_input = player.move()
+        return player_input
+
+    def result(self, winner):
+        """Return GameResult of the finished game."""
+        if self.move_log is not None:
+            self.move_log.end()
+        return GameResult(winner, winner is None, self.completed_turns,
+                          self.moves)
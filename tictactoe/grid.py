@@ -1,9 +1,49 @@
 from collections import UserList
+from random import choice
+
+from .renderer import AnsiRenderer
+from .zobrist import zobrist_keys
+
+
+class GridRow(list):
+    """Row of a Grid which writes positions through `Grid.update`, so free
+    positions, moves and the hash of the grid stay up to date. Reads are
+    those of a plain list.
+    """
+    def __init__(self, grid, x, values=()):
+        super().__init__(values)
+        self.grid = grid
+        self.x = x
+
+    def __setitem__(self, y, char):
+        self.grid.update_cells(self.x, y, char)
 
 
 class Grid(UserList):
-    def __init__(self, size):
-        print('Initializing {0}x{0} grid ...'.format(size))
+    """Grid of player chars kept in nested lists.
+
+    Besides the rows, a list of free flat positions (`x * size + y`) and the
+    index of every position in it are kept up to date by `update`. Taking a
+    position swaps the last free position into its slot, so random free
+    positions, the number of taken positions and full checks don't need to
+    walk the grid. Rows are GridRows, so positions written by `grid[x][y]`,
+    `grid[x][a:b]` or `grid[x]` go through `update` as well. Setting `data`
+    rebuilds the free list.
+
+    Attributes:
+        free (list): Flat positions which are not occupied.
+        slots (list): Index in `free` of every flat position or None.
+        moves (list): Taken flat positions in order of their moves. Freeing
+            or replacing a position creates a new list, so followers of the
+            history can tell it was rewritten. All grid engines keep it.
+        zobrist (int): 64 bit Zobrist hash of the taken positions, i.e. the
+            XOR of the keys of every char on its position. Keys depend only
+            on the grid size, so hashes are the same for every grid engine,
+            process and run, see `tictactoe.zobrist`.
+    """
+    def __init__(self, size, renderer=None):
+        self.renderer = renderer or AnsiRenderer()
+        self.renderer.info('Initializing {0}x{0} grid ...'.format(size))
         self.size = int(size)
         self.create()
     
@@ -15,32 +55,137 @@ class Grid(UserList):
                 grid[x].append('')
         self.data = grid
 
+    @property
+    def data(self):
+        return self.rows
+
+    @data.setter
+    def data(self, rows):
+        self.rows = [ GridRow(self, x, row) for x, row in enumerate(rows) ]
+        # Placeholder values count as free like they do for the other engines.
+        self.index_free([ x * self.size + y for x, row in enumerate(rows)
+                          for y, char in enumerate(row) if len(char) != 1 ])
+        self.moves = [ x * self.size + y for x, row in enumerate(rows)
+                       for y, char in enumerate(row) if len(char) == 1 ]
+        self.zobrist = 0
+        for position in self.moves:
+            x, y = divmod(position, self.size)
+            self.zobrist ^= self.zobrist_key(position, rows[x][y])
+
+    def clear(self):
+        """Free all positions without allocating a new grid."""
+        for row in self.rows:
+            # Write to the list itself, the free list is rebuilt below.
+            list.__setitem__(row, slice(None), [''] * self.size)
+        self.index_free(list(range(self.size ** 2)))
+        self.moves = []
+        self.zobrist = 0
+
     def show(self):
-        grid = self.data
-        print('\n\t', end='')
-        for x in range(self.size):
-            print('    {}\t'.format(x), end='')
-        print('\r')
-        print('\t', '--------' * self.size)
-        for x in range(self.size):
-            print('   ',x, end='\t')
-            for y in range(self.size):
-                print('|  ', grid[x][y], end='\t')
-            print('|\r')
-            print('\t', '--------' * self.size)
-            
-        print('\r')
+        self.renderer.show_grid(self)
 
     def update(self, row, col, char):
-        self.data[row][col] = char
+        cells = self.rows[row]
+        previous = cells[col]
+        list.__setitem__(cells, col, char)
+        position = row * self.size + col
+        taken = len(previous) == 1
+        take = len(char) == 1  # Empty and placeholder values free the position
+        if taken:
+            self.zobrist ^= self.zobrist_key(position, previous)
+        if take:
+            self.zobrist ^= self.zobrist_key(position, char)
+        if taken == take:
+            if taken:
+                self.moves = list(self.moves)  # Char of a move was replaced
+            return
+        if take:
+            self.take_free(position)
+            self.moves.append(position)
+        else:
+            self.release_free(position)
+            self.moves = [ move for move in self.moves if move != position ]
+
+    def __setitem__(self, x, row):
+        if isinstance(x, slice):
+            raise TypeError('grid rows can only be replaced one at a time')
+        self.update_cells(self.index(x), slice(None), row)
+
+    def index(self, i):
+        """Return index normalized the same way as list indices are."""
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError('grid index out of range')
+        return i
+
+    def update_cells(self, row, col, chars):
+        """Update a position or a slice of positions of a row.
+
+        Args:
+            row (int): Normalized row of the positions.
+            col (int or slice): Col or slice of cols, negative ones count from
+                the end like list indices.
+            chars: Char of the position or iterable of chars of the slice,
+                which needs to have the same length as the slice.
+        """
+        if not isinstance(col, slice):
+            self.update(row, self.index(col), chars)
+            return
+        cols = range(*col.indices(self.size))
+        chars = list(chars)
+        if len(chars) != len(cols):
+            raise ValueError('can\'t change the number of positions of a grid row')
+        for y, char in zip(cols, chars):
+            self.update(row, y, char)
+
+    def index_free(self, free):
+        """Set the list of free flat positions and the slot of each of them."""
+        self.free = free
+        self.slots = [None] * self.size ** 2
+        for i, position in enumerate(free):
+            self.slots[position] = i
+
+    def take_free(self, position):
+        """Remove a free flat position from the free list by moving the last
+        free position into its slot."""
+        i = self.slots[position]
+        last = self.free.pop()
+        if last != position:
+            self.free[i] = last
+            self.slots[last] = i
+        self.slots[position] = None
+
+    def release_free(self, position):
+        """Add a flat position to the end of the free list."""
+        self.slots[position] = len(self.free)
+        self.free.append(position)
+
+    def zobrist_key(self, position, char):
+        """Return Zobrist key of a char on a flat position."""
+        return zobrist_keys(self.size, char)[position]
 
     def is_full(self):
-        occupied = [field for field in self.flat() if len(field) == 1]
-        return len(occupied) >= len(self.flat())
+        return not self.free
+
+    def occupied_count(self):
+        """Return number of taken positions."""
+        return self.size ** 2 - len(self.free)
 
     def is_occupied(self, x, y):
-        if self.data[x][y]:
+        if len(self.rows[x][y]) == 1:
             return True
 
+    def free_cells(self):
+        """Yield x, y pairs of all positions which are not occupied."""
+        for x in range(self.size):
+            for y in range(self.size):
+                if len(self.rows[x][y]) != 1:
+                    yield x, y
+
+    def random_free_cell(self):
+        """Return x, y of a random free position."""
+        return divmod(choice(self.free), self.size)
+
     def flat(self):
         return [ item for sublist in self.data for item in sublist ]
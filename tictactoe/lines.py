@@ -0,0 +1,72 @@
+from collections import namedtuple
+from functools import lru_cache
+
+
+# Row and col steps of the horizontal, vertical and both diagonal lines.
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+LineIndex = namedtuple('LineIndex', ['lines', 'cell_lines'])
+LineIndex.__doc__ = """All winning lines of a grid and lines of every position.
+
+Attributes:
+    lines (tuple): Every winning line as a tuple of x, y positions.
+    cell_lines (tuple): For every row a tuple with a tuple of line numbers
+        for every col, so `cell_lines[x][y]` lists lines through x, y.
+"""
+
+
+@lru_cache(maxsize=None)
+def line_index(size, win_length=3, win_condition='standard'):
+    """Build the index of winning lines once per grid setup and return it.
+
+    Lines of `win_length` positions are listed in all four directions. With
+    the corners win condition the four corners of the grid form one more line.
+
+    Args:
+        size (int): Size of the grid.
+        win_length (int): Number of positions in a winning line.
+        win_condition (str): Either "standard" or "corners".
+    """
+    lines = []
+    for x in range(size):
+        for y in range(size):
+            for dx, dy in DIRECTIONS:
+                end_x = x + dx * (win_length - 1)
+                end_y = y + dy * (win_length - 1)
+                if 0 <= end_x < size and 0 <= end_y < size:
+                    lines.append(tuple( (x + dx * i, y + dy * i)
+                                        for i in range(win_length) ))
+    if win_condition == 'corners':
+        last = size - 1
+        lines.append(((0, 0), (0, last), (last, 0), (last, last)))
+
+    cell_lines = [ [ [] for y in range(size) ] for x in range(size) ]
+    for n, line in enumerate(lines):
+        for x, y in line:
+            cell_lines[x][y].append(n)
+    cell_lines = tuple( tuple( tuple(numbers) for numbers in row )
+                        for row in cell_lines )
+    return LineIndex(tuple(lines), cell_lines)
+
+
+@lru_cache(maxsize=None)
+def flat_line_index(size, win_length=3, win_condition='standard'):
+    """Return the line index with flat positions, i.e. `x * size + y`.
+
+    Lines are tuples of flat positions and cell lines are indexed by flat
+    position, which suits search and solver code working on flat grids.
+    """
+    index = line_index(size, win_length, win_condition)
+    lines = tuple( tuple( x * size + y for x, y in line ) for line in index.lines )
+    cell_lines = tuple( numbers for row in index.cell_lines for numbers in row )
+    return LineIndex(lines, cell_lines)
+
+
+@lru_cache(maxsize=None)
+def neighbours(size):
+    """Return tuple of adjacent flat positions of every flat position."""
+    return tuple( tuple( (x + dx) * size + y + dy
+                         for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                         if (dx or dy) and 0 <= x + dx < size
+                         and 0 <= y + dy < size )
+                  for x in range(size) for y in range(size) )
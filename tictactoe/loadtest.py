@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import sys
+import time
+
+from .game import Game
+from .player import Player
+from .renderer import NullRenderer
+from .server import GameServer
+
+
+# Upper bounds of latency histogram buckets in milliseconds.
+HISTOGRAM_BOUNDS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def rss(pid):
+    """Return resident memory of a process in bytes read from /proc or None
+    where /proc isn't available."""
+    try:
+        with open('/proc/{}/status'.format(pid)) as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return
+
+
+def percentile(values, p):
+    """Return the p-th percentile of sorted values by the nearest rank."""
+    if not values:
+        return 0.0
+    rank = max(int(round(p / 100 * len(values))) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def histogram(values):
+    """Return list of (upper bound in ms, count) pairs of latencies in ms.
+    The last bucket with bound None counts latencies above all bounds."""
+    counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    for value in values:
+        i = 0
+        while i < len(HISTOGRAM_BOUNDS) and value > HISTOGRAM_BOUNDS[i]:
+            i += 1
+        counts[i] += 1
+    return list(zip(HISTOGRAM_BOUNDS + (None,), counts))
+
+
+def _run_server(config, timeout, seed, ports):
+    """Run a GameServer on a free port of the loopback interface and report
+    the port through the queue."""
+    random.seed(seed)
+
+    async def serve():
+        server = await GameServer(config, timeout).start('127.0.0.1', 0)
+        ports.put(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+class LoadClient:
+    """Simulated client playing games on the server with AI players.
+
+    The client makes the moves of all players without AI in the config with
+    Players using the given AI setting and mirrors the game on its own grid.
+    The round trip of a move is the time from sending it until the server
+    announces it.
+
+    Args:
+        config (dict): Game config of the server.
+        ai (bool or str): AI setting of the players of the client.
+    """
+    def __init__(self, config, ai=True):
+        self.config = config
+        self.ai = ai
+        self.grid = Game.GRID_ENGINES[config['grid'].get('engine', 'list')](
+            config['grid']['size'], NullRenderer())
+        self.players = {}
+        self.latencies = []
+        self.games = 0
+        self.moves = 0
+
+    def player(self, char, turn_order):
+        """Return the Player of the char, created on its first turn."""
+        if char not in self.players:
+            self.players[char] = Player({'char': char, 'ai': self.ai},
+                                        self.config['grid'], NullRenderer())
+        player = self.players[char]
+        player.turn_order = turn_order
+        return player
+
+    async def run(self, host, port, games):
+        """Connect to the server and play the number of games."""
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for n in range(games):
+                await self.play(reader, writer)
+                writer.write(b'NEW\n' if n < games - 1 else b'QUIT\n')
+        finally:
+            writer.close()
+
+    async def play(self, reader, writer):
+        """Play a single game until the server announces its end."""
+        self.grid.clear()
+        turn_order = None
+        pending = None
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError('Server closed the connection.')
+            command, *args = line.decode().split()
+            if command == 'START':
+                turn_order = args
+            elif command == 'TURN':
+                move = self.player(args[0], turn_order).ai_move(self.grid)
+                pending = (args[0], str(move))
+                sent = time.perf_counter()
+                writer.write(pending[1].encode() + b'\n')
+            elif command == 'MOVE':
+                if pending == (args[0], args[1]):
+                    self.latencies.append(time.perf_counter() - sent)
+                    pending = None
+                x, y = map(int, args[1].split(','))
+                self.grid.update(x, y, args[0])
+                self.moves += 1
+            elif command in ('WIN', 'DRAW'):
+                self.games += 1
+                return
+            else:
+                raise RuntimeError('Unexpected reply of the server: {}'\
+                                   .format(line.decode().strip()))
+
+
+async def sample_memory(pid, interval, start, samples):
+    """Append (seconds since start, rss bytes) of the process to samples
+    every interval until cancelled."""
+    while True:
+        samples.append((round(time.perf_counter() - start, 3), rss(pid)))
+        await asyncio.sleep(interval)
+
+
+async def run_clients(config, port, clients, games, ai, pid, interval):
+    """Run clients against the server and return them with elapsed time and
+    memory samples of the server process."""
+    start = time.perf_counter()
+    samples = []
+    sampler = asyncio.ensure_future(sample_memory(pid, interval, start, samples))
+    load = [ LoadClient(config, ai) for _ in range(clients) ]
+    try:
+        await asyncio.gather(*( client.run('127.0.0.1', port, games)
+                                for client in load ))
+    finally:
+        elapsed = time.perf_counter() - start
+        sampler.cancel()
+    samples.append((round(elapsed, 3), rss(pid)))
+    return load, elapsed, samples
+
+
+def run(config, clients=100, games=10, ai=True, seed=0, timeout=60.0,
+        interval=0.5):
+    """Start a local server, load it with clients and return the report as
+    a dict.
+
+    Args:
+        config (dict): Game config of the server, players without AI are
+            played by the clients.
+        clients (int): Number of concurrent clients.
+        games (int): Number of games of every client.
+        ai (bool or str): AI setting of the players of the clients.
+        seed (int): Seed of the random generators of server and clients.
+        timeout (float): Timeout of the server for moves of the clients.
+        interval (float): Seconds between samples of the server memory.
+    """
+    config = dict(config)
+    random.seed(seed)
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_run_server,
+                                     args=(config, timeout, seed, ports))
+    server.start()
+    try:
+        port = ports.get(timeout=30)
+        load, elapsed, memory = asyncio.run(run_clients(
+            config, port, clients, games, ai, server.pid, interval))
+    finally:
+        server.terminate()
+        server.join()
+
+    latencies = sorted( latency * 1000 for client in load
+                        for latency in client.latencies )
+    total_games = sum( client.games for client in load )
+    return {
+        'clients': clients,
+        'games': total_games,
+        'moves': sum( client.moves for client in load ),
+        'seconds': round(elapsed, 3),
+        'games_per_sec': round(total_games / elapsed, 1),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 3),
+            'p90': round(percentile(latencies, 90), 3),
+            'p99': round(percentile(latencies, 99), 3),
+            'max': round(latencies[-1], 3) if latencies else 0.0,
+        },
+        'histogram_ms': histogram(latencies),
+        'memory': memory,
+    }
+
+
+def compare(baseline, current, threshold=0.1):
+    """Return list of (metric, baseline value, current value) which are worse
+    than the baseline by more than the threshold ratio."""
+    regressions = []
+    if current['games_per_sec'] < baseline['games_per_sec'] * (1 - threshold):
+        regressions.append(('games_per_sec', baseline['games_per_sec'],
+                            current['games_per_sec']))
+    for key in ('p50', 'p99'):
+        before = baseline['latency_ms'][key]
+        after = current['latency_ms'][key]
+        if after > before * (1 + threshold):
+            regressions.append(('latency_ms.' + key, before, after))
+    return regressions
+
+
+def print_report(report):
+    """Print the report of a load test."""
+    print('{games} games, {moves} moves in {seconds} s, {games_per_sec} games/s'\
+          .format(**report))
+    print('Move round trip: p50 {p50} ms, p90 {p90} ms, p99 {p99} ms, '
+          'max {max} ms'.format(**report['latency_ms']))
+    for bound, count in report['histogram_ms']:
+        if count:
+            label = '<= {} ms'.format(bound) if bound else '> {} ms'.format(
+                HISTOGRAM_BOUNDS[-1])
+            print('    {:>12} {}'.format(label, count))
+    memory = [ value for _, value in report['memory'] if value ]
+    if memory:
+        print('Server memory: start {:.1f} MiB, peak {:.1f} MiB, end {:.1f} MiB'\
+              .format(memory[0] / 2**20, max(memory) / 2**20, memory[-1] / 2**20))
+
+
+def main(args=None):
+    """Run a load test from the command line and print its report."""
+    parser = argparse.ArgumentParser(description='Load test the game server.')
+    parser.add_argument('config', help='path to the json config file')
+    parser.add_argument('-n', '--clients', type=int, default=100)
+    parser.add_argument('-g', '--games', type=int, default=10,
+                        help='games per client')
+    parser.add_argument('--ai', default='true',
+                        help='AI of the clients: true or a strategy name')
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='save report to a json file')
+    parser.add_argument('-c', '--compare', help='compare with report from a json file')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1)
+    args = parser.parse_args(args)
+
+    with open(args.config) as f:
+        config = json.load(f)
+    ai = True if args.ai.lower() == 'true' else args.ai
+    report = run(config, args.clients, args.games, ai, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+    print_report(report)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for metric, before, after in regressions:
+            print('Regression: {} {} was {}'.format(metric, after, before))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
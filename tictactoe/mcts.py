@@ -0,0 +1,277 @@
+import math
+import random
+import time
+from multiprocessing import Pool, current_process
+
+from .lines import flat_line_index, neighbours
+
+
+class Node:
+    """Node of the search tree, reached by a move of a player.
+
+    Attributes:
+        move (int): Flat position of the move leading to the node.
+        player (int): Seat of the player who made the move.
+        winner (bool): True if the move completed a winning line.
+        children (list): Expanded child nodes.
+        untried (list): Moves not expanded yet.
+        visits (int): Number of playouts through the node.
+        reward (float): Sum of playout rewards of the player who made the move.
+    """
+    __slots__ = ('move', 'player', 'parent', 'winner', 'children', 'untried',
+                 'visits', 'reward')
+
+    def __init__(self, move, player, parent, untried, winner=False):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.winner = winner
+        self.children = []
+        self.untried = [] if winner else untried
+        self.visits = 0
+        self.reward = 0.0
+
+
+class MCTS:
+    """Monte Carlo Tree Search AI strategy with UCT selection.
+
+    Every iteration selects a path of the tree with UCT, expands one move,
+    plays the rest of the game with random moves and propagates the result
+    back. A win counts 1 for the winner, a draw counts 1 / players for every
+    player. The search stops after given number of iterations or when the
+    time limit runs out, whatever comes first.
+
+    The subtree of the chosen move is kept, so the next search starts from
+    the statistics gathered for the moves the opponents played meanwhile.
+
+    With more than one worker the search is root parallel: worker processes
+    search independent trees from the same position and their root visit
+    counts are added to the ones of the local tree. Daemonic processes, e.g.
+    workers of a simulation, can't start workers and search alone. Call
+    `close` to stop the workers.
+
+    Args:
+        time_limit (float): Time budget of a single move in seconds.
+        iterations (int): Maximum number of iterations of a move (optional).
+        workers (int): Number of processes searching in parallel.
+        win_length (int): Number of positions in a winning line.
+        win_condition (str): Either "standard" or "corners".
+        exploration (float): UCT exploration constant.
+        seed (int): Seed of the random generator (optional). Without it the
+            global random generator is used, so seeded games are reproducible.
+    """
+    def __init__(self, time_limit=1.0, iterations=None, workers=1, win_length=3,
+                 win_condition='standard', exploration=1.4, seed=None):
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.workers = workers
+        self.win_length = win_length
+        self.win_condition = win_condition
+        self.exploration = exploration
+        self.rng = random if seed is None else random.Random(seed)
+        self.pool = None
+        self.size = None
+        self.players = None
+        self.chars = None
+        self.root = None
+        self.root_cells = None
+
+    def decide(self, grid, char, turn_order=None):
+        """Return x, y of the most visited move for the player with given char.
+
+        Args:
+            grid (Grid): The grid instance on which the move has to take place.
+            char (str): Char of the deciding player.
+            turn_order (list): Chars of all players in order of their turns.
+        """
+        chars = list(turn_order or [])
+        if char not in chars:
+            chars.insert(0, char)
+        for row in grid:
+            for value in row:
+                if value and value not in chars:
+                    chars.append(value)
+        self.setup(grid.size, len(chars))
+        cells = [ chars.index(value) if value else -1
+                  for row in grid for value in row ]
+        mover = chars.index(char)
+
+        root = self.reuse_tree(cells, chars)
+        if root is None:
+            root = Node(None, (mover - 1) % self.players, None,
+                        self.candidates(cells))
+        self.chars = chars
+
+        jobs = None
+        if self.workers > 1 and not current_process().daemon:
+            if self.pool is None:
+                self.pool = Pool(self.workers - 1)
+            args = [ (cells, mover, self.players, self.size, self.win_length,
+                      self.win_condition, self.iterations, self.time_limit,
+                      self.rng.getrandbits(32))
+                     for _ in range(self.workers - 1) ]
+            jobs = self.pool.map_async(_search_in_worker, args)
+
+        self.search(root, cells)
+        visits = { child.move: child.visits for child in root.children }
+        if jobs is not None:
+            for worker_visits in jobs.get():
+                for move, count in worker_visits.items():
+                    visits[move] = visits.get(move, 0) + count
+
+        move = max(visits, key=visits.get)
+        # Keep the subtree of the chosen move for the next search.
+        self.root = next(( child for child in root.children
+                           if child.move == move ), None)
+        if self.root is not None:
+            self.root.parent = None
+        self.root_cells = list(cells)
+        self.root_cells[move] = mover
+        return divmod(move, self.size)
+
+    def setup(self, size, players):
+        """Load line index of the grid size and drop a tree of other setup."""
+        if (size, players) != (self.size, self.players):
+            self.size = size
+            self.players = players
+            self.lines, self.cell_lines = flat_line_index(
+                size, self.win_length, self.win_condition)
+            self.neighbours = neighbours(size)
+            self.root = None
+
+    def reuse_tree(self, cells, chars):
+        """Return the node of the kept tree matching the position or None.
+
+        Moves played since the last search are looked up in order of turns,
+        starting with the player after the one who made the kept move.
+        """
+        root = self.root
+        if root is None or chars != self.chars:
+            return
+        previous = self.root_cells
+        new = { i for i, value in enumerate(cells) if value != previous[i] }
+        if any(previous[i] != -1 for i in new):
+            return  # Grid was reset or changed otherwise
+        player = root.player
+        while new:
+            player = (player + 1) % self.players
+            move = next(( i for i in new if cells[i] == player ), None)
+            if move is None:
+                return
+            new.discard(move)
+            root = next(( child for child in root.children
+                          if child.move == move ), None)
+            if root is None:
+                return
+        root.parent = None
+        return root
+
+    def candidates(self, cells):
+        """Return free positions next to occupied ones or all free positions
+        when the grid is empty."""
+        near = [ i for i, value in enumerate(cells) if value == -1 and
+                 any(cells[j] != -1 for j in self.neighbours[i]) ]
+        if near:
+            return near
+        return [ i for i, value in enumerate(cells) if value == -1 ]
+
+    def completes_line(self, cells, i):
+        """Return True if the player on position i completed a line."""
+        player = cells[i]
+        for n in self.cell_lines[i]:
+            if all(cells[j] == player for j in self.lines[n]):
+                return True
+        return False
+
+    def search(self, root, cells):
+        """Run iterations from the root until a budget runs out."""
+        deadline = time.perf_counter() + self.time_limit
+        iterations = 0
+        while True:
+            self.iterate(root, list(cells))
+            iterations += 1
+            if self.iterations and iterations >= self.iterations:
+                break
+            if not iterations & 15 and time.perf_counter() > deadline:
+                break
+
+    def iterate(self, root, cells):
+        """Run one iteration of selection, expansion, playout and backup."""
+        node = root
+        # Selection
+        while not node.untried and node.children:
+            node = self.select(node)
+            cells[node.move] = node.player
+
+        # Expansion
+        if node.untried and not node.winner:
+            move = node.untried.pop(self.rng.randrange(len(node.untried)))
+            player = (node.player + 1) % self.players
+            cells[move] = player
+            winner = self.completes_line(cells, move)
+            child = Node(move, player, node, self.candidates(cells), winner)
+            node.children.append(child)
+            node = child
+
+        # Playout
+        if node.winner:
+            winner = node.player
+        else:
+            winner = self.playout(cells, node.player)
+
+        # Backup
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.reward += 1 / self.players
+            elif winner == node.player:
+                node.reward += 1
+            node = node.parent
+
+    def select(self, node):
+        """Return the child with the highest UCT value."""
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        best_value = -1
+        for child in node.children:
+            value = child.reward / child.visits + \
+                    exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best = child
+        return best
+
+    def playout(self, cells, player):
+        """Play random moves until the game ends and return the seat of the
+        winner or None for a draw.
+
+        Args:
+            cells (list): Flat position after the move of the player.
+            player (int): Seat of the player who made the last move.
+        """
+        free = [ i for i, value in enumerate(cells) if value == -1 ]
+        self.rng.shuffle(free)
+        for move in free:
+            player = (player + 1) % self.players
+            cells[move] = player
+            if self.completes_line(cells, move):
+                return player
+
+    def close(self):
+        """Stop the worker processes."""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+
+def _search_in_worker(args):
+    """Search a new tree in a worker process and return its root visit counts."""
+    cells, mover, players, size, win_length, win_condition, iterations, \
+        time_limit, seed = args
+    strategy = MCTS(time_limit, iterations, 1, win_length, win_condition,
+                    seed=seed)
+    strategy.setup(size, players)
+    root = Node(None, (mover - 1) % players, None, strategy.candidates(cells))
+    strategy.search(root, cells)
+    return { child.move: child.visits for child in root.children }
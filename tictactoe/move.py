@@ -0,0 +1,35 @@
+from collections import namedtuple
+
+
+class Move(namedtuple('Move', ['row', 'col'])):
+    """Position of a move on the grid.
+
+    Moves are parsed once from player input by `parse_move` and then passed
+    around as they are. AI players decide Moves directly, so their decisions
+    are never formatted and parsed again. Printed, a Move reads "row,col".
+
+    Attributes:
+        row (int): Represents row number on the grid.
+        col (int): Represents col number on the grid.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return '{},{}'.format(self.row, self.col)
+
+
+def parse_move(data):
+    """Return Move parsed from "<row>,<col>" input or None if the input is
+    not in this format.
+
+    Spaces are ignored and coordinates can have any number of digits.
+
+    Args:
+        data (str): String input from the player.
+    """
+    parts = data.replace(' ', '').strip().split(',')
+    if len(parts) != 2:
+        return
+    row, col = parts
+    if row.isdecimal() and col.isdecimal():
+        return Move(int(row), int(col))
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import struct
+from collections import namedtuple
+
+
+# Every game starts with a header followed by the player chars as utf-8,
+# the moves as flat positions and an end marker of the width of one move.
+LOG_MAGIC = b'TTTL'
+LOG_VERSION = 1
+LOG_HEADER = struct.Struct('<4sBBH8sB')  # magic, version, move bytes, size, hash, chars bytes
+END_MARKERS = {1: b'\xff', 2: b'\xff\xff', 4: b'\xff\xff\xff\xff'}
+MOVE_FORMATS = {1: 'B', 2: 'H', 4: 'I'}
+
+GameRecord = namedtuple('GameRecord', ['config_hash', 'size', 'chars', 'moves'])
+GameRecord.__doc__ = """Game read from a move log.
+
+Attributes:
+    config_hash (bytes): First 8 bytes of the sha1 hash of the game config.
+    size (int): Size of the grid.
+    chars (str): Chars of the players in order of their turns.
+    moves (list): List of (char, x, y) tuples in the order they were played.
+"""
+
+
+def config_hash(config):
+    """Return the first 8 bytes of the sha1 hash of the serialized config."""
+    serialized = json.dumps(dict(config), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(serialized.encode()).digest()[:8]
+
+
+def move_bytes(size):
+    """Return number of bytes of a move on a grid of given size."""
+    if size ** 2 < 0xff:
+        return 1
+    if size ** 2 < 0xffff:
+        return 2
+    return 4
+
+
+class MoveLogWriter:
+    """Writes games to a binary stream one move at a time.
+
+    Games are appended to the stream, so a log file opened in "ab" mode or
+    a pipe can collect any number of games. Moves are flat positions, i.e.
+    `x * size + y`, taking one byte on grids up to 15x15, two bytes on grids
+    up to 255x255 and four bytes on larger sparse grids. The player of a
+    move follows from the order of turns.
+
+    Args:
+        stream: Binary file object to write to.
+
+    Attributes:
+        games (int): Number of games finished with `end`.
+    """
+    def __init__(self, stream):
+        self.stream = stream
+        self.games = 0
+        self.size = None
+
+    def begin(self, config_hash, size, chars):
+        """Write the header of a new game.
+
+        Args:
+            config_hash (bytes): Hash of the game config, see `config_hash`.
+            size (int): Size of the grid.
+            chars (list): Chars of the players in order of their turns.
+        """
+        if self.size is not None:
+            raise ValueError('Previous game was not ended.')
+        encoded = ''.join(chars).encode()
+        self.size = size
+        self.width = width = move_bytes(size)
+        self.pack = struct.Struct('<' + MOVE_FORMATS[width]).pack
+        self.stream.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, self.width,
+                                          size, config_hash, len(encoded))
+                          + encoded)
+
+    def write_move(self, x, y):
+        """Write a move of the player on turn."""
+        self.stream.write(self.pack(x * self.size + y))
+
+    def end(self):
+        """Write the end marker of the game and flush the stream."""
+        self.stream.write(END_MARKERS[self.width])
+        self.stream.flush()
+        self.size = None
+        self.games += 1
+
+
+class MoveLogReader:
+    """Iterates games of a binary move log as GameRecords.
+
+    The stream is read in chunks, so logs of millions of games are never
+    loaded into memory at once.
+
+    Args:
+        stream: Binary file object to read from.
+        chunk_size (int): Number of bytes read at once.
+    """
+    def __init__(self, stream, chunk_size=2**16):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = b''
+        self.pos = 0
+
+    def __iter__(self):
+        while True:
+            header = self.read(LOG_HEADER.size)
+            if not header:
+                return
+            if len(header) < LOG_HEADER.size:
+                raise ValueError('Move log ends inside a game header.')
+            magic, version, width, size, hash_, chars_length = \
+                LOG_HEADER.unpack(header)
+            if magic != LOG_MAGIC or version != LOG_VERSION:
+                raise ValueError('Not a move log of version {}.'.format(LOG_VERSION))
+            chars = self.read(chars_length).decode()
+            moves = self.read_moves(width)
+            players = len(chars)
+            yield GameRecord(hash_, size, chars,
+                             [ (chars[turn % players],) + divmod(move, size)
+                               for turn, move in enumerate(moves) ])
+
+    def fill(self):
+        """Append the next chunk of the stream to the buffer and return False
+        at the end of the stream."""
+        chunk = self.stream.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return bool(chunk)
+
+    def read(self, n):
+        """Return next n bytes or less at the end of the stream."""
+        while len(self.buffer) - self.pos < n and self.fill():
+            pass
+        data = self.buffer[self.pos:self.pos + n]
+        self.pos += len(data)
+        return data
+
+    def read_moves(self, width):
+        """Return flat positions up to the end marker of moves of given width."""
+        marker = END_MARKERS[width]
+        start = self.pos
+        while True:
+            end = self.buffer.find(marker, start)
+            # Markers of wider moves only count on move boundaries.
+            while end != -1 and (end - self.pos) % width:
+                end = self.buffer.find(marker, end + 1)
+            if end != -1:
+                break
+            scanned = len(self.buffer) - self.pos
+            if not self.fill():
+                raise ValueError('Move log ends inside a game.')
+            start = scanned - scanned % width
+        data = self.buffer[self.pos:end]
+        self.pos = end + width
+        if width == 1:
+            return data
+        return struct.unpack('<{}{}'.format(len(data) // width, MOVE_FORMATS[width]),
+                             data)
+
+
+def read_games(path):
+    """Yield every game of a move log file as GameRecord."""
+    with open(path, 'rb') as f:
+        yield from MoveLogReader(f)
@@ -1,247 +1,153 @@
-from random import choice, shuffle
+from .move import Move
+from .renderer import AnsiRenderer
+from .threats import ThreatBoard
+
+# Player settings AI decisions depend on, part of the keys of cached ones.
+CACHE_KEY_SETTINGS = ('ai', 'time_limit', 'iterations', 'workers', 'book')
 
 
 class Player:
-    def __init__(self, player):
-        print('Initializing Player', player['char'], end=' ')
+    """Makes moves of a human player or AI.
+
+    Besides true and false, the `ai` setting of a player can name an AI
+    strategy: "alphabeta" for search, "mcts" for Monte Carlo Tree Search or
+    "book" for perfect moves from an opening book. Such players decide their
+    moves with the strategy instead of `ai_decide`.
+
+    AI decisions can be cached by position with the optional `cache` setting,
+    the maximum number of cached decisions, and shared with other processes
+    through a memory-mapped table file named by `cache_file`.
+
+    Args:
+        player (dict): Player settings from the config.
+        grid (dict): Grid settings from the config (optional).
+        renderer (Renderer): Renderer used for all output (optional).
+
+    Attributes:
+        turn_order (list): Chars of all players in order of their turns, set
+            by the Game before the first move.
+        threats (ThreatBoard): Threats on the grid of the last decision.
+        cache (DecisionCache): Cache of AI decisions or None.
+    """
+    def __init__(self, player, grid=None, renderer=None):
+        self.renderer = renderer or AnsiRenderer()
         self.char = player['char']
         try:
             self.ai = player['ai']
         except KeyError:
             # Set AI to false if it was not present in the config.
             self.ai = False
-        if self.ai:
-            print('(AI) ...')
-        else:
-            print(' ...')
+        self.turn_order = None
+        self.threats = None
+        grid = grid or {}
+        self.win_condition = grid.get('win_condition', 'standard')
+        self.win_length = grid.get('win_length', 3)
+        self.strategy = self.init_strategy(player)
+        self.cache = self.init_cache(player)
+        self.cache_params = (self.win_length, self.win_condition) + tuple(
+            player.get(name) for name in CACHE_KEY_SETTINGS)
+        self.renderer.info('Initializing Player', player['char'],
+                           '(AI) ...' if self.ai else ' ...')
+
+    def init_strategy(self, player):
+        """Return strategy named by the `ai` setting or None.
+
+        Strategies are imported on demand, as most games don't need them.
+        """
+        if self.ai == 'alphabeta':
+            from .search import AlphaBeta
+            return AlphaBeta(time_limit=player.get('time_limit', 1.0),
+                             win_length=self.win_length,
+                             win_condition=self.win_condition)
+        if self.ai == 'mcts':
+            from .mcts import MCTS
+            return MCTS(time_limit=player.get('time_limit', 1.0),
+                        iterations=player.get('iterations'),
+                        workers=player.get('workers', 1),
+                        win_length=self.win_length,
+                        win_condition=self.win_condition)
+        if self.ai == 'book':
+            from .solver import OpeningBook
+            return OpeningBook(player['book'], self.win_length,
+                               self.win_condition)
+
+    def init_cache(self, player):
+        """Return DecisionCache set up by the `cache` setting or None."""
+        if not self.ai or not player.get('cache'):
+            return
+        from .cache import DecisionCache, SharedDecisionTable
+        shared = None
+        if player.get('cache_file'):
+            shared = SharedDecisionTable(player['cache_file'])
+        return DecisionCache(player['cache'], shared)
+
+    def close(self):
+        """Release worker processes and files of the strategy and cache."""
+        close = getattr(self.strategy, 'close', None)
+        if close is not None:
+            close()
+        if self.cache is not None and self.cache.shared is not None:
+            self.cache.shared.close()
+            self.cache.shared = None
 
     def move(self):
         """Ask human player for input and return it."""
         return input()
 
     def ai_move(self, grid):
-        """Decide move of the AI on a given grid and return decision as string
-        in x,y format as expected by the Referee."""
-        decision = self.ai_decide(grid)  # Try intelligent decision...
+        """Decide move of the AI on a given grid and return decision as Move
+        to be validated by the Referee.
+
+        With a cache, decisions are looked up by the Zobrist hash of the grid,
+        char of the player, order of turns and AI settings first.
+        """
+        if self.cache is None:
+            decision = self.ai_decision(grid)
+        else:
+            from .cache import decision_key
+            key = decision_key(grid, self.char, tuple(self.turn_order or ()),
+                               self.cache_params)
+            position = self.cache.get(key)
+            if position is None or position >= 0 and \
+               grid.is_occupied(*divmod(position, grid.size)):
+                decision = self.ai_decision(grid)
+                self.cache.put(key, -1 if decision is None else
+                               decision.row * grid.size + decision.col)
+            elif position >= 0:
+                decision = Move(*divmod(position, grid.size))
+            else:
+                decision = None
         if decision == None:
             # Pick a random free position if no decision was made.
-            free_positions = []
-            for x in range(grid.size):
-                for y in range(grid.size):
-                    if not grid.is_occupied(x, y):
-                        free_positions.append('{},{}'.format(x, y))
-            return choice(free_positions)
-        return decision 
+            return Move(*grid.random_free_cell())
+        return decision
+
+    def ai_decision(self, grid):
+        """Return decision of the AI strategy or `ai_decide` as Move or None."""
+        if self.strategy:
+            decision = self.strategy.decide(grid, self.char, self.turn_order)
+            # Fall back to ai_decide if the strategy had no decision.
+            if decision is not None:
+                return Move(*decision)
+        return self.ai_decide(grid)  # Try intelligent decision...
 
     def ai_decide(self, grid):
-        """Crawls the grid checking all non-occupied fields and takes first
-        opportunity to win or block an opponent from winning.
-        
-        Returns decision as string in x,y format or None if there was no
-        opportunity to win or block an opponent.
+        """Returns the free position with the most urgent threat as Move or
+        None if there is none.
 
-        Before starting the crawl, it shuffles the rows and cols of the grid
-        to randomize the order in which they are checked.
+        Threats are ranked by the ThreatBoard of the player, which follows the
+        moves on the grid: completing an own line first, then blocking a line
+        of the opponent who moves next, the one after and so on, then taking
+        a position which gets two own lines one position short of winning.
 
         Args:
             grid (Grid): The grid instance on which the move has to take place.
         """
-        rows = [x for x in range(grid.size)]
-        cols = [x for x in range(grid.size)]
-        shuffle(rows)
-        shuffle(cols)
-        for x in range(grid.size):
-            for y in range(grid.size):
-                # Only check if position is not occupied
-                if not grid.is_occupied(x, y):
-                    # print('Checking', x, y)
-
-                    if x == 0 and y == 0:
-                        # Top left corner
-                        if self.ai_check_right(x, y, grid) or \
-                           self.ai_check_bottom_right(x, y, grid) or \
-                           self.ai_check_below:
-                            return '{},{}'.format(x, y)
-                        continue
-
-                    elif x == 0 and y == grid.size - 1:
-                        # Top right corner
-                        if self.ai_check_left(x, y, grid) or \
-                           self.ai_check_bottom_left(x, y, grid) or \
-                           self.ai_check_below(x, y, grid):
-                            return '{},{}'.format(x, y)
-                        continue
-
-                    elif x == grid.size - 1 and y == 0:
-                        # Bottom left corner
-                        if self.ai_check_above(x, y, grid) or \
-                           self.ai_check_top_right(x, y, grid) or \
-                           self.ai_check_right(x, y, grid):
-                            return '{},{}'.format(x, y)
-                        continue
-
-                    elif x == grid.size - 1 and y == grid.size - 1:                            
-                        # Bottom right corner
-                        if self.ai_check_above(x, y, grid) or \
-                          self.ai_check_top_left(x, y, grid) or \
-                          self.ai_check_left(x, y, grid):
-                            return '{},{}'.format(x, y)
-                        continue
-
-                    elif x == 0:  
-                        # Top row except corners
-                        if self.ai_check_horizontal(x, y, grid) or \
-                           self.ai_check_below(x, y, grid):
-                            return '{},{}'.format(x, y)
-                        if y > 1:  
-                            # If at least two positions from the left wall
-                            if self.ai_check_left(x, y, grid) or \
-                               self.ai_check_bottom_left(x, y, grid):
-                                return '{},{}'.format(x, y)
-                        if y < grid.size - 2:  
-                            # If at least two positions from the right wall
-                            if self.ai_check_right(x, y, grid) or \
-                               self.ai_check_bottom_right(x, y, grid):
-                                return '{},{}'.format(x, y)
-
-                    elif x == grid.size - 1:  
-                        # Bottom row except corners
-                        if self.ai_check_horizontal(x, y, grid) or \
-                           self.ai_check_above(x, y, grid):
-                            return '{},{}'.format(x, y)
-                        if y > 1:  
-                            # If at least two positions from the left wall
-                            if self.ai_check_left(x, y, grid) or \
-                               self.ai_check_top_left(x, y, grid):
-                                return '{},{}'.format(x, y)
-                        if y < grid.size - 2:  
-                            # If at least two positions from the right wall
-                            if self.ai_check_right(x, y, grid) or \
-                               self.ai_check_top_right(x, y, grid):
-                                return '{},{}'.format(x, y)
-                            
-                    elif y == 0:
-                        # Left wall except corners
-                        if self.ai_check_vertical(x, y, grid) or \
-                           self.ai_check_right(x, y, grid):
-                            return '{},{}'.format(x, y)
-                        if x > 1:
-                            # If at least two positions from the top
-                            if self.ai_check_above(x, y, grid) or \
-                               self.ai_check_top_right(x, y, grid):
-                                return '{},{}'.format(x, y)
-                        if x < grid.size - 2:
-                            # If at least two positions from the bottom
-                            if self.ai_check_below(x, y, grid) or \
-                               self.ai_check_bottom_right(x, y, grid):
-                                return '{},{}'.format(x, y)
-                        
-                    elif y == grid.size - 1:
-                        # Right wall except corners
-                        if self.ai_check_vertical(x, y, grid) or \
-                           self.ai_check_left(x, y, grid):
-                            return '{},{}'.format(x, y)
-                        if x > 1:
-                            # If at least two positions from the top
-                            if self.ai_check_above(x, y, grid) or \
-                               self.ai_check_top_left(x, y, grid):
-                                return '{},{}'.format(x, y)
-                        if x < grid.size - 2:
-                            # If at least two positions from the bottom
-                            if self.ai_check_below(x, y, grid) or \
-                               self.ai_check_bottom_left(x, y, grid):
-                                return '{},{}'.format(x, y)                        
-
-                    else:
-                        # Any other position except corners and walls - do all the checks
-                        if self.ai_check_horizontal(x, y, grid) or \
-                           self.ai_check_vertical(x, y, grid) or \
-                           self.ai_check_diagonal(x, y, grid):
-                            return '{},{}'.format(x, y)
-                        if x > 1:
-                            # If at least two positions from the top
-                            if self.ai_check_above(x, y, grid):
-                                return '{},{}'.format(x, y)
-                        if x < grid.size - 2:
-                            # If at least two positions from the bottom
-                            if self.ai_check_below(x, y, grid):
-                                return '{},{}'.format(x, y)
-                        if y > 1:
-                            # If at least two positions from the left wall
-                            if self.ai_check_left(x, y, grid):
-                                return '{},{}'.format(x, y)
-                        if y < grid.size - 2:
-                            # If at least two positions from the right wall
-                            if self.ai_check_right(x, y, grid):
-                                return '{},{}'.format(x, y)                              
-                        if x > 1 and y > 1:
-                            # If at least two positions from the top and left
-                            if self.ai_check_top_left(x, y, grid):
-                                return '{},{}'.format(x, y)                                   
-                        if x > 1 and y < grid.size - 2:
-                            # If at least two positions from the top and right
-                            if self.ai_check_top_right(x, y, grid):
-                                return '{},{}'.format(x, y)
-                        if x < grid.size - 2 and y > 1:
-                            # If at least two positions from the bottom and left
-                            if self.ai_check_bottom_left(x, y, grid):
-                                return '{},{}'.format(x, y)                                   
-                        if x < grid.size - 2 and y < grid.size - 2:
-                            # If at least two positions from the bottom and right
-                            if self.ai_check_bottom_right(x, y, grid):
-                                return '{},{}'.format(x, y)                                                           
-
-    def ai_check_horizontal(self, x, y, grid):
-        """Returns if adjacent horizontal positions are taken by the same char."""
-        if grid[x][y-1] and grid[x][y+1]:
-            return grid[x][y-1] == grid[x][y+1]
-
-    def ai_check_vertical(self, x, y, grid):
-        """Returns if adjacent vertical positions are taken by the same char."""
-        if grid[x+1][y] and grid[x-1][y]:
-            return grid[x+1][y] == grid[x-1][y]
-    
-    def ai_check_diagonal(self, x, y, grid):
-        """Returns if adjacent diagonal positions are taken by the same char."""
-        if (grid[x-1][y-1] and grid[x+1][y-2]) or (grid[x+1][y-1] and grid[x-1][y+1]):
-            return grid[x-1][y-1] == grid[x+1][y-2] or grid[x+1][y-1] == grid[x-1][y+1]
-
-    def ai_check_above(self, x, y, grid):
-        """Returns if both positions above are taken by the same char."""
-        if grid[x-1][y] and grid[x-2][y]:
-            return grid[x-1][y] == grid[x-2][y]
-    
-    def ai_check_top_right(self, x, y, grid):
-        """Returns if both positions to the top-right are taken by the same char."""
-        if grid[x-1][y+1] and grid[x-2][y+2]:
-            return grid[x-1][y+1] == grid[x-2][y+2]
-
-    def ai_check_right(self, x, y, grid):
-        """Returns if both positions to the right are taken by the same char."""
-        if grid[x][y+1] and grid[x][y+2]:
-            return grid[x][y+1] == grid[x][y+2]
-
-    def ai_check_bottom_right(self, x, y, grid):
-        """Returns if both positions to the bottom-right are taken by the same char."""
-        if grid[x+1][y+1] and grid[x+2][y+2]:
-            return grid[x+1][y+1] == grid[x+2][y+2]
-
-    def ai_check_below(self, x, y, grid):
-        """Returns if both positions below are taken by the same char."""
-        if grid[x+1][y] and grid[x+2][y]:
-            return grid[x+1][y] == grid[x+2][y]
-
-    def ai_check_bottom_left(self, x, y, grid):
-        """Returns if both positions to the bottom-left are taken by the same char."""
-        if grid[x+1][y-1] and grid[x+2][y-2]:
-            return grid[x+1][y-1] == grid[x+2][y-2]        
-
-    def ai_check_left(self, x, y, grid):
-        """Returns if both positions to the left are taken by the same char."""
-        if grid[x][y-1] and grid[x][y-2]:
-            return grid[x][y-1] == grid[x][y-2]
-
-    def ai_check_top_left(self, x, y, grid):
-        """Returns if both positions to the top-left are taken by the same char."""
-        if grid[x-1][y-1] and grid[x-2][y-2]:
-            return grid[x-1][y-1] == grid[x-2][y-2]
+        threats = self.threats
+        if threats is None or threats.size != grid.size:
+            threats = self.threats = ThreatBoard(grid.size, self.win_length,
+                                                 self.win_condition)
+        threats.sync(grid)
+        position = threats.best(self.char, self.turn_order)
+        if position is not None:
+            return Move(*divmod(position, grid.size))
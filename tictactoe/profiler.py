@@ -0,0 +1,165 @@
+import argparse
+import json
+import random
+from bisect import bisect_left
+
+from .game import HOOK_EVENTS
+from .simulation import create_game, play_game
+
+
+# Upper bounds of latency histogram buckets in milliseconds.
+HISTOGRAM_BOUNDS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100,
+                    200, 500, 1000, 2000, 5000)
+
+# Phase of a turn ending with every event, timed from the previous event.
+PHASES = {
+    'after_format': 'format',
+    'after_move': 'move',
+    'after_validation': 'validation',
+    'after_win_check': 'win_check',
+    'after_output': 'output',
+}
+
+
+class PhaseStats:
+    """Aggregated latencies of a phase, kept in fixed histogram buckets so
+    memory doesn't grow with the number of turns.
+
+    Attributes:
+        count (int): Number of timed phases.
+        total (float): Sum of latencies in seconds.
+        max (float): Largest latency in seconds.
+        buckets (list): Counts of latencies up to every bound of
+            HISTOGRAM_BOUNDS and above the last one.
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect_left(HISTOGRAM_BOUNDS, seconds * 1000)] += 1
+
+    def report(self):
+        """Return dict of the stats in milliseconds."""
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'mean_ms': round(self.total * 1000 / self.count, 4) if self.count else 0.0,
+            'max_ms': round(self.max * 1000, 3),
+            'histogram_ms': list(zip(HISTOGRAM_BOUNDS + (None,), self.buckets)),
+        }
+
+
+class Profiler:
+    """Collects latencies of the phases of every turn per player by hooks on
+    the events of a Game.
+
+    Phases are timed between consecutive events of a turn: "format" until the
+    grid and prompt are formatted into the frame of the turn, "move" until
+    input or AI decision arrives, "validation" by the referee, "win_check",
+    which includes the update of the grid, and "output" until the frame is
+    written. "turn" is the whole turn of the player.
+
+    Turns are followed per game, so games running at once in several threads
+    can be attached to the same profiler.
+
+    Attributes:
+        stats (dict): PhaseStats of every phase of every player char.
+        games (list): Attached games.
+        turns (dict): Start of the current turn and time of its last event
+            for every attached game by its id.
+    """
+    def __init__(self):
+        self.stats = {}
+        self.games = []
+        self.turns = {}
+
+    def attach(self, game):
+        """Add hooks of the profiler to the game."""
+        for event in HOOK_EVENTS:
+            game.add_hook(event, self.on_event)
+        self.games.append(game)
+        self.turns[id(game)] = [None, None]
+
+    def detach(self):
+        """Remove hooks of the profiler from all games."""
+        for game in self.games:
+            for event in HOOK_EVENTS:
+                game.remove_hook(event, self.on_event)
+        self.games = []
+        self.turns = {}
+
+    def on_event(self, game, event, player, now):
+        """Hook of all game events."""
+        turn = self.turns[id(game)]
+        if event == 'before_move':
+            turn[0] = turn[1] = now
+            return
+        if turn[1] is None:
+            return  # Attached in the middle of a turn
+        self.add(player.char, PHASES[event], now - turn[1])
+        turn[1] = now
+        if event == 'after_output':
+            self.add(player.char, 'turn', now - turn[0])
+            turn[1] = None
+
+    def add(self, char, phase, seconds):
+        """Add latency of a phase of the player with given char."""
+        phases = self.stats.setdefault(char, {})
+        try:
+            phases[phase].add(seconds)
+        except KeyError:
+            phases[phase] = PhaseStats()
+            phases[phase].add(seconds)
+
+    def report(self):
+        """Return dict of stats of every phase of every player char."""
+        return { char: { phase: stats.report()
+                         for phase, stats in phases.items() }
+                 for char, phases in self.stats.items() }
+
+    def save(self, path):
+        """Save the report to a json file."""
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=4)
+
+
+def print_report(report):
+    """Print mean and max latency of every phase of every player."""
+    for char, phases in sorted(report.items()):
+        print('Player {}:'.format(char))
+        for phase, stats in phases.items():
+            print('    {:<12} {:>8} x  mean {:>10.4f} ms  max {:>10.3f} ms'.format(
+                phase, stats['count'], stats['mean_ms'], stats['max_ms']))
+
+
+def main(args=None):
+    """Profile headless games of AI players from the command line."""
+    parser = argparse.ArgumentParser(description='Profile phases of game turns.')
+    parser.add_argument('config', help='path to the json config file')
+    parser.add_argument('-n', '--games', type=int, default=100)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='save report to a json file')
+    args = parser.parse_args(args)
+
+    with open(args.config) as f:
+        config = json.load(f)
+    profiler = Profiler()
+    rng = random.Random(args.seed)
+    with create_game(config) as game:
+        profiler.attach(game)
+        for _ in range(args.games):
+            play_game(game, rng.randrange(2 ** 32))
+    if args.output:
+        profiler.save(args.output)
+    print_report(profiler.report())
+
+
+if __name__ == '__main__':
+    main()
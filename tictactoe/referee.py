@@ -1,5 +1,5 @@
-import re
-import sys
+from .lines import DIRECTIONS, line_index
+from .move import Move, parse_move
 
 
 class Referee:
@@ -8,196 +8,195 @@ class Referee:
     Every human input and AI decision should be validated and processed by the
     Referee before it can be applied on the grid.
 
-    The referee also checks the grid at the end of each turn and exits the game
-    when win condition was met or when the grid is fully occupied.
+    The referee also checks the grid at the end of each turn and announces the
+    end of the game when win condition was met or when the grid is fully
+    occupied.
     
     Args:
         game (Game): Game instance which initialized the Referee.
     
     Attributes:
         grid (Grid): Grid instance to be watched by the Referee.
+        renderer (Renderer): Renderer of the game used for all output.
+        win_length (int): Number of adjacent characters needed to win.
+        rejection (str): Reason why the last input was rejected, None if it
+            was valid.
     
     """
     def __init__(self, game):
-        print('Initializing Referee ...')
+        self.renderer = game.renderer
+        self.renderer.info('Initializing Referee ...')
         self.game = game
         self.grid = game.grid
+        self.win_length = game.config['grid'].get('win_length', 3)
+        self.rejection = None
 
     def validate_input(self, data, player):
-        """Validates user input and returns True if it's valid.
-        
+        """Validates input of the player and returns the Move if it's valid,
+        otherwise None. The reason of a rejection is kept in `rejection`.
+
         Args:
-            data (str): String input from the player or AI to be validated.
+            data (Move or str): Move of an AI or string input from the player
+                which is parsed into a Move first.
             player (Player): Player instance which sent the input.
         """
-        cleaned_data = data.replace(' ', '').strip()
-        # Check if stripped input matches regex pattern.
-        if re.search(r'^\d\,\d$', cleaned_data):
-            pass    # Pattern matched, continue validation.
-        else:
-            print('Referee says:',
-                  '"Nope! You must provide input in "<row>,<col>" format."' )
-            print('Try again:', end=' ')
+        move = data if isinstance(data, Move) else parse_move(data)
+        if move is None:
+            self.reject('You must provide input in "<row>,<col>" format.')
             return
 
         # Check if values are in range of grid.
-        xy = cleaned_data.split(',')
-        for val in xy:
-            if not 0 <= int(val) <= self.grid.size - 1:
-                print('Referee says:',
-                      '"Nope! You must provide values which fit on the grid."' )
-                print('Try again:', end=' ')
-                return
-        
+        x, y = move
+        size = self.grid.size
+        if not (0 <= x < size and 0 <= y < size):
+            self.reject('You must provide values which fit on the grid.')
+            return
+
         # Check if grid position is occupied.
-        x = int(xy[0])
-        y = int(xy[1])
         if not self.grid.is_occupied(x, y):
-            print('Referee says: "OK! Player {} takes position ({},{})."'\
+            self.rejection = None
+            self.renderer.message('Referee says: "OK! Player {} takes position ({},{})."'\
                   .format(player.char, x, y))
-            return True  # Confirm move.
+            return move  # Confirm move.
         else:
-            print('Referee says: "Nope! This position is already taken."' )
-            print('Try again:', end=' ')
-        
+            self.reject('This position is already taken.')
+
+    def reject(self, reason):
+        """Keep the reason of a rejected input and tell the player."""
+        self.rejection = reason
+        self.renderer.message('Referee says:', '"Nope! {}"'.format(reason))
+        self.renderer.message('Try again:', end=' ')
+
     def process_input(self, data):
-        """Process string input from player or AI and return pair of ints which
-        repersent x, y position to be taken the grid.
+        """Return pair of ints which represent x, y position of the Move or
+        string input to be taken on the grid.
+
+        This method expects that the input was already validated by
+        `validate_input` method and that the data is correct. The Move
+        returned by `validate_input` can be used as x, y pair directly.
 
-        This method expects that input string was already validated by
-        `validate_input` method and that the data is correct.
-        
         Args:
-            data (Data): String input from the player or AI to be processed.
+            data (Move or str): Move or string input to be processed.
         """
-        cleaned_data = data.replace(' ', '').strip()
-        xy = cleaned_data.split(',')
-        x = int(xy[0])
-        y = int(xy[1])        
-        return x, y
-    
-    def check_for_winner(self):
-        """Check the grid field by field and exit the game with SystemExit
-        if three adjacent characters of the same player were found in 
-        horizontal, vertical or diagonal line.
-        
-        The check is skipped for occupied positions and corners of the grid.
+        if not isinstance(data, Move):
+            data = parse_move(data)
+        return data.row, data.col
 
-        Bottom and top row positions are checked against adjacent horizontal
-        characters while left and right most rows are only checked vertically.
+    def check_for_winner(self, x=None, y=None):
+        """Announce the end of the game and return the char of the winner
+        if the win condition was met, otherwise return None.
 
-        Remaining positions are checked against all adjacent positions.
-        """
-        grid = self.grid
-
-        if self.game.config['grid']['win_condition'] == 'corners':
-            if self.corners_check():
-                self.grid.show()
-                print('{} IS THE WINNER!'.format(grid[0][0]))
-                print('\nGame finished in {} turns.'\
-                        .format(self.game.completed_turns))
-                sys.exit()
-
-
-        for x in range(grid.size):
-            for y in range(grid.size):
-                if len(grid[x][y]) > 0: # Only check if position is taken
-                    # Skip check if in the corner of the grid
-                    if x == 0 and y == 0:   
-                        # Top left
-                        continue
-                    if x == 0 and y == grid.size - 1:
-                        # Top right
-                        continue
-                    if x == grid.size - 1 and y == 0:
-                        # Bottom left
-                        continue
-                    if x == grid.size - 1 and y == grid.size - 1:
-                        # Bottom right
-                        continue
-                    
-                    # Check only horizontally when on the top and bottoms rows.
-                    if x == 0 or x == grid.size - 1:
-                        # print('Checking horizontally on', x, y)
-                        if self.horizontal_check(x, y):
-                            self.grid.show()
-                            print('{} IS THE WINNER!'.format(grid[x][y]))
-                            print('\nGame finished in {} turns.'\
-                                  .format(self.game.completed_turns))
-                            sys.exit()
-                    # Check only vertically when on the left or right most cols.
-                    elif y == 0 or y == grid.size - 1:
-                        if self.vertical_check(x, y):
-                            self.grid.show()
-                            print('{} IS THE WINNER!'.format(grid[x][y]))
-                            print('\nGame finished in {} turns.'\
-                                  .format(self.game.completed_turns))
-                            sys.exit()
-                    # Check in all directions when elsewhere.
-                    else:
-                        if self.horizontal_check(x, y) or\
-                           self.vertical_check(x, y) or\
-                           self.diagonal_check(x, y):
-                            self.grid.show()
-                            print('{} IS THE WINNER!'.format(grid[x][y]))
-                            print('\nGame finished in {} turns.'\
-                                  .format(self.game.completed_turns))
-                            sys.exit()
-                
-    def horizontal_check(self, x, y):
-        """Returns True if three adjacent horizontal positions are the same.
-        
-        Takes row and col index and checks two adjacent horizontal positions.
+        When the position of the last move is given, only the lines passing
+        through that position are checked, which keeps the cost of the check
+        constant no matter how large the grid is. Without a position the whole
+        grid is scanned with `find_winner`.
 
         Args:
-            x (int): Represents row number on the grid.
-            y (int): Represents col number on the grid.
+            x (int): Row of the last move on the grid (optional).
+            y (int): Col of the last move on the grid (optional).
         """
-        grid = self.grid
-        if grid[x][y] == grid[x][y-1] == grid[x][y+1]:
-            return True
+        if x is None or y is None:
+            winner = self.find_winner()
+        else:
+            winner = self.winner_at(x, y)
 
-    def vertical_check(self, x, y):
-        """Returns True if three adjacent vertical positions are the same.
-        
-        Takes row and col index and checks two adjacent vertical positions.
+        if winner:
+            self.grid.show()
+            self.renderer.message('{} IS THE WINNER!'.format(winner))
+            self.renderer.message('\nGame finished in {} turns.'\
+                  .format(self.game.completed_turns))
+        return winner
+
+    def winner_at(self, x, y):
+        """Return the char of the player who won with a move on the given
+        position or None if the move didn't complete a winning line.
+
+        Runs of the same char are counted outward from the position in both
+        ways of each horizontal, vertical and diagonal direction.
 
         Args:
             x (int): Represents row number on the grid.
             y (int): Represents col number on the grid.
         """
         grid = self.grid
-        if grid[x][y] == grid[x-1][y] == grid[x+1][y]:
-            return True      
+        char = grid[x][y]
+        if not char:
+            return
+
+        if self.game.config['grid']['win_condition'] == 'corners':
+            last = grid.size - 1
+            if x in (0, last) and y in (0, last) and self.corners_check():
+                return char
+
+        for dx, dy in DIRECTIONS:
+            run = self.count_run(x, y, dx, dy, char) + \
+                  self.count_run(x, y, -dx, -dy, char) - 1
+            if run >= self.win_length:
+                return char
+
+    def count_run(self, x, y, dx, dy, char):
+        """Return the number of consecutive chars starting at the given
+        position (inclusive) and moving in the direction of dx, dy.
 
-    def diagonal_check(self, x, y):
-        """Returns True if three adjacent diagonal positions are the same.
-        
-        Takes row and col index and checks two adjacent diagonal positions
-        in two possible combinations.
+        Counting stops as soon as a winning run length is reached.
 
         Args:
-            x (int): Represents row number on the grid.
-            y (int): Represents col number on the grid.
+            x (int): Row of the starting position.
+            y (int): Col of the starting position.
+            dx (int): Row step of the direction (-1, 0 or 1).
+            dy (int): Col step of the direction (-1, 0 or 1).
+            char (str): Player char to be counted.
         """
         grid = self.grid
-        if grid[x][y] == grid[x-1][y-1] == grid[x+1][y+1] or \
-           grid[x][y] == grid[x-1][y+1] == grid[x+1][y-1]:
-            return True
+        size = grid.size
+        run = 0
+        while 0 <= x < size and 0 <= y < size and run < self.win_length \
+                and grid[x][y] == char:
+            run += 1
+            x += dx
+            y += dy
+        return run
+
+    def find_winner(self):
+        """Check all winning lines of the grid and return the char of the
+        winner if all positions of a line are taken by the same player.
+
+        Lines are looked up in the index built once per grid size and win
+        condition, see `tictactoe.lines.line_index`.
+        """
+        grid = self.grid
+        win_condition = self.game.config['grid']['win_condition']
+
+        if hasattr(grid, 'has_run'):
+            # Bitboard and sparse grids check all lines of a player at once.
+            if win_condition == 'corners' and self.corners_check():
+                return grid[0][0]
+            for char in grid.chars():
+                if grid.has_run(char, self.win_length):
+                    return char
+            return
+
+        for line in line_index(grid.size, self.win_length, win_condition).lines:
+            x, y = line[0]
+            char = grid[x][y]
+            if char and all(grid[x][y] == char for x, y in line):
+                return char
 
     def corners_check(self):
-        """Exits the game if four corners are occupied by the same char."""
+        """Returns True if four corners are occupied by the same char."""
         grid = self.grid
-        if grid[0][0] == grid[grid.size - 1][grid.size - 1] == \
+        if grid[0][0] and grid[0][0] == grid[grid.size - 1][grid.size - 1] == \
            grid[grid.size - 1][0] == grid[0][grid.size - 1]:
             return True
 
     def check_for_full_grid(self):
-        """Exits the game if the grid is fully occupied."""
+        """Announces the end of the game and returns True if the grid is
+        fully occupied."""
         grid = self.grid
         if grid.is_full():
             self.grid.show()
-            print('YOU ARE ALL LOSERS!')
-            print('\nGrid full. Game finished in {} turns.'\
+            self.renderer.message('YOU ARE ALL LOSERS!')
+            self.renderer.message('\nGrid full. Game finished in {} turns.'\
                   .format(self.game.completed_turns))
-            sys.exit()
+            return True
+        return False
@@ -0,0 +1,129 @@
+import sys
+from contextlib import contextmanager
+
+
+class Renderer:
+    """Base class of renderers which turn the game state into output.
+
+    Game, Grid, Player and Referee send all their output through a renderer
+    instead of calling print directly. Subclasses only need to implement
+    `write`.
+
+    Attributes:
+        verbose (bool): Output `info` messages, e.g. banners of constructors.
+    """
+    verbose = False
+
+    def write(self, text):
+        """Output the given text."""
+        raise NotImplementedError
+
+    def flush(self):
+        """Output everything what was buffered so far."""
+
+    @contextmanager
+    def frame(self):
+        """Group all output written within the block into a single frame."""
+        yield
+
+    def message(self, *args, sep=' ', end='\n'):
+        """Output the arguments the same way as print does."""
+        self.write(sep.join(str(arg) for arg in args) + end)
+
+    def info(self, *args, sep=' ', end='\n'):
+        """Output the arguments like `message` if the renderer is verbose."""
+        if self.verbose:
+            self.message(*args, sep=sep, end=end)
+
+    def show_grid(self, grid, window=None):
+        """Output the grid with row and col numbers."""
+        self.write(self.format_grid(grid, window))
+
+    def format_grid(self, grid, window=None):
+        """Return the grid with row and col numbers as a single string.
+
+        Args:
+            grid (Grid): The grid instance to be formatted.
+            window (tuple): Ranges of rows and cols to be included (optional).
+        """
+        if window is None:
+            window = range(grid.size), range(grid.size)
+            grid = grid.data
+        rows, cols = window
+        separator = '\t ' + '--------' * len(cols) + '\n'
+        parts = ['\n\t']
+        for y in cols:
+            parts.append('    {}\t'.format(y))
+        parts.append('\r\n')
+        parts.append(separator)
+        for x in rows:
+            row = grid[x]
+            parts.append('    {}\t'.format(x))
+            for y in cols:
+                parts.append('|   {}\t'.format(row[y]))
+            parts.append('|\r\n')
+            parts.append(separator)
+        parts.append('\r\n')
+        return ''.join(parts)
+
+
+class AnsiRenderer(Renderer):
+    """Renderer writing to a terminal stream with as few writes as possible.
+
+    Every grid is formatted into one string and written at once. All output
+    within a `frame` block is buffered and written with a single write when
+    the block ends or when `flush` is called, e.g. before asking for input.
+
+    Args:
+        stream (file): Stream to write to, defaults to current sys.stdout.
+        clear (bool): Clear the terminal with ANSI escape codes before
+            every grid is shown.
+        verbose (bool): Output `info` messages.
+    """
+    CLEAR_SCREEN = '\x1b[H\x1b[2J'
+
+    def __init__(self, stream=None, clear=False, verbose=False):
+        self.stream = stream
+        self.clear = clear
+        self.verbose = verbose
+        self.buffer = None
+
+    def write(self, text):
+        if self.buffer is None:
+            self.output(text)
+        else:
+            self.buffer.append(text)
+
+    def flush(self):
+        if self.buffer:
+            self.output(''.join(self.buffer))
+            self.buffer = []
+
+    @contextmanager
+    def frame(self):
+        self.buffer = []
+        try:
+            yield
+        finally:
+            self.flush()
+            self.buffer = None
+
+    def show_grid(self, grid, window=None):
+        if self.clear:
+            self.write(self.CLEAR_SCREEN)
+        self.write(self.format_grid(grid, window))
+
+    def output(self, text):
+        (self.stream or sys.stdout).write(text)
+
+
+class NullRenderer(Renderer):
+    """Renderer for headless games which discards all output."""
+    def write(self, text):
+        pass
+
+    def message(self, *args, sep=' ', end='\n'):
+        pass
+
+    def show_grid(self, grid, window=None):
+        pass
@@ -0,0 +1,167 @@
+import argparse
+import json
+from collections import Counter, namedtuple
+from multiprocessing import Pool
+
+from .game import Game
+from .movelog import read_games
+from .renderer import NullRenderer
+
+
+ReplayResult = namedtuple('ReplayResult', ['winner', 'win_turn', 'turns', 'state',
+                                           'illegal'])
+ReplayResult.__doc__ = """Outcome of a replayed game returned by `Replayer.replay`.
+
+Attributes:
+    winner (str): Char of the winning player or None if nobody won.
+    win_turn (int): Number of the turn which won the game or None.
+    turns (int): Number of replayed moves.
+    state (tuple): Final grid as a tuple of rows.
+    illegal (tuple): Turn number and reason of the first illegal move or
+        None if all moves were legal. Replay stops at an illegal move. Games
+        recorded on a grid of another size are illegal at turn 0.
+"""
+
+# Game instance reused by all replays within a worker process.
+_worker_replayer = None
+
+
+class Replayer:
+    """Replays recorded moves on one grid and referee without any output.
+
+    Moves are checked like `Referee.validate_input` checks them: they need to
+    fit on the grid and take a free position. Moves made after the game was
+    won or the grid was full are illegal too. Winners are found with the rules
+    of the given config, so archived games can be re-verified after a rule
+    change.
+
+    Args:
+        config (dict): Game config with the rules to replay the games with.
+    """
+    def __init__(self, config):
+        self.game = Game(config, NullRenderer())
+        self.grid = self.game.grid
+        self.referee = self.game.referee
+
+    def replay(self, moves, size=None):
+        """Replay a game on the cleared grid and return its ReplayResult.
+
+        Args:
+            moves (list): List of (char, x, y) tuples in order of turns.
+            size (int): Size of the grid the game was recorded on (optional).
+                Games of other sizes than the grid of the config aren't
+                replayed.
+        """
+        grid = self.grid
+        cells = grid.size ** 2
+        winner_at = self.referee.winner_at
+        grid.clear()
+        winner = None
+        win_turn = None
+        illegal = None
+        turns = 0
+
+        if size is not None and size != grid.size:
+            illegal = (0, 'The game was recorded on a {0}x{0} grid.'.format(size))
+            moves = ()
+        size = grid.size
+        for turn, (char, x, y) in enumerate(moves, 1):
+            if winner is not None or turns == cells:
+                illegal = (turn, 'The game has already ended.')
+            elif not (0 <= x < size and 0 <= y < size):
+                illegal = (turn, 'You must provide values which fit on the grid.')
+            elif grid.is_occupied(x, y):
+                illegal = (turn, 'This position is already taken.')
+            if illegal:
+                break
+            grid.update(x, y, char)
+            turns = turn
+            if winner_at(x, y):
+                winner = char
+                win_turn = turn
+
+        state = tuple( tuple(row) for row in grid )
+        return ReplayResult(winner, win_turn, turns, state, illegal)
+
+
+def _init_worker(config):
+    global _worker_replayer
+    _worker_replayer = Replayer(config)
+
+
+def _replay_in_worker(game):
+    return _worker_replayer.replay(*game)
+
+
+def iter_replay(config, games, processes=None, chunksize=256):
+    """Replay games and yield their ReplayResults in the same order.
+
+    Games are spread across a pool of worker processes, every worker replays
+    its share on a single Replayer.
+
+    Args:
+        config (dict): Game config with the rules to replay the games with.
+        games (iterable): Lists of (char, x, y) moves or GameRecords. Records
+            of grids of another size than the config's are illegal.
+        processes (int): Number of worker processes, defaults to CPU count.
+            With 1 the games are replayed in the current process.
+        chunksize (int): Number of games sent to a worker at once.
+    """
+    config = dict(config)
+    games = ( (getattr(game, 'moves', game), getattr(game, 'size', None))
+              for game in games )
+
+    if processes == 1:
+        replayer = Replayer(config)
+        for game_moves, size in games:
+            yield replayer.replay(game_moves, size)
+        return
+
+    with Pool(processes, initializer=_init_worker, initargs=(config,)) as pool:
+        for result in pool.imap(_replay_in_worker, games, chunksize):
+            yield result
+
+
+def summarize(results):
+    """Return a dict with win counts per player char, number of draws,
+    unfinished games and games with illegal moves of the replay results."""
+    wins = Counter()
+    draws = 0
+    unfinished = 0
+    illegal = 0
+    games = 0
+    for result in results:
+        games += 1
+        if result.illegal:
+            illegal += 1
+        elif result.winner is not None:
+            wins[result.winner] += 1
+        elif all(all(row) for row in result.state):
+            draws += 1
+        else:
+            unfinished += 1
+    return {
+        'games': games,
+        'wins': dict(wins),
+        'draws': draws,
+        'unfinished': unfinished,
+        'illegal': illegal,
+    }
+
+
+def main(args=None):
+    """Replay a move log from the command line and print its summary."""
+    parser = argparse.ArgumentParser(description='Replay and verify logged games.')
+    parser.add_argument('config', help='path to the json config file')
+    parser.add_argument('log', help='path to the move log file')
+    parser.add_argument('-p', '--processes', type=int, default=None)
+    args = parser.parse_args(args)
+
+    with open(args.config) as f:
+        config = json.load(f)
+    results = iter_replay(config, read_games(args.log), args.processes)
+    print(json.dumps(summarize(results), indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+import random
+import time
+
+from .lines import flat_line_index, neighbours
+
+
+# Score of a won position. Wins found sooner score higher.
+WIN = 1000000
+
+# Flags of transposition table entries.
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class Timeout(Exception):
+    """Raised inside the search when the time budget of a move runs out."""
+
+
+class TranspositionTable:
+    """Fixed size table of search results indexed by Zobrist hash.
+
+    Every hash maps to a single slot. An occupied slot is replaced when the new
+    entry belongs to the same position, when the stored entry comes from an
+    earlier search or when the new entry was searched at least as deep.
+
+    Args:
+        size (int): Maximum number of stored entries.
+    """
+    def __init__(self, size=2 ** 16):
+        self.size = size
+        self.slots = [None] * size
+        self.generation = 0
+
+    def new_search(self):
+        """Mark all stored entries as coming from an earlier search."""
+        self.generation += 1
+
+    def get(self, key):
+        entry = self.slots[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+
+    def put(self, key, depth, value, flag, move):
+        i = key % self.size
+        entry = self.slots[i]
+        if entry is None or entry[0] == key or \
+           entry[5] != self.generation or depth >= entry[1]:
+            self.slots[i] = (key, depth, value, flag, move, self.generation)
+
+
+class AlphaBeta:
+    """Search based AI strategy using negamax with alpha-beta pruning.
+
+    The search deepens iteratively until the time limit runs out and returns
+    the best move of the deepest completed iteration. Positions are cached in
+    a Zobrist hashed transposition table kept between moves.
+
+    With more than two players the search is paranoid: all opponents are
+    treated as one side trying to minimize the score of the deciding player.
+    Values are negated only when the turn passes between the two sides.
+
+    Args:
+        time_limit (float): Time budget of a single move in seconds.
+        win_length (int): Number of positions in a winning line.
+        win_condition (str): Either "standard" or "corners".
+        table_size (int): Maximum number of transposition table entries.
+    """
+    def __init__(self, time_limit=1.0, win_length=3, win_condition='standard',
+                 table_size=2 ** 16):
+        self.time_limit = time_limit
+        self.win_length = win_length
+        self.win_condition = win_condition
+        self.table = TranspositionTable(table_size)
+        self.size = None
+        self.keys = {}
+        self.rng = random.Random(0)
+
+    def decide(self, grid, char, turn_order=None):
+        """Return x, y of the best move found for the player with given char.
+
+        Args:
+            grid (Grid): The grid instance on which the move has to take place.
+            char (str): Char of the deciding player.
+            turn_order (list): Chars of all players in order of their turns.
+        """
+        self.deadline = time.perf_counter() + self.time_limit
+        self.nodes = 0
+        self.setup(grid, char, turn_order)
+        self.table.new_search()
+
+        moves = self.candidates()
+        best = moves[0]
+        for depth in range(1, len(self.free) + 1):
+            try:
+                score, move = self.search_root(depth)
+            except Timeout:
+                break
+            best = move
+            if abs(score) >= WIN - len(self.cells):
+                break  # Forced win or loss found, deeper search won't help.
+        return divmod(best, self.size)
+
+    def setup(self, grid, char, turn_order):
+        """Copy the grid into the internal flat representation."""
+        if grid.size != self.size:
+            self.size = grid.size
+            self.lines, self.cell_lines = flat_line_index(
+                grid.size, self.win_length, self.win_condition)
+            self.neighbours = neighbours(grid.size)
+            self.table = TranspositionTable(self.table.size)
+
+        chars = list(turn_order or [])
+        if char not in chars:
+            chars.insert(0, char)
+        for row in grid:
+            for c in row:
+                if c and c not in chars:
+                    chars.append(c)
+        self.chars = chars
+        self.players = len(chars)
+        self.root = chars.index(char)
+
+        size = self.size
+        self.cells = [-1] * size ** 2
+        self.free = set(range(size ** 2))
+        self.counts = [ [0] * self.players for _ in self.lines ]
+        self.near = [0] * size ** 2
+        self.hash = 0
+        self.score = 0
+        for x in range(size):
+            for y in range(size):
+                if grid[x][y]:
+                    self.place(x * size + y, chars.index(grid[x][y]))
+
+    def key(self, i, player):
+        """Return Zobrist key of a player char on position i."""
+        char = self.chars[player]
+        try:
+            return self.keys[i, char]
+        except KeyError:
+            key = self.keys[i, char] = self.rng.getrandbits(64)
+            return key
+
+    def line_value(self, counts):
+        """Return heuristic value of a line for the side of the root player."""
+        owner = None
+        for player, count in enumerate(counts):
+            if count:
+                if owner is not None:
+                    return 0  # Line is blocked
+                owner = player
+        if owner is None:
+            return 0
+        value = 8 ** counts[owner]
+        return value if owner == self.root else -value
+
+    def place(self, i, player):
+        """Put player on position i and return True if it completed a line."""
+        won = False
+        for n in self.cell_lines[i]:
+            counts = self.counts[n]
+            self.score -= self.line_value(counts)
+            counts[player] += 1
+            self.score += self.line_value(counts)
+            if counts[player] == len(self.lines[n]):
+                won = True
+        self.cells[i] = player
+        self.free.discard(i)
+        for j in self.neighbours[i]:
+            self.near[j] += 1
+        self.hash ^= self.key(i, player)
+        return won
+
+    def remove(self, i, player):
+        """Take player off position i."""
+        for n in self.cell_lines[i]:
+            counts = self.counts[n]
+            self.score -= self.line_value(counts)
+            counts[player] -= 1
+            self.score += self.line_value(counts)
+        self.cells[i] = -1
+        self.free.add(i)
+        for j in self.neighbours[i]:
+            self.near[j] -= 1
+        self.hash ^= self.key(i, player)
+
+    def candidates(self, first=None):
+        """Return free positions worth searching, most promising first.
+
+        Only positions next to an occupied one are considered, unless the grid
+        is empty. Positions are ordered by the sum of line values through them.
+        """
+        moves = [ i for i in self.free if self.near[i] ]
+        if not moves:
+            return sorted(self.free, key=self.distance_from_center)
+
+        def activity(i):
+            total = 0
+            for n in self.cell_lines[i]:
+                total += abs(self.line_value(self.counts[n]))
+            return total
+
+        moves.sort(key=activity, reverse=True)
+        if first in moves:
+            # Search the best move of an earlier search first.
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def distance_from_center(self, i):
+        x, y = divmod(i, self.size)
+        center = (self.size - 1) / 2
+        return abs(x - center) + abs(y - center)
+
+    def side(self, player):
+        """Return True for the root player's side."""
+        return player == self.root
+
+    def search_root(self, depth):
+        """Search all root moves to the given depth and return best score and move."""
+        entry = self.table.get(self.hash ^ self.key(-1, self.root))
+        moves = self.candidates(entry[4] if entry else None)
+        best_score, best_move = -WIN - 1, moves[0]
+        alpha, beta = -WIN - 1, WIN + 1
+        for i in moves:
+            score = self.score_move(i, self.root, depth, alpha, beta, 0)
+            if score > best_score:
+                best_score, best_move = score, i
+            alpha = max(alpha, score)
+        return best_score, best_move
+
+    def score_move(self, i, player, depth, alpha, beta, ply):
+        """Return value of a move from the side of the player making it."""
+        won = self.place(i, player)
+        try:
+            if won:
+                return WIN - ply
+            if not self.free:
+                return 0
+            following = (player + 1) % self.players
+            if self.side(following) == self.side(player):
+                return self.negamax(following, depth - 1, alpha, beta, ply + 1)
+            return -self.negamax(following, depth - 1, -beta, -alpha, ply + 1)
+        finally:
+            self.remove(i, player)
+
+    def negamax(self, player, depth, alpha, beta, ply):
+        """Return value of the position from the side of the player to move."""
+        self.nodes += 1
+        if not self.nodes & 255 and time.perf_counter() > self.deadline:
+            raise Timeout
+
+        if depth <= 0:
+            return self.score if self.side(player) else -self.score
+
+        key = self.hash ^ self.key(-1, player)
+        entry = self.table.get(key)
+        first = None
+        if entry is not None:
+            first = entry[4]
+            if entry[1] >= depth:
+                value, flag = entry[2], entry[3]
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        original_alpha = alpha
+        best_score, best_move = -WIN - 1, None
+        for i in self.candidates(first):
+            score = self.score_move(i, player, depth, alpha, beta, ply)
+            if score > best_score:
+                best_score, best_move = score, i
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.put(key, depth, best_score, flag, best_move)
+        return best_score
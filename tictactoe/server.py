@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import sys
+
+from .config import GameConfig
+
+
+class GameServer:
+    """Hosts games over TCP with a line based protocol.
+
+    Every connection plays its own games on a Game instance created from the
+    config. The client makes the moves of all players without AI, AI moves
+    are decided in an executor, so they don't block other games. Lines sent
+    by the server:
+
+        START <chars>         New game with chars in order of turns.
+        TURN <char>           Client needs to send a move as "<row>,<col>".
+        MOVE <char> <row>,<col>  A move was played.
+        ERROR <reason>        The move was rejected, send another one.
+        WIN <char> <turns>    The game was won.
+        DRAW <turns>          The grid is full.
+        TIMEOUT               The client didn't send anything in time.
+        BYE                   The connection is closed.
+
+    After the end of a game the client sends NEW to play again or QUIT.
+
+    Players of served games can't use MCTS `workers`, as every connection
+    would start its own worker processes. ValueError is raised for configs
+    with more than one worker per player.
+
+    Args:
+        config (dict): Validated game config.
+        timeout (float): Seconds to wait for a line of the client.
+        executor (Executor): Executor of AI moves, defaults to the one of the
+            event loop.
+
+    Attributes:
+        games (int): Number of games running at the moment.
+    """
+    def __init__(self, config, timeout=60.0, executor=None):
+        check_workers(config)
+        self.config = dict(config)
+        self.timeout = timeout
+        self.executor = executor
+        self.games = 0
+
+    async def start(self, host='127.0.0.1', port=8023, backlog=1024):
+        """Start listening and return the asyncio server.
+
+        The backlog of pending connections is large enough for thousands of
+        clients connecting at once.
+        """
+        return await asyncio.start_server(self.handle, host, port, backlog=backlog)
+
+    async def handle(self, reader, writer):
+        """Serve games to a single connection until it quits or times out."""
+        # Imported on demand, so the server starts without loading the game.
+        from .game import Game
+        from .renderer import NullRenderer
+        game = Game(self.config, NullRenderer())
+        try:
+            command = 'NEW'
+            while command == 'NEW':
+                self.games += 1
+                try:
+                    await self.play(game, reader, writer)
+                finally:
+                    self.games -= 1
+                game.reset()
+                command = (await self.read_line(reader)).upper()
+            self.send(writer, 'BYE')
+        except asyncio.TimeoutError:
+            self.send(writer, 'TIMEOUT')
+        except (ConnectionError, EOFError, ValueError):
+            pass  # Client is gone or sent a line which is too long
+        finally:
+            game.close()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def play(self, game, reader, writer):
+        """Play a game of the connection and return its GameResult."""
+        loop = asyncio.get_running_loop()
+        game.seat_players()
+        self.send(writer, 'START', *( player.char for player in game.players ))
+        while True:
+            for player in game.players:
+                if player.ai:
+                    move = None
+                    while move is None:
+                        # Ask the AI again like Game.run if the move is rejected
+                        data = await loop.run_in_executor(
+                            self.executor, player.ai_move, game.grid)
+                        move = game.referee.validate_input(data, player)
+                else:
+                    self.send(writer, 'TURN', player.char)
+                    move = None
+                    while move is None:
+                        data = await self.read_line(reader)
+                        move = game.referee.validate_input(data, player)
+                        if move is None:
+                            self.send(writer, 'ERROR', game.referee.rejection)
+                self.send(writer, 'MOVE', player.char, move)
+                result = game.play_move(player, move)
+                if result:
+                    if result.draw:
+                        self.send(writer, 'DRAW', result.turns)
+                    else:
+                        self.send(writer, 'WIN', result.winner, result.turns)
+                    await writer.drain()
+                    return result
+            await writer.drain()
+
+    async def read_line(self, reader):
+        """Return the next line of the client without line end.
+
+        Raises asyncio.TimeoutError if the client didn't send a line in time
+        and EOFError if the client closed the connection.
+        """
+        line = await asyncio.wait_for(reader.readline(), self.timeout)
+        if not line:
+            raise EOFError
+        return line.decode(errors='replace').strip()
+
+    def send(self, writer, *args):
+        """Send the arguments as a line separated by spaces."""
+        writer.write((' '.join(str(arg) for arg in args) + '\n').encode())
+
+
+def check_workers(config):
+    """Raise ValueError if a player of the config has more than one worker."""
+    for player in config['players'].values():
+        if player.get('workers', 1) > 1:
+            raise ValueError('Player {} can\'t use MCTS workers in served games,'
+                             ' every connection would start its own worker'
+                             ' processes.'.format(player['char']))
+
+
+async def serve(config, host='127.0.0.1', port=8023, timeout=60.0):
+    """Run a GameServer until it's cancelled."""
+    server = await GameServer(config, timeout).start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(args=None):
+    """Run the game server from the command line."""
+    parser = argparse.ArgumentParser(prog='ttt serve',
+                                     description='Host games over TCP.')
+    parser.add_argument('config', nargs='?', default='config.json',
+                        help='config file in project root')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('-p', '--port', type=int, default=8023)
+    parser.add_argument('-t', '--timeout', type=float, default=60.0,
+                        help='seconds to wait for a move of a client')
+    args = parser.parse_args(args)
+
+    config = GameConfig(args.config)
+    if config.is_valid():
+        try:
+            check_workers(config)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        print('Serving games on {}:{} ...'.format(args.host, args.port))
+        try:
+            asyncio.run(serve(config, args.host, args.port, args.timeout))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
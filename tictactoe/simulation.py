@@ -0,0 +1,133 @@
+import argparse
+import json
+import random
+from collections import Counter
+from multiprocessing import Pool
+
+from .game import Game
+from .renderer import NullRenderer
+
+
+# Game instance reused by all simulations within a worker process.
+_worker_game = None
+
+
+def create_game(config):
+    """Initialize a headless Game from the config and return it.
+
+    Args:
+        config (dict): Game config where all players need to have AI enabled.
+    """
+    for name, player in config['players'].items():
+        if not player.get('ai'):
+            raise ValueError('Player {} needs to have AI enabled to be '
+                             'simulated.'.format(name))
+    return Game(config, NullRenderer())
+
+
+def play_game(game, seed=None):
+    """Reset the given Game instance, play a single game on it and return
+    its GameResult.
+
+    Args:
+        game (Game): Game instance with AI players only.
+        seed (int): Seed for the random generator used by the game and the AI.
+    """
+    if seed is not None:
+        random.seed(seed)
+    game.reset()
+    return game.run()
+
+
+def _init_worker(config):
+    """Create the Game of a worker process and seed its random generator.
+
+    Without reseeding, forked workers would inherit the same random state
+    from the parent and play identical games.
+    """
+    global _worker_game
+    _worker_game = create_game(config)
+    random.seed()
+
+
+def _play_in_worker(seed):
+    return play_game(_worker_game, seed)
+
+
+def iter_simulate(config, games, processes=None, seed=None, chunksize=64):
+    """Play a number of AI-vs-AI games and yield their results as they finish.
+
+    Games are spread across a pool of worker processes. Every worker plays its
+    share of games on a single Game instance. If seed is given, game number i
+    is played with seed `seed + i`, so results don't depend on the number of
+    processes. Otherwise every worker is seeded from the system randomness.
+
+    Args:
+        config (dict): Game config where all players need to have AI enabled.
+        games (int): Number of games to be played.
+        processes (int): Number of worker processes, defaults to CPU count.
+            With 1 the games are played in the current process.
+        seed (int): Base seed for reproducible simulations.
+        chunksize (int): Number of games sent to a worker at once.
+    """
+    config = dict(config)
+    seeds = ( None if seed is None else seed + i for i in range(games) )
+
+    if processes == 1:
+        with create_game(config) as game:
+            for game_seed in seeds:
+                yield play_game(game, game_seed)
+        return
+
+    with Pool(processes, initializer=_init_worker, initargs=(config,)) as pool:
+        for result in pool.imap(_play_in_worker, seeds, chunksize):
+            yield result
+
+
+def simulate(config, games, processes=None, seed=None, chunksize=64):
+    """Play a number of AI-vs-AI games and return a list of their results.
+
+    See `iter_simulate` for description of the arguments.
+    """
+    return list(iter_simulate(config, games, processes, seed, chunksize))
+
+
+def summarize(results):
+    """Return a dict with win counts per player char, number of draws and
+    average number of turns of the given simulation results."""
+    wins = Counter()
+    draws = 0
+    turns = 0
+    games = 0
+    for result in results:
+        games += 1
+        turns += result.turns
+        if result.draw:
+            draws += 1
+        else:
+            wins[result.winner] += 1
+    return {
+        'games': games,
+        'wins': dict(wins),
+        'draws': draws,
+        'average_turns': turns / games if games else 0,
+    }
+
+
+def main(args=None):
+    """Run a simulation from the command line and print its summary."""
+    parser = argparse.ArgumentParser(description='Simulate AI-vs-AI games.')
+    parser.add_argument('config', help='path to the json config file')
+    parser.add_argument('-n', '--games', type=int, default=1000)
+    parser.add_argument('-p', '--processes', type=int, default=None)
+    parser.add_argument('-s', '--seed', type=int, default=None)
+    args = parser.parse_args(args)
+
+    with open(args.config) as f:
+        config = json.load(f)
+    results = iter_simulate(config, args.games, args.processes, args.seed)
+    print(json.dumps(summarize(results), indent=4))
+
+
+if __name__ == '__main__':
+    main()
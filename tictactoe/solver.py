@@ -0,0 +1,273 @@
+import argparse
+import mmap
+import struct
+
+from .lines import flat_line_index
+from .symmetry import canonical, tables
+
+
+# Outcome stored for positions which end in a draw with perfect play.
+DRAW = 255
+
+WIN_CONDITIONS = ('standard', 'corners')
+
+BOOK_MAGIC = b'TTTB'
+BOOK_VERSION = 1
+# Magic, version, grid size, win length, win condition, number of players,
+# log2 of table capacity, number of positions.
+BOOK_HEADER = struct.Struct('<4sBBBBBBxxI')
+# Position key + 1 (0 marks an empty slot), outcome and best move.
+BOOK_SLOT = struct.Struct('<QBB')
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class Solver:
+    """Computes exact game-theoretic values of all positions reachable on a
+    small grid.
+
+    Positions are stored relative to the player to move: the player to move
+    is 1, the next player is 2 and so on, with 0 for free positions. Only one
+    of the positions equal under rotation and reflection is solved. The key of
+    a position is its canonical form read as a number in base players + 1.
+
+    Every player prefers own win, then a draw, then a win of another player.
+    Wins are preferred sooner and losses later.
+
+    Args:
+        size (int): Size of the grid.
+        win_length (int): Number of positions in a winning line.
+        win_condition (str): Either "standard" or "corners".
+        players (int): Number of players.
+    """
+    def __init__(self, size=3, win_length=3, win_condition='standard', players=2):
+        if (players + 1) ** (size ** 2) > _MASK64:
+            raise ValueError('Positions of {0}x{0} grid with {1} players don\'t '
+                             'fit into 64 bit keys.'.format(size, players))
+        self.size = size
+        self.win_length = win_length
+        self.win_condition = win_condition
+        self.players = players
+        lines, cell_lines = flat_line_index(size, win_length, win_condition)
+        self.cell_lines = [ [ lines[n] for n in numbers ] for numbers in cell_lines ]
+        self.table = {}
+
+    def key(self, cells):
+        """Return number representing a position."""
+        base = self.players + 1
+        key = 0
+        for value in reversed(cells):
+            key = key * base + value
+        return key
+
+    def solve(self, cells=None):
+        """Solve the position and all positions reachable from it and return
+        (outcome, plies, move) of the position.
+
+        Outcome is the offset of the winner from the player to move or DRAW.
+        Plies count moves to the end of the game and move is the best flat
+        position in the frame of the canonical form.
+
+        Args:
+            cells (tuple): Position relative to the player to move,
+                defaults to the empty grid.
+        """
+        if cells is None:
+            cells = (0,) * self.size ** 2
+        cells, _ = canonical(cells, self.size)
+        key = self.key(cells)
+        if key in self.table:
+            return self.table[key]
+
+        players = self.players
+        best = None
+        for i, value in enumerate(cells):
+            if value:
+                continue
+            after = cells[:i] + (1,) + cells[i + 1:]
+            if self.completes_line(after, i):
+                result = (0, 1)
+            elif 0 not in after:
+                result = (DRAW, 1)
+            else:
+                # Relabel so the next player is the one to move.
+                following = tuple( players if v == 1 else v - 1 if v else 0
+                                   for v in after )
+                outcome, plies, _ = self.solve(following)
+                if outcome != DRAW:
+                    outcome = (outcome + 1) % players
+                result = (outcome, plies + 1)
+            if best is None or self.better(result, best):
+                best = result
+                move = i
+
+        self.table[key] = (best[0], best[1], move)
+        return self.table[key]
+
+    def completes_line(self, cells, i):
+        """Return True if the player on position i completed a line."""
+        for line in self.cell_lines[i]:
+            if all(cells[j] == 1 for j in line):
+                return True
+        return False
+
+    def better(self, result, other):
+        """Return True if the player to move prefers result over other."""
+        def rank(result):
+            outcome, plies = result
+            if outcome == 0:
+                return (2, -plies)
+            if outcome == DRAW:
+                return (1, 0)
+            return (0, plies)
+        return rank(result) > rank(other)
+
+    def save(self, path):
+        """Solve all positions reachable from the empty grid and save them
+        to an opening book file at the given path."""
+        self.solve()
+        bits = max(4, (2 * len(self.table) - 1).bit_length())
+        capacity = 1 << bits
+        table = bytearray(BOOK_SLOT.size * capacity)
+        for key, (outcome, _, move) in self.table.items():
+            slot = _slot(key, bits)
+            while BOOK_SLOT.unpack_from(table, slot * BOOK_SLOT.size)[0]:
+                slot = (slot + 1) & (capacity - 1)
+            BOOK_SLOT.pack_into(table, slot * BOOK_SLOT.size, key + 1, outcome, move)
+
+        with open(path, 'wb') as f:
+            f.write(BOOK_HEADER.pack(
+                BOOK_MAGIC, BOOK_VERSION, self.size, self.win_length,
+                WIN_CONDITIONS.index(self.win_condition), self.players, bits,
+                len(self.table)))
+            f.write(table)
+
+
+def _slot(key, bits):
+    """Return slot of a key in a table with 2 ** bits slots."""
+    return ((key * _GOLDEN) & _MASK64) >> (64 - bits)
+
+
+class OpeningBook:
+    """Perfect moves read from an opening book file built by the Solver.
+
+    The file is a header followed by an open addressing hash table of
+    positions, so a lookup reads only a few slots of the memory-mapped file.
+    The file is opened lazily on the first lookup.
+
+    Args:
+        path (str): Path to the opening book file.
+        win_length (int): Win length of the game, if given the book is only
+            used when it was built for the same win length.
+        win_condition (str): Win condition of the game, checked the same way.
+    """
+    def __init__(self, path, win_length=None, win_condition=None):
+        self.path = path
+        self.rules = (win_length, win_condition)
+        self.file = None
+        self.map = None
+
+    def open(self):
+        """Map the file into memory and read its header."""
+        self.file = open(self.path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.win_length, condition, self.players, \
+            self.bits, self.positions = BOOK_HEADER.unpack_from(self.map)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            self.close()
+            raise ValueError('{} is not an opening book file.'.format(self.path))
+        self.win_condition = WIN_CONDITIONS[condition]
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.file.close()
+        self.map = None
+        self.file = None
+
+    def matches(self, win_length=None, win_condition=None):
+        """Return True if the book was built for the given rules."""
+        return win_length in (None, self.win_length) and \
+               win_condition in (None, self.win_condition)
+
+    def probe(self, cells):
+        """Return (outcome, move) of the position relative to the player to
+        move or None if the book doesn't know it.
+
+        The move is a flat position in the frame of the given position.
+
+        Args:
+            cells (tuple): Flat position relative to the player to move.
+        """
+        if self.map is None:
+            self.open()
+        cells, transform = canonical(cells, self.size)
+        base = self.players + 1
+        key = 0
+        for value in reversed(cells):
+            key = key * base + value
+
+        capacity = 1 << self.bits
+        slot = _slot(key, self.bits)
+        while True:
+            stored, outcome, move = BOOK_SLOT.unpack_from(
+                self.map, BOOK_HEADER.size + slot * BOOK_SLOT.size)
+            if not stored:
+                return
+            if stored == key + 1:
+                return outcome, tables(self.size).permutations[transform][move]
+            slot = (slot + 1) & (capacity - 1)
+
+    def decide(self, grid, char, turn_order=None):
+        """Return x, y of the perfect move for the player with given char or
+        None if the grid and players don't match the book.
+
+        Args:
+            grid (Grid): The grid instance on which the move has to take place.
+            char (str): Char of the deciding player.
+            turn_order (list): Chars of all players in order of their turns.
+        """
+        if self.map is None:
+            self.open()
+        chars = list(turn_order or [])
+        if not chars:
+            # Without known order of turns, assume the others follow in order
+            # of their appearance.
+            chars = [char] + sorted({ value for row in grid for value in row
+                                      if value and value != char })
+        if grid.size != self.size or len(chars) != self.players \
+           or char not in chars or not self.matches(*self.rules):
+            return
+        mover = chars.index(char)
+        cells = []
+        for row in grid:
+            for value in row:
+                if not value:
+                    cells.append(0)
+                elif value in chars:
+                    cells.append((chars.index(value) - mover) % self.players + 1)
+                else:
+                    return
+        found = self.probe(tuple(cells))
+        if found:
+            return divmod(found[1], self.size)
+
+
+def main(args=None):
+    """Build an opening book from the command line."""
+    parser = argparse.ArgumentParser(description='Build an opening book.')
+    parser.add_argument('path', help='path of the opening book file')
+    parser.add_argument('--size', type=int, default=3)
+    parser.add_argument('--win-length', type=int, default=3)
+    parser.add_argument('--win-condition', choices=WIN_CONDITIONS, default='standard')
+    parser.add_argument('--players', type=int, default=2)
+    args = parser.parse_args(args)
+
+    solver = Solver(args.size, args.win_length, args.win_condition, args.players)
+    solver.save(args.path)
+    print('Saved {} positions to {}.'.format(len(solver.table), args.path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+from random import choice, randrange
+
+from .grid import Grid
+from .lines import DIRECTIONS
+from .zobrist import zobrist_key
+
+
+# Largest number of rows and cols shown at once by `SparseGrid.show`.
+SHOW_WINDOW = 15
+
+
+class SparseRow:
+    """Read and write view of a single row of a SparseGrid.
+
+    Supports the same indexing as a row of the list based Grid, including
+    negative indices, so `grid[x][y]` keeps working for any grid engine.
+    """
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.x = x
+
+    def __getitem__(self, y):
+        return self.grid.cells.get((self.x, self.grid.index(y)), '')
+
+    def __setitem__(self, y, char):
+        self.grid.update_cells(self.x, y, char)
+
+    def __len__(self):
+        return self.grid.size
+
+    def __iter__(self):
+        cells = self.grid.cells
+        for y in range(self.grid.size):
+            yield cells.get((self.x, y), '')
+
+
+class SparseGrid(Grid):
+    """Grid engine which keeps only occupied positions in a dict.
+
+    Memory use and the cost of full and occupied checks, random free
+    positions, winner checks and AI candidates depend on the number of taken
+    positions instead of the area of the grid, which makes k-in-a-row games
+    on boards of hundreds of rows and cols possible. Only a window of the grid
+    around the last move is shown.
+
+    Attributes:
+        cells (dict): Player char of every taken x, y position.
+        last (tuple): x, y of the last updated position or None.
+    """
+    def create(self):
+        self.cells = {}
+        self.last = None
+        self.moves = []
+        self.zobrist = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.last = None
+        self.moves = []
+        self.zobrist = 0
+
+    @property
+    def data(self):
+        return [ list(SparseRow(self, x)) for x in range(self.size) ]
+
+    @data.setter
+    def data(self, rows):
+        self.create()
+        for x, row in enumerate(rows):
+            for y, char in enumerate(row):
+                if len(char) == 1:  # Skip empty and placeholder values
+                    self.update(x, y, char)
+
+    def __getitem__(self, x):
+        return SparseRow(self, self.index(x))
+
+    def __len__(self):
+        return self.size
+
+    def show(self):
+        self.renderer.show_grid(self, self.window())
+
+    def window(self):
+        """Return ranges of rows and cols to be shown.
+
+        The window covers all taken positions with a margin of one position
+        if they fit into SHOW_WINDOW rows and cols. Otherwise it's centered
+        on the last move.
+        """
+        if not self.cells:
+            return range(min(self.size, SHOW_WINDOW)), range(min(self.size, SHOW_WINDOW))
+        rows = [ x for x, y in self.cells ]
+        cols = [ y for x, y in self.cells ]
+        return (self.window_range(min(rows), max(rows), self.last[0]),
+                self.window_range(min(cols), max(cols), self.last[1]))
+
+    def window_range(self, low, high, center):
+        """Return range of shown positions of one axis."""
+        low = max(low - 1, 0)
+        high = min(high + 1, self.size - 1)
+        if high - low >= SHOW_WINDOW:
+            low = min(max(center - SHOW_WINDOW // 2, 0), self.size - SHOW_WINDOW)
+            high = low + SHOW_WINDOW - 1
+        return range(low, high + 1)
+
+    def update(self, row, col, char):
+        position = row * self.size + col
+        previous = self.cells.get((row, col))
+        if previous:
+            self.zobrist ^= self.zobrist_key(position, previous)
+        if len(char) == 1:
+            if previous:
+                self.moves = list(self.moves)
+            else:
+                self.moves.append(position)
+            self.cells[row, col] = char
+            self.zobrist ^= self.zobrist_key(position, char)
+        elif self.cells.pop((row, col), None):
+            self.moves = [ move for move in self.moves if move != position ]
+        self.last = (row, col)
+
+    def zobrist_key(self, position, char):
+        """Return Zobrist key of a char on a flat position, computed without
+        a table of keys, which would be too large for sparse grids."""
+        return zobrist_key(self.size, position, char)
+
+    def is_full(self):
+        return len(self.cells) == self.size ** 2
+
+    def occupied_count(self):
+        return len(self.cells)
+
+    def is_occupied(self, x, y):
+        return (x, y) in self.cells
+
+    def free_cells(self):
+        cells = self.cells
+        for x in range(self.size):
+            for y in range(self.size):
+                if (x, y) not in cells:
+                    yield x, y
+
+    def random_free_cell(self):
+        """Return x, y of a random free position.
+
+        Positions are drawn at random until a free one is found, which takes
+        a few tries unless the grid is almost full.
+        """
+        if len(self.cells) * 2 > self.size ** 2:
+            return choice(list(self.free_cells()))
+        while True:
+            position = randrange(self.size), randrange(self.size)
+            if position not in self.cells:
+                return position
+
+    def chars(self):
+        """Return set of chars on the grid."""
+        return set(self.cells.values())
+
+    def has_run(self, char, length):
+        """Return True if the char occupies `length` positions in a line.
+
+        Runs are only counted from their first position, so every taken
+        position of the char is visited at most once per direction.
+
+        Args:
+            char (str): Player char to be checked.
+            length (int): Number of positions in a winning line.
+        """
+        cells = self.cells
+        for (x, y), value in cells.items():
+            if value != char:
+                continue
+            for dx, dy in DIRECTIONS:
+                if cells.get((x - dx, y - dy)) == char:
+                    continue  # Not the first position of the run
+                run = 1
+                while run < length and cells.get((x + dx * run, y + dy * run)) == char:
+                    run += 1
+                if run == length:
+                    return True
+        return False
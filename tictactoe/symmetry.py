@@ -0,0 +1,91 @@
+from collections import namedtuple
+from functools import lru_cache
+from operator import itemgetter
+
+
+SymmetryTables = namedtuple('SymmetryTables', ['permutations', 'inverses', 'getters'])
+SymmetryTables.__doc__ = """Precomputed tables of the 8 symmetries of a square grid.
+
+Attributes:
+    permutations (tuple): For every transform, position i of the transformed
+        grid holds position `permutations[t][i]` of the original grid.
+    inverses (tuple): For every transform, position i of the original grid
+        moves to position `inverses[t][i]` of the transformed grid.
+    getters (tuple): For every transform, itemgetter which returns the
+        transformed tuple of a flat sequence of positions.
+"""
+
+
+@lru_cache(maxsize=None)
+def tables(size):
+    """Build the symmetry tables of a grid size once and return them.
+
+    Transforms are the identity, three rotations and four reflections, i.e.
+    the dihedral group of the square. Positions are flat, i.e. `x * size + y`.
+
+    Args:
+        size (int): Size of the grid.
+    """
+    last = size - 1
+    transforms = (
+        lambda x, y: (x, y),
+        lambda x, y: (y, last - x),
+        lambda x, y: (last - x, last - y),
+        lambda x, y: (last - y, x),
+        lambda x, y: (x, last - y),
+        lambda x, y: (last - x, y),
+        lambda x, y: (y, x),
+        lambda x, y: (last - y, last - x),
+    )
+    permutations = []
+    inverses = []
+    for transform in transforms:
+        perm = [ 0 ] * size ** 2
+        inverse = [ 0 ] * size ** 2
+        for x in range(size):
+            for y in range(size):
+                source_x, source_y = transform(x, y)
+                perm[x * size + y] = source_x * size + source_y
+                inverse[source_x * size + source_y] = x * size + y
+        permutations.append(tuple(perm))
+        inverses.append(tuple(inverse))
+    getters = tuple( itemgetter(*perm) for perm in permutations )
+    return SymmetryTables(tuple(permutations), tuple(inverses), getters)
+
+
+def canonical(cells, size):
+    """Return the canonical form of a flat position and its transform.
+
+    The canonical form is the smallest tuple among all 8 transforms of the
+    position, so positions equal under rotation and reflection share it.
+
+    Args:
+        cells (sequence): Flat sequence of positions of the grid.
+        size (int): Size of the grid.
+    """
+    best = None
+    for transform, getter in enumerate(tables(size).getters):
+        candidate = getter(cells)
+        if best is None or candidate < best:
+            best = candidate
+            best_transform = transform
+    return best, best_transform
+
+
+def canonicalize(grid):
+    """Return the canonical form of a grid and its transform.
+
+    Args:
+        grid (Grid): The grid instance to be canonicalized.
+    """
+    return canonical(grid.flat(), grid.size)
+
+
+def to_canonical(x, y, transform, size):
+    """Return x, y of a position of the original grid in the canonical grid."""
+    return divmod(tables(size).inverses[transform][x * size + y], size)
+
+
+def from_canonical(x, y, transform, size):
+    """Return x, y of a position of the canonical grid in the original grid."""
+    return divmod(tables(size).permutations[transform][x * size + y], size)
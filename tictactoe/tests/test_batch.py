@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from tictactoe import Grid
+from tictactoe.batch import BatchGrid, np, play_random
+from tictactoe.renderer import NullRenderer
+
+
+def random_boards(batch, size, players, seed):
+    rng = random.Random(seed)
+    return [ [ rng.randint(1, players) if rng.random() < 0.6 else 0
+               for _ in range(size ** 2) ] for _ in range(batch) ]
+
+
+class TestBatchGrid:
+    """Tests tictactoe.batch.BatchGrid with and without NumPy."""
+
+    @pytest.fixture(params=[False, True], ids=['python', 'numpy'])
+    def use_numpy(self, request):
+        if request.param and np is None:
+            pytest.skip('NumPy is not installed')
+        return request.param
+
+    def test_winners(self, use_numpy):
+        """Test winners of grids loaded into the batch."""
+        grids = BatchGrid(3, 4, players=2, use_numpy=use_numpy)
+        assert grids.numpy == use_numpy
+        rows = [
+            [['X','O','',''], ['','X','O',''], ['','','X',''], ['','','','']],
+            [['X','O','',''], ['','O','X',''], ['','O','',''], ['','','','']],
+            [['','','',''], ['','','X',''], ['','X','',''], ['','','','']],
+        ]
+        for i, data in enumerate(rows):
+            grid = Grid(4, NullRenderer())
+            grid.data = data
+            grids.load(i, grid, ['X', 'O'])
+        assert list(grids.winners()) == [1, 2, 0]
+        assert list(grids.winners([1])) == [1, 0, 0]
+        assert grids.cells(2)[6] == 1
+
+    def test_win_length(self, use_numpy):
+        """Test win lengths which don't fit on the grid are refused and long
+        lines are counted without overflows."""
+        for win_length in (1, 5):
+            with pytest.raises(ValueError):
+                BatchGrid(1, 4, win_length=win_length, use_numpy=use_numpy)
+        grids = BatchGrid(2, 130, win_length=130, use_numpy=use_numpy)
+        grids.play([129 * 130, 129 * 130 + 1], 1)
+        for y in range(1, 130):
+            grids.play([129 * 130 + y, -1], 1)
+        assert list(grids.winners()) == [1, 0]
+
+    def test_moves(self, use_numpy):
+        """Test legal moves, playing moves and full boards."""
+        grids = BatchGrid(2, 3, use_numpy=use_numpy, seed=1)
+        grids.play([4, -1], 1)
+        assert [ list(mask) for mask in grids.legal_moves() ] == \
+            [[True] * 4 + [False] + [True] * 4, [True] * 9]
+        for turn in range(9):
+            moves = grids.random_moves()
+            assert moves[0] != 4 or turn
+            grids.play(moves, [2, 1])
+        assert list(grids.full()) == [True, True]
+        assert list(grids.random_moves()) == [-1, -1]
+
+    @pytest.mark.parametrize('size, win_length, players, win_condition', [
+        (3, 3, 2, 'standard'), (5, 4, 3, 'corners'), (10, 5, 4, 'standard'),
+    ])
+    def test_same_winners_as_python(self, size, win_length, players, win_condition):
+        """Test NumPy and list boards find the same winners."""
+        if np is None:
+            pytest.skip('NumPy is not installed')
+        boards = random_boards(200, size, players, size)
+        python = BatchGrid(200, size, players, win_length, win_condition,
+                           use_numpy=False)
+        vectorized = BatchGrid(200, size, players, win_length, win_condition)
+        python.boards = boards
+        vectorized.boards = np.array(boards, np.int8).reshape(200, size, size)
+        assert list(vectorized.winners()) == python.winners()
+        assert list(vectorized.full()) == python.full()
+
+    def test_play_random(self, use_numpy):
+        """Test batched random games end with a winner or a full grid."""
+        results = play_random(50, 3, seed=0, use_numpy=use_numpy)
+        assert len(results) == 50
+        for winner, turns in results:
+            assert winner in (0, 1, 2)
+            assert 5 <= turns <= 9 and (winner or turns == 9)
+            if winner:
+                assert (turns - 1) % 2 + 1 == winner
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from tictactoe.benchmark import (STARTUP, compare, main, make_positions, run,
+                                 startup)
+
+
+class TestBenchmark:
+    """Tests tictactoe.benchmark functions."""
+
+    def test_positions_are_reproducible(self):
+        """Test generated positions depend only on the seed."""
+        assert make_positions(5, 3, 10, 1) == make_positions(5, 3, 10, 1)
+        assert make_positions(5, 3, 10, 1) != make_positions(5, 3, 10, 2)
+
+    def test_run(self):
+        """Test results of a small benchmark run can be saved as json."""
+        results = run(sizes=[3], player_counts=[2], positions=5, min_time=0.001)
+        names = { result['name'] for result in results['results'] }
+        assert 'grid.is_full' in names and 'player.ai_decide' in names
+        assert len(results['results']) == 2 * len(names)  # Both engines
+        for result in results['results']:
+            assert result['ops_per_sec'] > 0 and result['peak_bytes'] >= 0
+        assert json.loads(json.dumps(results)) == results
+
+    def test_run_without_positions(self):
+        """Test benchmarks without positions are refused instead of hanging."""
+        with pytest.raises(ValueError):
+            run(sizes=[3], player_counts=[2], positions=0)
+        with pytest.raises(SystemExit):
+            main(['-n', '0'])
+
+    def test_startup(self):
+        """Test startup benchmarks run in new interpreters."""
+        results = startup(runs=1)
+        assert set(results) == set(STARTUP) and all( ms > 0 for ms in results.values() )
+
+    def test_compare(self):
+        """Test slower results are reported as regressions."""
+        result = {'name': 'grid.flat', 'engine': 'list', 'size': 3, 'players': 2}
+        baseline = {'results': [ dict(result, ops_per_sec=1000) ]}
+        assert compare(baseline, {'results': [ dict(result, ops_per_sec=950) ]}) == []
+        slower = dict(result, ops_per_sec=800)
+        assert compare(baseline, {'results': [slower]}) == [(slower, 1000)]
@@ -0,0 +1,95 @@
+import pytest
+
+from tictactoe import BitGrid, Grid, SparseGrid
+from tictactoe.renderer import NullRenderer
+
+
+class TestBitGrid:
+    """Tests methods of tictactoe.bitgrid.BitGrid class."""
+
+    def test_bitgrid_init(self):
+        """Test BitGrid initialization."""
+        grid = BitGrid(10)
+        assert isinstance(grid, Grid)
+        assert grid.size == 10 and grid.occupied == 0
+        assert grid.data == Grid(10).data
+
+    def test_bitgrid_indexing(self):
+        """Tests grid[x][y] indexing works the same as for list based Grid."""
+        rows = [
+            ['X','','V'],
+            ['V','X',''],
+            ['','Y','V']
+        ]
+        grid = BitGrid(3)
+        grid.data = rows
+        for x in range(3):
+            for y in range(-3, 3):
+                assert grid[x][y] == rows[x][y]
+        with pytest.raises(IndexError):
+            grid[0][3]
+        grid[0][1] = 'Y'
+        assert grid[0][1] == 'Y' and grid.is_occupied(0, 1)
+
+    def test_bitgrid_full_and_free_cells(self):
+        """Tests BitGrid.is_full, is_occupied and free_cells methods."""
+        grid = BitGrid(3)
+        grid.data = [
+            ['(0,1)','Y','V'],
+            ['V','X','Y'],
+            ['X','Y','']
+        ]
+        assert not grid.is_full()
+        assert not grid.is_occupied(0, 0)
+        assert list(grid.free_cells()) == [(0, 0), (2, 2)]
+        grid.update(0, 0, 'X')
+        grid.update(2, 2, 'V')
+        assert grid.is_full() and list(grid.free_cells()) == []
+
+    def test_bitgrid_free_position(self):
+        """Tests taking and clearing a position the same way as other engines."""
+        grids = [ engine(3, NullRenderer()) for engine in (Grid, BitGrid, SparseGrid) ]
+        for grid in grids:
+            grid.update(0, 0, 'X')
+            grid.update(1, 1, 'O')
+            grid.update(1, 1, '')
+            assert not grid.is_occupied(1, 1) and grid[1][1] == ''
+        bitgrid = grids[1]
+        assert bitgrid.masks['O'] == 0 and bitgrid.chars() == {'X'}
+        for grid in grids:
+            assert grid.occupied_count() == 1 and grid.moves == [0]
+            assert grid.zobrist == grids[0].zobrist
+            assert list(grid.free_cells()) == list(grids[0].free_cells())
+
+    def test_bitgrid_has_run(self):
+        """Tests BitGrid.has_run doesn't wrap lines around the edges."""
+        grid = BitGrid(4)
+        # Horizontal line wrapping from one row to the next one.
+        grid.update(0, 3, 'X')
+        grid.update(1, 0, 'X')
+        grid.update(1, 1, 'X')
+        assert not grid.has_run('X', 3)
+        grid.update(1, 2, 'X')
+        assert grid.has_run('X', 3)
+
+        grid = BitGrid(4)
+        for x, y in ((1, 3), (2, 2), (3, 1)):
+            grid.update(x, y, 'O')
+        assert grid.has_run('O', 3) and not grid.has_run('O', 4)
+
+    def test_bitgrid_display(self, capsys):
+        """Test output of BitGrid.show is the same as for list based Grid."""
+        rows = [
+            ['X','Y','V'],
+            ['V','','Y'],
+            ['X','Y','X']
+        ]
+        grid = Grid(3)
+        grid.data = rows
+        bitgrid = BitGrid(3)
+        bitgrid.data = rows
+        capsys.readouterr()
+        grid.show()
+        expected = capsys.readouterr().out
+        bitgrid.show()
+        assert capsys.readouterr().out == expected
@@ -0,0 +1,100 @@
+import multiprocessing
+
+import pytest
+
+from tictactoe import Grid, Move, Player
+from tictactoe.cache import (TABLE_SLOT, DecisionCache, SharedDecisionTable,
+                             decision_key)
+from tictactoe.renderer import NullRenderer
+
+
+def _put_in_table(path, key, value):
+    SharedDecisionTable(path).put(key, value)
+
+
+class TestDecisionCache:
+    """Tests tictactoe.cache module."""
+
+    def test_lru_eviction(self):
+        """Test the least recently used decision is evicted first."""
+        cache = DecisionCache(max_entries=2)
+        cache.put(1, 10)
+        cache.put(2, -1)
+        assert cache.get(1) == 10 and cache.get(2) == -1
+        assert cache.get(1) == 10
+        cache.put(3, 30)
+        assert cache.get(2) is None and cache.get(3) == 30 and cache.get(1) == 10
+        assert cache.stats() == {'entries': 2, 'hits': 5, 'misses': 1,
+                                 'evictions': 1, 'shared_hits': 0}
+
+    def test_decision_key(self):
+        """Test keys depend on the position, size and parameters."""
+        grid = Grid(3, NullRenderer())
+        empty = decision_key(grid, 'X')
+        assert empty != decision_key(Grid(4, NullRenderer()), 'X')
+        assert empty != decision_key(grid, 'O')
+        grid.update(1, 1, 'X')
+        assert decision_key(grid, 'X') not in (empty, grid.zobrist)
+
+    def test_shared_table(self, tmp_path):
+        """Test decisions are shared through the table file."""
+        path = str(tmp_path / 'decisions')
+        table = SharedDecisionTable(path, bits=4)
+        process = multiprocessing.Process(target=_put_in_table, args=(path, 2 ** 64 - 1, -1))
+        process.start()
+        process.join()
+        assert table.get(2 ** 64 - 1) == -1 and table.get(5) is None
+        table.put(6, 0)
+        assert table.get(6) == 0
+
+        cache = DecisionCache(10, SharedDecisionTable(path))
+        assert cache.shared.bits == 4
+        # Decisions are kept unchanged in the table.
+        assert cache.get(2 ** 64 - 1) == -1 and cache.shared_hits == 1
+        cache.put(7, 3)
+        assert table.get(7) == 3
+
+        # Keys with the same home slot are probed in the following slots.
+        for key in range(100):
+            table.put(key, key * 2)
+        assert sum( table.get(key) == key * 2 for key in range(100) ) >= 16
+        assert table.get(99) == 198
+
+        # Torn entries fail the key check.
+        offset = next(table.slots(99))
+        check, value = TABLE_SLOT.unpack_from(table.map, offset)
+        TABLE_SLOT.pack_into(table.map, offset, check, value + 1)
+        assert table.get(99) is None
+        table.close()
+
+        (tmp_path / 'other').write_bytes(b'not a table')
+        with pytest.raises(ValueError):
+            SharedDecisionTable(str(tmp_path / 'other'))
+
+    def test_player_cache(self):
+        """Test players reuse cached decisions of the same position."""
+        player = Player({'char': 'X', 'ai': True, 'cache': 10}, None, NullRenderer())
+        player.turn_order = ['X', 'O']
+        grid = Grid(3, NullRenderer())
+        grid.update(0, 0, 'O')
+        grid.update(0, 1, 'O')
+        assert player.ai_move(grid) == Move(0, 2)
+        assert player.ai_move(grid) == Move(0, 2)
+        assert player.cache.stats()['hits'] == 1
+
+        # A cached move on a taken position is decided again.
+        key = decision_key(grid, 'X', ('X', 'O'), player.cache_params)
+        player.cache.put(key, 0)
+        assert player.ai_move(grid) == Move(0, 2)
+
+        # Only settings of the AI are part of the keys.
+        other = Player({'char': 'X', 'ai': True, 'cache': 10, 'tags': ['a']},
+                       None, NullRenderer())
+        assert other.cache_params == player.cache_params
+        other.turn_order = ['X', 'O']
+        assert other.ai_move(grid) == Move(0, 2)
+        assert Player({'char': 'X', 'ai': True, 'cache': 10, 'time_limit': 2},
+                      None, NullRenderer()).cache_params != player.cache_params
+
+        assert Player({'char': 'X', 'ai': True}, None, NullRenderer()).cache is None
+        assert Player({'char': 'X', 'cache': 10}, None, NullRenderer()).cache is None
@@ -11,6 +11,15 @@ class TestConfig:
         config = GameConfig('config_example.json')
         assert config.is_valid()
 
+    def test_config_path(self, tmp_path, monkeypatch, capsys):
+        """Tests config is looked up in current directory before project root."""
+        monkeypatch.chdir(tmp_path)
+        assert GameConfig('config_example.json')['grid']['size'] == 3
+        (tmp_path / 'config_example.json').write_text(
+            '{"grid": {"size": 5, "win_condition": "standard"}, "players": {}}')
+        assert GameConfig('config_example.json', verbose=True)['grid']['size'] == 5
+        assert capsys.readouterr().out == 'Loading config from file ...\n'
+
     def test_config_with_error(self, capsys):
         """Tests configs with syntax errors and empty configs"""
         GameConfig('tictactoe/tests/configs/config_with_error.json')
@@ -38,6 +47,13 @@ class TestConfig:
         captured = capsys.readouterr()
         assert "Grid size must be between 3 and 10." in captured.out
 
+        # The sparse grid engine supports larger grids.
+        assert config.validate_grid_size({'grid': {'size': 1000, 'engine': 'sparse'}}) == 1000
+        with pytest.raises(SystemExit):
+            config.validate_grid_size({'grid': {'size': 1001, 'engine': 'sparse'}})
+        captured = capsys.readouterr()
+        assert "Grid size must be between 3 and 1000." in captured.out
+
     def test_config_with_invalid_char(self, capsys):
         """Tests for invalid or empty player character."""
         config = GameConfig('tictactoe/tests/configs/config_with_invalid_char.json')
@@ -64,3 +80,48 @@ class TestConfig:
             config.validate_ai_settings(players)
         captured = capsys.readouterr()
         assert "If present, player AI setting needs to be either true or false." in captured.out
+
+    def test_config_with_ai_strategy(self):
+        """Tests config with search based AI strategies and time limits."""
+        config = GameConfig('tictactoe/tests/configs/config_with_alphabeta.json')
+        assert config.is_valid()
+
+        players = [ {'char': 'X', 'ai': 'alphabeta', 'time_limit': 0} ]
+        with pytest.raises(SystemExit):
+            config.validate_ai_settings(players)
+
+        players = [ {'char': 'X', 'ai': True, 'cache': 100, 'cache_file': 'decisions'} ]
+        assert config.validate_ai_settings(players) == [True]
+        for setting in ({'cache': 0}, {'cache_file': 1}):
+            with pytest.raises(SystemExit):
+                config.validate_ai_settings([ dict(players[0], **setting) ])
+
+    def test_config_with_ai_strategy_on_large_grid(self, capsys):
+        """Tests AI strategies are rejected on sparse and large grids."""
+        config = GameConfig('tictactoe/tests/configs/config_with_alphabeta.json')
+        for strategy in ('alphabeta', 'mcts'):
+            players = [ {'char': 'X', 'ai': strategy} ]
+            assert config.validate_ai_settings(players, {'size': 10}) == [strategy]
+            for grid in ({'size': 10, 'engine': 'sparse'}, {'size': 1000}):
+                with pytest.raises(SystemExit):
+                    config.validate_ai_settings(players, grid)
+                assert 'can\'t play on the sparse grid engine' in capsys.readouterr().out
+        # Simple AI plays on any grid.
+        players = [ {'char': 'X', 'ai': True} ]
+        assert config.validate_ai_settings(players, {'size': 1000, 'engine': 'sparse'}) == [True]
+
+        config['grid'] = {'size': 1000, 'engine': 'sparse', 'win_condition': 'standard'}
+        with pytest.raises(SystemExit):
+            config.is_valid()
+
+    def test_config_with_win_length(self, capsys):
+        """Tests for valid and invalid win length settings."""
+        config = GameConfig('tictactoe/tests/configs/config_with_win_length.json')
+        assert config.is_valid()
+        assert config.validate_win_length(config) == 5
+
+        config['grid']['win_length'] = 11
+        with pytest.raises(SystemExit):
+            config.validate_win_length(config)
+        captured = capsys.readouterr()
+        assert 'Setting "win_length" must be between 3 and the grid size.' in captured.out
@@ -1,6 +1,10 @@
+import subprocess
+import sys
+
 import pytest
 
-from tictactoe import Game, GameConfig, Grid, Referee
+from tictactoe import BitGrid, Game, GameConfig, GameResult, Grid, Referee
+from tictactoe.game import HOOK_EVENTS
 
 
 class TestGame:
@@ -20,15 +24,95 @@ class TestGame:
 
         game.init_referee()
 
+    def test_lazy_import(self):
+        """Tests importing the package doesn't load the game modules."""
+        code = ('import sys, tictactoe; print("tictactoe.game" in sys.modules); '
+                'tictactoe.Game; print("tictactoe.game" in sys.modules)')
+        output = subprocess.run([sys.executable, '-c', code], check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+        assert output.split() == ['False', 'True']
+
     def test_game_run_with_ai(self, capsys):
         """Tests game run with 3 AI players and no human players."""
         config = GameConfig('tictactoe/tests/configs/config_with_3_ai.json')
         game = Game(config)
 
 
-        with pytest.raises(SystemExit):     
-            game.run()
+        result = game.run()
         captured = capsys.readouterr()
 
         # Assert game finished successfully and correct message is displayed.
         assert "Game finished" in captured.out and str(game.completed_turns) in captured.out
+        # Assert result of the game was returned.
+        assert isinstance(result, GameResult)
+        assert result.turns == game.completed_turns == len(result.moves)
+        assert result.draw == (result.winner is None)
+
+    def test_game_run_with_bitboard_grid(self, capsys):
+        """Tests game run with 3 AI players on a bitboard grid."""
+        config = GameConfig('tictactoe/tests/configs/config_with_bitboard.json')
+        assert config.is_valid()
+        game = Game(config)
+        assert isinstance(game.grid, BitGrid)
+
+        game.run()
+        captured = capsys.readouterr()
+        assert "Game finished" in captured.out
+
+    def test_game_run_with_alphabeta(self, capsys):
+        """Tests game run with search based AI players."""
+        config = GameConfig('tictactoe/tests/configs/config_with_alphabeta.json')
+        game = Game(config)
+
+        game.run()
+        captured = capsys.readouterr()
+        assert "Game finished" in captured.out
+        # All players know the order of turns.
+        assert game.players[0].turn_order == [ p.char for p in game.players ]
+
+    def test_game_reset(self):
+        """Tests running many games on one Game instance."""
+        config = GameConfig('tictactoe/tests/configs/config_with_3_ai.json')
+        game = Game(config)
+        grid, players, referee = game.grid, list(game.players), game.referee
+        rows = grid.data
+
+        for _ in range(3):
+            game.reset()
+            assert game.completed_turns == 0 and grid.flat() == [''] * 100
+            result = game.run()
+            assert result.turns == len(result.moves) > 0
+
+        # Assert grid, players and referee were reused.
+        assert game.grid is grid and game.grid.data is rows
+        assert game.referee is referee and set(game.players) == set(players)
+
+    def test_game_hooks(self, capsys):
+        """Tests hooks are called on events of every turn in order."""
+        config = GameConfig('tictactoe/tests/configs/config_with_3_ai.json')
+        game = Game(config)
+        events = []
+
+        def hook(hooked, event, player, now):
+            assert hooked is game
+            events.append((event, player.char, now))
+
+        for event in HOOK_EVENTS:
+            game.add_hook(event, hook)
+        with pytest.raises(ValueError):
+            game.add_hook('after_lunch', hook)
+        result = game.run()
+
+        assert [ event for event, _, _ in events[:6] ] == list(HOOK_EVENTS)
+        assert len(events) == 6 * result.turns
+        assert [ char for event, char, _ in events if event == 'after_win_check' ] == \
+               [ char for char, x, y in result.moves ]
+        times = [ now for _, _, now in events ]
+        assert times == sorted(times)
+
+        for event in HOOK_EVENTS:
+            game.remove_hook(event, hook)
+        assert game.hooks == {}
+        game.reset()
+        game.run()
+        assert len(events) == 6 * result.turns
@@ -1,6 +1,7 @@
 import pytest
 
-from tictactoe import Grid
+from tictactoe import BitGrid, Grid, SparseGrid
+from tictactoe.renderer import NullRenderer
 
 class TestGrid:
     """Tests methods of tictactoe.grid.Grid class."""
@@ -69,3 +70,82 @@ class TestGrid:
         assert 'x' in grid[1][1]
         grid.update(2,0,'y')
         assert 'y' in grid[2][0]
+
+    def test_grid_free_positions(self):
+        """Test free positions are kept up to date by Grid.update."""
+        grid = Grid(3)
+        assert grid.occupied_count() == 0 and len(grid.free) == 9
+        for x, y in [(1, 1), (0, 0), (2, 2), (0, 2), (2, 0)]:
+            grid.update(x, y, 'X')
+        grid.update(1, 1, 'Y')  # Replacing a char keeps the position taken
+        assert grid.occupied_count() == 5
+        assert sorted(grid.free) == [1, 3, 5, 7]
+        assert all(grid.slots[position] == i for i, position in enumerate(grid.free))
+        assert grid.random_free_cell() in [(0, 1), (1, 0), (1, 2), (2, 1)]
+
+        grid.update(0, 0, '')
+        assert grid.occupied_count() == 4 and not grid.is_occupied(0, 0)
+        for x, y in list(grid.free_cells()):
+            grid.update(x, y, 'Y')
+        assert grid.is_full() and grid.free == []
+
+        grid.clear()
+        assert grid.occupied_count() == 0 and not grid.is_full()
+
+    def test_grid_direct_writes(self):
+        """Test grid[x][y] writes keep free positions up to date."""
+        grid = Grid(3)
+        for x in range(3):
+            for y in range(3):
+                grid[x][y] = 'X' if (x + y) % 2 else 'O'
+        assert grid.is_full() and grid.occupied_count() == 9 and grid.free == []
+        assert len(grid.moves) == 9
+        grid[1][-1] = ''
+        assert grid.free == [5] and grid.random_free_cell() == (1, 2)
+        with pytest.raises(IndexError):
+            grid[0][3] = 'X'
+
+        # Placeholder values free a taken position.
+        grid.update(0, 0, '(0,0)')
+        assert not grid.is_occupied(0, 0) and sorted(grid.free) == [0, 5]
+        assert (0, 0) in grid.free_cells() and 0 not in grid.moves
+
+    @pytest.mark.parametrize('engine', [Grid, BitGrid, SparseGrid])
+    def test_grid_row_writes(self, engine):
+        """Test grid[x] and grid[x][a:b] writes go through update."""
+        grid = engine(3, NullRenderer())
+        expected = Grid(3, NullRenderer())
+        grid[1] = ['X', 'X', 'X']
+        grid[-1][1:] = ['O', 'O']
+        grid[0][::2] = ('V', 'V')
+        for x, y, char in ((1, 0, 'X'), (1, 1, 'X'), (1, 2, 'X'), (2, 1, 'O'),
+                           (2, 2, 'O'), (0, 0, 'V'), (0, 2, 'V')):
+            expected.update(x, y, char)
+        assert [ list(row) for row in grid ] == expected.data
+        assert sorted(grid.moves) == sorted(expected.moves)
+        assert grid.zobrist == expected.zobrist
+        assert sorted(grid.free_cells()) == [(0, 1), (2, 0)]
+        if engine is not SparseGrid:
+            assert sorted(grid.free) == [1, 6]
+
+        grid[1] = ['', 'X', '']
+        assert sorted(grid.free_cells()) == [(0, 1), (1, 0), (1, 2), (2, 0)]
+        with pytest.raises(ValueError):
+            grid[0] = ['X']
+        with pytest.raises(ValueError):
+            grid[0][1:] = ['X']
+        with pytest.raises(TypeError):
+            grid[0:2] = [['X'] * 3] * 2
+        with pytest.raises(IndexError):
+            grid[3] = ['X'] * 3
+
+    def test_bitgrid_free_list(self):
+        """Test BitGrid keeps the free list for random free positions."""
+        grid = BitGrid(3)
+        for position in range(8):
+            grid.update(*divmod(position, 3), 'X')
+        assert grid.free == [8] and grid.random_free_cell() == (2, 2)
+        grid.update(0, 1, '')
+        assert sorted(grid.free) == [1, 8]
+        grid.clear()
+        assert len(grid.free) == 9
@@ -0,0 +1,31 @@
+import pytest
+
+from tictactoe.lines import line_index
+
+
+class TestLineIndex:
+    """Tests tictactoe.lines.line_index function."""
+
+    def test_lines_of_standard_grid(self):
+        """Test lines of a 3x3 grid with three in a row."""
+        index = line_index(3)
+        assert len(index.lines) == 8
+        # Center is on both diagonals, middle row and middle col.
+        assert len(index.cell_lines[1][1]) == 4
+        assert len(index.cell_lines[0][1]) == 2
+        for x in range(3):
+            for y in range(3):
+                for n in index.cell_lines[x][y]:
+                    assert (x, y) in index.lines[n]
+
+    def test_lines_of_corners_grid(self):
+        """Test corners form one more line with corners win condition."""
+        index = line_index(4, 3, 'corners')
+        assert ((0, 0), (0, 3), (3, 0), (3, 3)) in index.lines
+        assert len(index.lines) == len(line_index(4).lines) + 1
+
+    def test_line_index_is_cached(self):
+        """Test the index is built only once per grid setup."""
+        assert line_index(10, 3, 'standard') is line_index(10, 3, 'standard')
+        # 8 horizontal and 8 vertical per row and col, 64 per diagonal direction.
+        assert len(line_index(10).lines) == 2 * 80 + 2 * 64
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from tictactoe.loadtest import compare, histogram, percentile, run
+
+
+class TestLoadTest:
+    """Tests tictactoe.loadtest functions."""
+
+    def test_percentile_and_histogram(self):
+        """Test latency statistics."""
+        values = [ float(n) for n in range(1, 101) ]
+        assert percentile(values, 50) == 50 and percentile(values, 99) == 99
+        assert percentile([], 50) == 0.0
+        counts = dict(histogram([0.05, 0.5, 3, 3, 2000]))
+        assert counts[0.1] == 1 and counts[0.5] == 1 and counts[5] == 2
+        assert counts[None] == 1
+
+    def test_run(self):
+        """Test a small load test against a local server."""
+        with open('config_example.json') as f:
+            config = json.load(f)
+        report = run(config, clients=3, games=2, interval=0.05)
+        assert report['games'] == 6 and report['games_per_sec'] > 0
+        assert report['latency_ms']['p50'] <= report['latency_ms']['max']
+        assert sum( count for _, count in report['histogram_ms'] ) > 0
+        assert report['memory'] and json.loads(json.dumps(report))
+
+    def test_compare(self):
+        """Test slower throughput and latency are reported as regressions."""
+        baseline = {'games_per_sec': 100, 'latency_ms': {'p50': 10, 'p99': 20}}
+        assert compare(baseline, baseline) == []
+        current = {'games_per_sec': 80, 'latency_ms': {'p50': 10, 'p99': 30}}
+        assert compare(baseline, current) == [
+            ('games_per_sec', 100, 80), ('latency_ms.p99', 20, 30)]
@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from tictactoe import Game, Grid, Player
+from tictactoe.mcts import MCTS
+from tictactoe.renderer import NullRenderer
+from tictactoe.simulation import simulate
+
+
+@pytest.fixture()
+def grid():
+    yield Grid(3, NullRenderer())
+
+
+def mcts_config(**settings):
+    """Return config of a game of two MCTS players."""
+    players = {}
+    for name, char in (('Player 1', 'X'), ('Player 2', 'O')):
+        players[name] = dict(char=char, ai='mcts', iterations=50, **settings)
+    return {'grid': {'size': 3, 'win_condition': 'standard'}, 'players': players}
+
+
+class TestMCTS:
+    """Tests tictactoe.mcts.MCTS strategy."""
+
+    def test_takes_winning_move(self, grid):
+        """Test the search completes own line."""
+        grid.data = [
+            ['X','X',''],
+            ['O','O',''],
+            ['','','']
+        ]
+        assert MCTS(iterations=2000, seed=1).decide(grid, 'O', ['X', 'O']) == (1, 2)
+
+    def test_blocks_opponent(self, grid):
+        """Test the search blocks the opponent from winning."""
+        grid.data = [
+            ['X','X',''],
+            ['','O',''],
+            ['','','']
+        ]
+        assert MCTS(iterations=2000, seed=1).decide(grid, 'O', ['X', 'O']) == (0, 2)
+
+    def test_tree_reuse(self, grid):
+        """Test the subtree of played moves is kept between searches."""
+        strategy = MCTS(iterations=500, seed=2)
+        x, y = strategy.decide(grid, 'X', ['X', 'O'])
+        grid.update(x, y, 'X')
+        kept = strategy.root
+        assert kept.visits > 0
+
+        # Opponent plays the move the tree knows best.
+        reply = max(kept.children, key=lambda child: child.visits)
+        grid.update(*divmod(reply.move, 3), 'O')
+        assert strategy.reuse_tree(
+            [ ['X', 'O'].index(v) if v else -1 for v in grid.flat() ],
+            ['X', 'O']) is reply
+
+        # Reset grid doesn't match the kept tree.
+        grid.clear()
+        assert strategy.reuse_tree([-1] * 9, ['X', 'O']) is None
+
+    def test_time_limit_with_three_players(self):
+        """Test move on a large grid with three players is made in time."""
+        grid = Grid(10, NullRenderer())
+        grid.update(4, 4, 'O')
+        grid.update(4, 5, 'V')
+        start = time.perf_counter()
+        x, y = MCTS(time_limit=0.2, seed=3).decide(grid, 'X', ['O', 'V', 'X'])
+        assert time.perf_counter() - start < 0.5
+        assert not grid.is_occupied(x, y)
+
+    def test_root_parallel_search(self, grid):
+        """Test search with worker processes still finds the winning move."""
+        grid.data = [
+            ['X','X',''],
+            ['O','O',''],
+            ['','','']
+        ]
+        strategy = MCTS(iterations=500, workers=2, seed=4)
+        try:
+            assert strategy.decide(grid, 'O', ['X', 'O']) == (1, 2)
+        finally:
+            strategy.close()
+
+    def test_game_closes_workers(self):
+        """Test the game as context manager stops workers of its players."""
+        config = mcts_config(workers=2)
+        with Game(config, NullRenderer()) as game:
+            game.run()
+            strategies = [ player.strategy for player in game.players ]
+            assert any( strategy.pool for strategy in strategies )
+        assert all( strategy.pool is None for strategy in strategies )
+
+    def test_simulate_is_reproducible(self):
+        """Test seeded simulations with MCTS players give same results."""
+        config = mcts_config()
+        assert simulate(config, 3, processes=1, seed=5) == \
+               simulate(config, 3, processes=1, seed=5)
+
+    def test_workers_in_simulation_processes(self):
+        """Test search in daemonic simulation workers doesn't start workers."""
+        config = mcts_config(workers=2)
+        results = simulate(config, 2, processes=2, seed=5, chunksize=1)
+        assert len(results) == 2
+        assert results == simulate(config, 2, processes=2, seed=5)
+
+    def test_player_with_mcts_strategy(self, grid):
+        """Test Player uses MCTS named by the ai setting."""
+        player = Player({'char': 'O', 'ai': 'mcts', 'iterations': 1000},
+                        renderer=NullRenderer())
+        assert isinstance(player.strategy, MCTS)
+        player.turn_order = ['X', 'O']
+        grid.data = [
+            ['X','X',''],
+            ['O','O',''],
+            ['','','']
+        ]
+        assert player.ai_move(grid) == (1, 2)
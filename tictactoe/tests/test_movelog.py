@@ -0,0 +1,62 @@
+import io
+
+import pytest
+
+from tictactoe import Game, GameConfig
+from tictactoe.movelog import MoveLogReader, MoveLogWriter, config_hash, read_games
+from tictactoe.renderer import NullRenderer
+
+
+class TestMoveLog:
+    """Tests tictactoe.movelog writer and reader."""
+
+    def write_game(self, writer, size, chars, moves):
+        writer.begin(b'12345678', size, chars)
+        for x, y in moves:
+            writer.write_move(x, y)
+        writer.end()
+
+    def test_round_trip(self):
+        """Test games of one and two byte moves are read back in order."""
+        stream = io.BytesIO()
+        writer = MoveLogWriter(stream)
+        self.write_game(writer, 3, ['X', 'O'], [(1, 1), (0, 2), (2, 0)])
+        # 0xffff moves would look like markers if they weren't aligned.
+        self.write_game(writer, 20, ['X', 'Ø', '@'], [(12, 15), (19, 19), (0, 0)])
+        self.write_game(writer, 3, ['X', 'O'], [])
+        assert writer.games == 3
+        # Headers, chars and moves with end markers of one and two bytes.
+        assert len(stream.getvalue()) == 3 * 17 + (2 + 3 + 1) + (4 + 6 + 2) + (2 + 1)
+
+        stream.seek(0)
+        games = list(MoveLogReader(stream, chunk_size=5))
+        assert [ game.size for game in games ] == [3, 20, 3]
+        assert games[0].config_hash == b'12345678'
+        assert games[0].moves == [('X', 1, 1), ('O', 0, 2), ('X', 2, 0)]
+        assert games[1].chars == 'XØ@'
+        assert games[1].moves == [('X', 12, 15), ('Ø', 19, 19), ('@', 0, 0)]
+        assert games[2].moves == []
+
+    def test_truncated_log(self):
+        """Test a game cut off in the middle raises ValueError."""
+        stream = io.BytesIO()
+        writer = MoveLogWriter(stream)
+        writer.begin(b'12345678', 3, ['X', 'O'])
+        writer.write_move(1, 1)
+        stream.seek(0)
+        with pytest.raises(ValueError):
+            list(MoveLogReader(stream))
+
+    def test_game_writes_move_log(self, tmp_path):
+        """Test every game run appends its moves to the log."""
+        config = GameConfig('tictactoe/tests/configs/config_with_3_ai.json')
+        path = tmp_path / 'games.log'
+        with open(path, 'ab') as f:
+            game = Game(config, NullRenderer(), MoveLogWriter(f))
+            results = [game.run()]
+            game.reset()
+            results.append(game.run())
+
+        games = list(read_games(path))
+        assert [ game.moves for game in games ] == [ r.moves for r in results ]
+        assert games[0].config_hash == config_hash(config)
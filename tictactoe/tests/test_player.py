@@ -1,7 +1,8 @@
 import pytest
 import re
 
-from tictactoe import Grid, Player
+from tictactoe import Grid, Move, Player
+from tictactoe.renderer import NullRenderer
 
 
 class TestPlayer:
@@ -32,11 +33,47 @@ class TestPlayer:
         player = Player(config)
         grid = Grid(3)
         i = player.ai_move(grid)
-        # Assert AI input is in correct format.
-        assert re.match(r'^\d\,\d$', i)
+        # Assert AI hands over a Move which prints in the input format.
+        assert isinstance(i, Move) and re.match(r'^\d\,\d$', str(i))
         # Assert AI input is within the grid.
-        i = i.split(',')
-        x = int(i[0])
-        y = int(i[1])
+        x, y = i
         assert 0 <= x <= grid.size
         assert 0 <= y <= grid.size
+
+    def test_ai_decide(self):
+        """Test Player.ai_decide takes chance to complete or block a line."""
+        player = Player({'char': '@', 'ai': True})
+        grid = Grid(4)
+        assert player.ai_decide(grid) is None
+
+        grid.update(1, 0, 'X')
+        grid.update(3, 2, 'X')
+        assert player.ai_decide(grid) == Move(2, 1)
+
+        player = Player({'char': '@', 'ai': True}, {'win_condition': 'corners'})
+        grid = Grid(4)
+        for x, y in ((0, 0), (0, 3), (3, 0)):
+            grid.update(x, y, '@')
+        assert player.ai_decide(grid) == Move(3, 3)
+
+    def test_ai_decide_ranks_threats(self):
+        """Test Player.ai_decide wins before it blocks the next opponent."""
+        player = Player({'char': '@', 'ai': True}, renderer=NullRenderer())
+        player.turn_order = ['@', 'X', 'O']
+        grid = Grid(4, NullRenderer())
+        for x, y, char in ((0, 0, 'O'), (0, 1, 'O'), (1, 0, 'X'), (1, 1, 'X')):
+            grid.update(x, y, char)
+        assert player.ai_decide(grid) == Move(1, 2)
+        grid.update(3, 1, '@')
+        grid.update(3, 2, '@')
+        assert player.ai_decide(grid) == Move(3, 0)
+
+    def test_ai_decide_with_win_length(self):
+        """Test Player.ai_decide looks for lines of configured win length."""
+        player = Player({'char': '@', 'ai': True}, {'win_length': 4})
+        grid = Grid(6)
+        for y in (1, 2):
+            grid.update(3, y, 'X')
+        assert player.ai_decide(grid) is None
+        grid.update(3, 4, 'X')
+        assert player.ai_decide(grid) == Move(3, 3)
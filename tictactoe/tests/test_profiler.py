@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from tictactoe import Game, GameConfig
+from tictactoe.game import HOOK_EVENTS
+from tictactoe.profiler import HISTOGRAM_BOUNDS, PhaseStats, Profiler, main
+from tictactoe.renderer import NullRenderer
+
+
+class TestProfiler:
+    """Tests tictactoe.profiler module."""
+
+    def test_phase_stats(self):
+        """Test latencies are counted in histogram buckets."""
+        stats = PhaseStats()
+        for seconds in (0.000005, 0.0015, 0.002, 10):
+            stats.add(seconds)
+        report = stats.report()
+        assert report['count'] == 4 and report['max_ms'] == 10000
+        histogram = dict(report['histogram_ms'])
+        assert histogram[0.01] == 1 and histogram[2] == 2 and histogram[None] == 1
+        assert len(report['histogram_ms']) == len(HISTOGRAM_BOUNDS) + 1
+
+    def test_profiler(self, tmp_path):
+        """Test phases of every turn are collected per player."""
+        config = GameConfig('tictactoe/tests/configs/config_with_3_ai.json')
+        game = Game(config, NullRenderer())
+        profiler = Profiler()
+        profiler.attach(game)
+        turns = 0
+        for _ in range(3):
+            game.reset()
+            turns += game.run().turns
+        profiler.detach()
+        assert game.hooks == {}
+
+        report = profiler.report()
+        assert set(report) == { player.char for player in game.players }
+        assert sum( phases['turn']['count'] for phases in report.values() ) == turns
+        assert sum( phases['output']['count'] for phases in report.values() ) == turns
+        for phases in report.values():
+            assert set(phases) == {'format', 'move', 'validation', 'win_check',
+                                   'output', 'turn'}
+            assert phases['turn']['total_ms'] >= phases['move']['total_ms']
+
+        profiler.save(str(tmp_path / 'profile.json'))
+        with open(str(tmp_path / 'profile.json')) as f:
+            assert json.load(f).keys() == report.keys()
+
+    def test_games_at_once(self):
+        """Test turns of games running at once are timed per game."""
+        config = GameConfig('tictactoe/tests/configs/config_with_3_ai.json')
+        games = [ Game(config, NullRenderer()) for _ in range(2) ]
+        profiler = Profiler()
+        for game in games:
+            profiler.attach(game)
+        first, second = games[0].players[0], games[1].players[1]
+        # Events of both games interleave, the second one is 10 s behind.
+        for i, event in enumerate(HOOK_EVENTS):
+            profiler.on_event(games[0], event, first, i)
+            profiler.on_event(games[1], event, second, 10 + i * 2)
+        report = profiler.report()
+        assert report[first.char]['move']['max_ms'] == 1000
+        assert report[first.char]['turn']['max_ms'] == 5000
+        assert report[second.char]['turn']['max_ms'] == 10000
+        profiler.detach()
+        assert profiler.turns == {}
+
+    def test_main(self, tmp_path, capsys):
+        """Test profiling games from the command line."""
+        path = str(tmp_path / 'profile.json')
+        main(['tictactoe/tests/configs/config_with_3_ai.json', '-n', '2', '-o', path])
+        assert 'win_check' in capsys.readouterr().out
+        with open(path) as f:
+            assert len(json.load(f)) == 3
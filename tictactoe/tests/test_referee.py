@@ -1,6 +1,9 @@
+import random
+
 import pytest
 
-from tictactoe import Game, GameConfig, Grid, Referee
+from tictactoe import Game, GameConfig, Grid, Move, Referee
+from tictactoe.move import parse_move
 
 
 @pytest.fixture()
@@ -51,19 +54,24 @@ class TestReferee:
         captured = capsys.readouterr()
         assert 'You must provide input in "<row>,<col>" format' in captured.out           
 
-        referee.validate_input('10,10', player)
+        referee.validate_input('1,', player)
         captured = capsys.readouterr()
         assert 'You must provide input in "<row>,<col>" format' in captured.out
 
         # Test input out of range
+        referee.validate_input('10,10', player)
+        captured = capsys.readouterr()
+        assert 'You must provide values which fit on the grid' in captured.out
+
         referee.validate_input('9,9', player)
         captured = capsys.readouterr()
         assert 'You must provide values which fit on the grid' in captured.out
 
         # Test valid input
-        referee.validate_input('1,1', player)
+        assert referee.validate_input('1,1', player) == Move(1, 1)
         captured = capsys.readouterr()
         assert 'OK!' in captured.out
+        assert referee.validate_input(Move(2, 0), player) == Move(2, 0)
 
         # Test position taken
         game.grid.update(1,1,'X')
@@ -71,10 +79,28 @@ class TestReferee:
         captured = capsys.readouterr()
         assert 'This position is already taken' in captured.out
 
+    def test_referee_rejection(self, game, referee):
+        """Test Referee.rejection keeps the reason of the last input."""
+        player = game.players[0]
+        referee.validate_input('asdf', player)
+        assert referee.rejection == 'You must provide input in "<row>,<col>" format.'
+        referee.validate_input('10,10', player)
+        assert referee.rejection == 'You must provide values which fit on the grid.'
+        assert referee.validate_input('1,1', player) == Move(1, 1)
+        assert referee.rejection is None
+
     def test_referee_input_processing(self, referee):
         """Test Referee.process_input method."""
         assert referee.process_input('2, 1') == (2, 1)
         assert referee.process_input('5,5') == (5, 5)
+        assert referee.process_input(Move(1, 2)) == (1, 2)
+
+    def test_parse_move(self):
+        """Test parse_move supports multi-digit coordinates."""
+        assert parse_move(' 12 , 7') == Move(12, 7)
+        assert str(Move(12, 7)) == '12,7'
+        for data in ('', '1', '1,2,3', '-1,2', 'a,1', '1.5,2'):
+            assert parse_move(data) is None
 
     def test_referee_check_for_winner(self, capsys, referee):
         """Test Referee.check_for_winner method."""
@@ -85,8 +111,7 @@ class TestReferee:
             ['V','X','Y'],
             ['X','Y','X']
         ]
-        with pytest.raises(SystemExit):
-            assert referee.check_for_winner()
+        assert referee.check_for_winner()
         captured = capsys.readouterr()
         assert 'X IS THE WINNER' in captured.out
         
@@ -96,8 +121,7 @@ class TestReferee:
             ['V','V','Y'],
             ['V','Y','X']
         ]
-        with pytest.raises(SystemExit):
-            assert referee.check_for_winner()
+        assert referee.check_for_winner()
         captured = capsys.readouterr()
         assert 'V IS THE WINNER' in captured.out
 
@@ -107,8 +131,7 @@ class TestReferee:
             ['O','O','O'],
             ['V','Y','X']
         ]
-        with pytest.raises(SystemExit):
-            assert referee.check_for_winner()
+        assert referee.check_for_winner()
         captured = capsys.readouterr()
         assert 'O IS THE WINNER' in captured.out             
 
@@ -118,8 +141,7 @@ class TestReferee:
             ['O','@','O'],
             ['V','@','X']
         ]
-        with pytest.raises(SystemExit):
-            assert referee.check_for_winner()
+        assert referee.check_for_winner()
         captured = capsys.readouterr()
         assert '@ IS THE WINNER' in captured.out
 
@@ -138,8 +160,7 @@ class TestReferee:
             ['O','Y','O'],
             ['X','@','X']
         ]
-        with pytest.raises(SystemExit):
-            assert referee_for_corners_win_game.check_for_winner()
+        assert referee_for_corners_win_game.check_for_winner()
         captured = capsys.readouterr()
         assert 'X IS THE WINNER' in captured.out
 
@@ -150,7 +171,64 @@ class TestReferee:
             ['V','X','Y'],
             ['X','Y','V']
         ]
-        with pytest.raises(SystemExit):
-            assert referee.check_for_full_grid()
+        assert referee.check_for_full_grid()
         captured = capsys.readouterr()        
         assert 'Grid full' in captured.out
+
+    def test_referee_check_for_winner_at_last_move(self, capsys, referee):
+        """Test Referee.check_for_winner with position of the last move."""
+        referee.grid.data = [
+            ['X','Y','V'],
+            ['V','X','Y'],
+            ['X','Y','X']
+        ]
+        # Position which is not part of the winning line.
+        assert not referee.check_for_winner(0, 1)
+
+        assert referee.check_for_winner(2, 2) == 'X'
+        captured = capsys.readouterr()
+        assert 'X IS THE WINNER' in captured.out
+
+    def test_referee_winner_at_matches_full_scan(self, referee):
+        """Test Referee.winner_at gives the same verdict as the full scan."""
+        rng = random.Random(1)
+        for _ in range(200):
+            referee.grid.create()
+            for x, y in rng.sample([(x, y) for x in range(3) for y in range(3)], 9):
+                referee.grid.update(x, y, rng.choice('XO'))
+                winner = referee.winner_at(x, y)
+                if winner:
+                    assert referee.find_winner() == winner
+                    break
+            else:
+                assert referee.find_winner() is None
+
+    def test_referee_winner_at_for_corners_win(self, referee_for_corners_win_game):
+        """Test Referee.winner_at detects corners win only when a corner is taken."""
+        referee = referee_for_corners_win_game
+        referee.grid.data = [
+            ['X','@','X'],
+            ['O','Y','O'],
+            ['X','@','X']
+        ]
+        assert referee.winner_at(2, 2) == 'X'
+        assert referee.winner_at(1, 1) is None
+
+    def test_referee_check_for_winner_with_win_length(self, capsys):
+        """Test Referee counts runs up to the configured win length."""
+        config = GameConfig('tictactoe/tests/configs/config_with_win_length.json')
+        game = Game(config)
+        referee = game.referee
+        assert referee.win_length == 5
+
+        for y in (2, 3, 4, 6):
+            game.grid.update(4, y, 'X')
+        assert referee.winner_at(4, 4) is None
+        assert referee.find_winner() is None
+
+        game.grid.update(4, 5, 'X')
+        assert referee.winner_at(4, 5) == 'X'
+        assert referee.find_winner() == 'X'
+        assert referee.check_for_winner(4, 5) == 'X'
+        captured = capsys.readouterr()
+        assert 'X IS THE WINNER' in captured.out
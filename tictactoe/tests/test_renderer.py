@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+from tictactoe import Game, GameConfig, Grid
+from tictactoe.renderer import AnsiRenderer, NullRenderer
+
+
+class CountingStream(io.StringIO):
+    """String stream which counts calls of write."""
+    writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TestRenderer:
+    """Tests tictactoe.renderer classes."""
+
+    def test_grid_output(self):
+        """Test grid is written at once in the layout of the game."""
+        stream = CountingStream()
+        grid = Grid(3, AnsiRenderer(stream))
+        grid.data = [
+            ['X','','V'],
+            ['V','X',''],
+            ['','Y','V']
+        ]
+        stream.seek(0)
+        stream.truncate()
+        stream.writes = 0
+        grid.show()
+        assert stream.writes == 1
+        assert stream.getvalue() == (
+            '\n\t    0\t    1\t    2\t\r\n'
+            '\t ------------------------\n'
+            '    0\t|   X\t|   \t|   V\t|\r\n'
+            '\t ------------------------\n'
+            '    1\t|   V\t|   X\t|   \t|\r\n'
+            '\t ------------------------\n'
+            '    2\t|   \t|   Y\t|   V\t|\r\n'
+            '\t ------------------------\n'
+            '\r\n'
+        )
+
+    def test_frame_is_written_once(self):
+        """Test output within a frame is buffered until the frame ends."""
+        stream = CountingStream()
+        renderer = AnsiRenderer(stream)
+        with renderer.frame():
+            renderer.message('Round', 1, end=': ')
+            renderer.show_grid(Grid(3, NullRenderer()))
+            renderer.message('done')
+            assert stream.writes == 0
+        assert stream.writes == 1
+        assert stream.getvalue().startswith('Round 1: \n\t')
+        assert stream.getvalue().endswith('done\n')
+
+    def test_clear_screen(self):
+        """Test ANSI renderer can clear the terminal before every grid."""
+        stream = io.StringIO()
+        AnsiRenderer(stream, clear=True).show_grid(Grid(3, NullRenderer()))
+        assert stream.getvalue().startswith(AnsiRenderer.CLEAR_SCREEN)
+
+    def test_banners_only_when_verbose(self, capsys):
+        """Test constructors don't output anything unless verbose."""
+        config = GameConfig('config_example.json')
+        Game(config)
+        assert capsys.readouterr().out == ''
+
+        stream = io.StringIO()
+        Game(config, AnsiRenderer(stream, verbose=True))
+        assert 'Starting new game ...' in stream.getvalue()
+        assert 'Initializing Player @ (AI) ...' in stream.getvalue()
+
+    def test_null_renderer(self, capsys):
+        """Test headless game doesn't output anything."""
+        config = GameConfig('tictactoe/tests/configs/config_with_3_ai.json')
+        capsys.readouterr()
+        game = Game(config, NullRenderer())
+        assert game.run()
+        assert capsys.readouterr().out == ''
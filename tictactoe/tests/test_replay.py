@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from tictactoe import Game
+from tictactoe.movelog import MoveLogWriter, read_games
+from tictactoe.renderer import NullRenderer
+from tictactoe.replay import Replayer, iter_replay, summarize
+
+
+class TestReplay:
+    """Tests tictactoe.replay functions and Replayer class."""
+
+    @pytest.fixture
+    def config(self):
+        with open('tictactoe/tests/configs/config_with_3_ai.json') as f:
+            config = json.load(f)
+        config['grid']['size'] = 3
+        return config
+
+    def test_replay_winner(self, config):
+        """Test the winner and the turn of victory are found."""
+        replayer = Replayer(config)
+        moves = [('X', 0, 0), ('O', 1, 0), ('V', 2, 2), ('X', 0, 1),
+                 ('O', 1, 1), ('V', 2, 1), ('X', 0, 2)]
+        result = replayer.replay(moves)
+        assert result.winner == 'X' and result.win_turn == 7 and result.turns == 7
+        assert result.state[0] == ('X', 'X', 'X') and result.illegal is None
+
+        # The grid is reused for the next game.
+        result = replayer.replay(moves[:2])
+        assert result.winner is None and result.state[0] == ('X', '', '')
+
+    @pytest.mark.parametrize('moves, turn, reason', [
+        ([('X', 0, 0), ('O', 0, 0)], 2, 'already taken'),
+        ([('X', 0, 3)], 1, 'fit on the grid'),
+        ([('X', 0, 0), ('X', 0, 1), ('X', 0, 2), ('O', 1, 1)], 4, 'ended'),
+    ])
+    def test_replay_illegal_moves(self, config, moves, turn, reason):
+        """Test replay stops at the first illegal move."""
+        result = Replayer(config).replay(moves)
+        assert result.illegal[0] == turn and reason in result.illegal[1]
+        assert result.turns == turn - 1
+
+    def test_replay_move_log(self, config, tmp_path):
+        """Test games from a move log are verified with their results."""
+        path = tmp_path / 'games.log'
+        with open(path, 'ab') as f:
+            game = Game(config, NullRenderer(), MoveLogWriter(f))
+            results = []
+            for _ in range(5):
+                game.reset()
+                results.append(game.run())
+
+        for processes in (1, 2):
+            replays = list(iter_replay(config, read_games(path), processes))
+            assert [ r.winner for r in replays ] == [ r.winner for r in results ]
+            assert [ r.turns for r in replays ] == [ r.turns for r in results ]
+
+        summary = summarize(replays)
+        assert summary['games'] == 5 and summary['illegal'] == 0
+        assert summary['unfinished'] == 0
+
+    def test_replay_other_grid_size(self, config, tmp_path):
+        """Test games recorded on a grid of another size are illegal."""
+        path = tmp_path / 'games.log'
+        with open(path, 'ab') as f:
+            game = Game(dict(config, grid=dict(config['grid'], size=4)),
+                        NullRenderer(), MoveLogWriter(f))
+            game.run()
+
+        for processes in (1, 2):
+            replay, = iter_replay(config, read_games(path), processes)
+            assert replay.illegal == (0, 'The game was recorded on a 4x4 grid.')
+            assert replay.turns == 0 and replay.winner is None
+        assert Replayer(config).replay([('X', 0, 0)], 3).illegal is None
@@ -0,0 +1,108 @@
+import random
+import time
+
+import pytest
+
+from tictactoe import Grid, Player
+from tictactoe.search import AlphaBeta, TranspositionTable
+
+
+class TestTranspositionTable:
+    """Tests tictactoe.search.TranspositionTable class."""
+
+    def test_table_replacement(self):
+        """Test deeper and newer entries replace older ones in a slot."""
+        table = TranspositionTable(4)
+        table.put(1, 5, 10, 0, 3)
+        # Shallower entry of another position in the same slot is rejected.
+        table.put(5, 2, 20, 0, 1)
+        assert table.get(1)[2] == 10 and table.get(5) is None
+        # After a new search, entries of earlier searches are replaced.
+        table.new_search()
+        table.put(5, 2, 20, 0, 1)
+        assert table.get(5)[2] == 20 and table.get(1) is None
+
+
+class TestAlphaBeta:
+    """Tests tictactoe.search.AlphaBeta strategy."""
+
+    def test_takes_winning_move(self):
+        """Test the search completes own line instead of blocking."""
+        grid = Grid(3)
+        grid.data = [
+            ['X','X',''],
+            ['O','O',''],
+            ['','','']
+        ]
+        assert AlphaBeta(time_limit=1).decide(grid, 'X', ['X', 'O']) == (0, 2)
+
+    def test_blocks_opponent(self):
+        """Test the search blocks the opponent from winning."""
+        grid = Grid(3)
+        grid.data = [
+            ['O','O',''],
+            ['','X',''],
+            ['','','']
+        ]
+        assert AlphaBeta(time_limit=1).decide(grid, 'X', ['X', 'O']) == (0, 2)
+
+    def test_corners_win_condition(self):
+        """Test the search knows about corners win condition."""
+        grid = Grid(3)
+        grid.data = [
+            ['X','O','X'],
+            ['O','','O'],
+            ['X','',''],
+        ]
+        strategy = AlphaBeta(time_limit=1, win_condition='corners')
+        assert strategy.decide(grid, 'X', ['X', 'O']) in ((2, 2), (1, 1))
+
+    def test_never_loses_against_random_player(self):
+        """Test the search doesn't lose 3x3 games against random moves."""
+        rng = random.Random(3)
+        strategy = AlphaBeta(time_limit=1)
+        for game in range(6):
+            grid = Grid(3)
+            turn_order = ['X', 'O'] if game % 2 else ['O', 'X']
+            turn = 0
+            while not grid.is_full() and not _has_line(grid, 'X') \
+                    and not _has_line(grid, 'O'):
+                char = turn_order[turn % 2]
+                if char == 'X':
+                    x, y = strategy.decide(grid, char, turn_order)
+                else:
+                    x, y = rng.choice(list(grid.free_cells()))
+                grid.update(x, y, char)
+                turn += 1
+            assert not _has_line(grid, 'O')
+
+    def test_respects_time_limit_with_three_players(self):
+        """Test move on a large grid with three players is made in time."""
+        grid = Grid(10)
+        grid.update(4, 4, 'O')
+        grid.update(4, 5, 'V')
+        grid.update(5, 5, 'O')
+        start = time.perf_counter()
+        x, y = AlphaBeta(time_limit=0.2).decide(grid, 'X', ['O', 'V', 'X'])
+        assert time.perf_counter() - start < 0.5
+        assert not grid.is_occupied(x, y)
+
+    def test_player_with_alphabeta_strategy(self):
+        """Test Player uses the strategy named by the ai setting."""
+        player = Player({'char': 'X', 'ai': 'alphabeta', 'time_limit': 0.1})
+        assert isinstance(player.strategy, AlphaBeta)
+        assert player.strategy.time_limit == 0.1
+        grid = Grid(3)
+        grid.data = [
+            ['X','X',''],
+            ['O','O',''],
+            ['','','']
+        ]
+        assert player.ai_move(grid) == (0, 2)
+
+
+def _has_line(grid, char):
+    lines = [ [(x, y) for y in range(3)] for x in range(3) ] + \
+            [ [(x, y) for x in range(3)] for y in range(3) ] + \
+            [ [(i, i) for i in range(3)], [(i, 2 - i) for i in range(3)] ]
+    return any(all(grid[x][y] == char for x, y in line) for line in lines)
@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import pytest
+
+from tictactoe import Move, Player
+from tictactoe.server import GameServer, main
+
+
+CONFIG = {
+    'grid': {'size': 3, 'win_condition': 'standard'},
+    'players': {
+        'Player 1': {'char': 'X'},
+        'Player 2': {'char': 'O', 'ai': True},
+    },
+}
+
+
+def run_client(client, timeout=60.0, config=CONFIG):
+    """Run the client coroutine against a server on the loopback interface."""
+    async def main():
+        server = await GameServer(config, timeout).start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                return await client(reader, writer)
+            finally:
+                writer.close()
+    return asyncio.run(main())
+
+
+async def play(reader, writer, lines):
+    """Play a game taking the first free position and return its last line."""
+    grid = set()
+    while True:
+        line = (await reader.readline()).decode().strip()
+        lines.append(line)
+        command, *args = line.split()
+        if command == 'MOVE':
+            grid.add(args[1])
+        elif command == 'TURN':
+            move = next( '{},{}'.format(x, y) for x in range(3) for y in range(3)
+                         if '{},{}'.format(x, y) not in grid )
+            writer.write(move.encode() + b'\n')
+        elif command in ('WIN', 'DRAW'):
+            return line
+
+
+class TestGameServer:
+    """Tests tictactoe.server.GameServer with a local client."""
+
+    def test_play_games(self):
+        """Test a client plays two games and quits."""
+        lines = []
+
+        async def client(reader, writer):
+            results = [await play(reader, writer, lines)]
+            writer.write(b'NEW\n')
+            results.append(await play(reader, writer, lines))
+            writer.write(b'QUIT\n')
+            results.append((await reader.readline()).decode().strip())
+            return results
+
+        results = run_client(client)
+        assert results[2] == 'BYE'
+        assert lines[0].split()[0] == 'START' and sorted(lines[0].split()[1:]) == ['O', 'X']
+        moves = [ line for line in lines if line.startswith('MOVE') ]
+        # Both games were finished by the referee.
+        for result in results[:2]:
+            assert result.split()[0] in ('WIN', 'DRAW')
+        assert len(moves) == int(results[0].split()[-1]) + int(results[1].split()[-1])
+
+    def test_invalid_moves(self):
+        """Test rejected moves are reported and asked for again."""
+        async def client(reader, writer):
+            line = ''
+            while not line.startswith('TURN'):
+                line = (await reader.readline()).decode()
+            replies = []
+            for move in (b'abc\n', b'7,7\n'):
+                writer.write(move)
+                replies.append((await reader.readline()).decode().strip())
+            return replies
+
+        assert run_client(client) == [
+            'ERROR You must provide input in "<row>,<col>" format.',
+            'ERROR You must provide values which fit on the grid.',
+        ]
+
+    def test_timeout(self):
+        """Test idle clients are disconnected."""
+        async def client(reader, writer):
+            return (await reader.read()).decode().splitlines()
+
+        lines = run_client(client, timeout=0.05)
+        assert lines[-1] == 'TIMEOUT'
+
+    def test_ai_only_games(self):
+        """Test games without human players are played by the server."""
+        config = {'grid': CONFIG['grid'], 'players': {
+            'Player 1': {'char': 'X', 'ai': True},
+            'Player 2': {'char': 'O', 'ai': True},
+        }}
+
+        async def client(reader, writer):
+            return await play(reader, writer, [])
+
+        assert run_client(client, config=config).split()[0] in ('WIN', 'DRAW')
+
+    def test_rejected_ai_moves(self, monkeypatch):
+        """Test AI moves rejected by the referee are decided again."""
+        ai_move = Player.ai_move
+        calls = []
+
+        def rejected_first(player, grid):
+            calls.append(player.char)
+            if len(calls) % 2:
+                return Move(7, 7)
+            return ai_move(player, grid)
+
+        monkeypatch.setattr(Player, 'ai_move', rejected_first)
+        lines = []
+
+        async def client(reader, writer):
+            return await play(reader, writer, lines)
+
+        assert run_client(client).split()[0] in ('WIN', 'DRAW')
+        assert not any( line.startswith('ERROR') for line in lines )
+        assert '7,7' not in ' '.join(lines)
+
+    def test_mcts_workers_are_refused(self, tmp_path, capsys):
+        """Test configs with MCTS worker processes aren't served."""
+        config = {'grid': CONFIG['grid'], 'players': dict(CONFIG['players'])}
+        config['players']['Player 2'] = {'char': 'O', 'ai': 'mcts', 'workers': 2}
+        with pytest.raises(ValueError):
+            GameServer(config)
+
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps(config))
+        with pytest.raises(SystemExit):
+            main([str(path)])
+        assert 'can\'t use MCTS workers' in capsys.readouterr().out
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from tictactoe import GameResult
+from tictactoe.simulation import simulate, summarize
+
+
+@pytest.fixture()
+def config():
+    with open('tictactoe/tests/configs/config_with_3_ai.json') as f:
+        yield json.load(f)
+
+
+class TestSimulation:
+    """Tests tictactoe.simulation functions."""
+
+    def test_simulate_in_process(self, capsys, config):
+        """Test simulation of games in the current process."""
+        results = simulate(config, 5, processes=1, seed=1)
+        assert len(results) == 5
+        for result in results:
+            assert isinstance(result, GameResult)
+            assert result.turns == len(result.moves)
+            # All moves are on different positions.
+            assert len({ (x, y) for _, x, y in result.moves }) == result.turns
+            if result.winner:
+                assert result.moves[-1][0] == result.winner
+        # Nothing is printed during the simulation.
+        assert capsys.readouterr().out == ''
+
+    def test_simulate_is_reproducible_across_processes(self, config):
+        """Test seeded simulation gives same results on a process pool."""
+        assert simulate(config, 6, processes=1, seed=7) == \
+               simulate(config, 6, processes=2, seed=7, chunksize=2)
+
+    def test_simulate_requires_ai_players(self, config):
+        """Test simulation refuses configs with human players."""
+        config['players']['Player 1']['ai'] = False
+        with pytest.raises(ValueError):
+            simulate(config, 1, processes=1)
+
+    def test_summarize(self):
+        """Test summary of simulation results."""
+        results = [
+            GameResult('X', False, 5, []),
+            GameResult(None, True, 9, []),
+            GameResult('X', False, 7, []),
+        ]
+        assert summarize(results) == {
+            'games': 3, 'wins': {'X': 2}, 'draws': 1, 'average_turns': 7
+        }
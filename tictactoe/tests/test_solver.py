@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from tictactoe import Grid, Player
+from tictactoe.solver import DRAW, OpeningBook, Solver
+
+
+@pytest.fixture(scope='module')
+def book_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('books') / 'standard.book')
+    Solver(3).save(path)
+    yield path
+
+
+class TestSolver:
+    """Tests tictactoe.solver.Solver class."""
+
+    def test_solve_empty_grid(self):
+        """Test 3x3 game is a draw with perfect play."""
+        solver = Solver(3)
+        outcome, plies, _ = solver.solve()
+        assert outcome == DRAW and plies == 9
+        # Symmetric positions are solved only once.
+        assert len(solver.table) < 3 ** 9 // 8
+
+    def test_solve_won_position(self):
+        """Test player to move finds immediate win and sees a lost position."""
+        solver = Solver(3)
+        # Player to move (1) has two in the top row, opponent (2) blocks nothing.
+        outcome, plies, _ = solver.solve((1, 1, 0,
+                                          2, 2, 0,
+                                          0, 0, 0))
+        assert outcome == 0 and plies == 1
+        # Opponent has a fork and player to move can't stop it.
+        outcome, _, _ = solver.solve((2, 0, 1,
+                                      0, 1, 0,
+                                      2, 0, 2))
+        assert outcome == 1
+
+    def test_solve_with_three_players(self):
+        """Test solver handles three players on small grid."""
+        outcome, plies, _ = Solver(3, players=3).solve()
+        assert outcome in (0, 1, 2, DRAW) and 5 <= plies <= 9
+
+
+class TestOpeningBook:
+    """Tests tictactoe.solver.OpeningBook class."""
+
+    def test_book_is_loaded_lazily(self, book_path):
+        """Test the file isn't opened before first lookup."""
+        book = OpeningBook(book_path)
+        assert book.map is None
+        assert book.decide(Grid(3), 'X', ['X', 'O']) is not None
+        assert book.map is not None and book.size == 3 and book.players == 2
+        book.close()
+
+    def test_book_matches_solver(self, book_path):
+        """Test moves from the book have the same value as solver's moves."""
+        solver = Solver(3)
+        book = OpeningBook(book_path)
+        rng = random.Random(5)
+        for _ in range(50):
+            cells = [0] * 9
+            for i in rng.sample(range(9), rng.randint(0, 4)):
+                cells[i] = 2 - i % 2
+            cells = tuple(cells)
+            found = book.probe(cells)
+            if found is None:
+                continue  # Position not reachable in a game
+            outcome, move = found
+            assert cells[move] == 0
+            assert outcome == solver.solve(cells)[0]
+
+    def test_book_rules_mismatch(self, book_path):
+        """Test the book isn't used for grids and rules it wasn't built for."""
+        assert OpeningBook(book_path).decide(Grid(4), 'X', ['X', 'O']) is None
+        book = OpeningBook(book_path, win_condition='corners')
+        assert book.decide(Grid(3), 'X', ['X', 'O']) is None
+
+    def test_player_with_book_never_loses(self, book_path):
+        """Test Player with the book doesn't lose against random moves."""
+        player = Player({'char': 'X', 'ai': 'book', 'book': book_path})
+        rng = random.Random(2)
+        lines = [ [(x, y) for y in range(3)] for x in range(3) ] + \
+                [ [(x, y) for x in range(3)] for y in range(3) ] + \
+                [ [(i, i) for i in range(3)], [(i, 2 - i) for i in range(3)] ]
+
+        def won(grid, char):
+            return any(all(grid[x][y] == char for x, y in line) for line in lines)
+
+        for game in range(10):
+            grid = Grid(3)
+            player.turn_order = ['X', 'O'] if game % 2 else ['O', 'X']
+            turn = 0
+            while not grid.is_full() and not won(grid, 'X') and not won(grid, 'O'):
+                char = player.turn_order[turn % 2]
+                if char == 'X':
+                    x, y = player.ai_move(grid)
+                else:
+                    x, y = rng.choice(list(grid.free_cells()))
+                grid.update(x, y, char)
+                turn += 1
+            assert not won(grid, 'O')
@@ -0,0 +1,103 @@
+import pytest
+
+from tictactoe import Game, GameConfig, Grid, Player, SparseGrid
+from tictactoe.benchmark import make_positions
+from tictactoe.renderer import AnsiRenderer, NullRenderer
+
+
+class TestSparseGrid:
+    """Tests methods of tictactoe.sparsegrid.SparseGrid class."""
+
+    def test_sparsegrid_indexing(self):
+        """Tests grid[x][y] indexing works the same as for list based Grid."""
+        rows = [
+            ['X','','V'],
+            ['V','X',''],
+            ['','Y','V']
+        ]
+        grid = SparseGrid(3)
+        grid.data = rows
+        assert grid.data == rows and len(grid.cells) == 6
+        for x in range(3):
+            for y in range(-3, 3):
+                assert grid[x][y] == rows[x][y]
+        with pytest.raises(IndexError):
+            grid[0][3]
+        grid[0][1] = 'Y'
+        assert grid[0][1] == 'Y' and grid.is_occupied(0, 1)
+
+    def test_sparsegrid_large(self):
+        """Tests a 1000x1000 grid only keeps taken positions."""
+        grid = SparseGrid(1000, NullRenderer())
+        grid.update(999, 999, 'X')
+        assert grid.cells == {(999, 999): 'X'} and not grid.is_full()
+        x, y = grid.random_free_cell()
+        assert (x, y) != (999, 999) and 0 <= x < 1000 and 0 <= y < 1000
+        grid.clear()
+        assert grid.cells == {}
+
+    def test_sparsegrid_full_and_free_cells(self):
+        """Tests SparseGrid.is_full, free_cells and random_free_cell methods."""
+        grid = SparseGrid(3)
+        grid.data = [
+            ['(0,1)','Y','V'],
+            ['V','X','Y'],
+            ['X','Y','']
+        ]
+        assert not grid.is_full()
+        assert list(grid.free_cells()) == [(0, 0), (2, 2)]
+        assert grid.random_free_cell() in [(0, 0), (2, 2)]
+        grid.update(0, 0, 'X')
+        grid.update(2, 2, 'V')
+        assert grid.is_full() and list(grid.free_cells()) == []
+
+    def test_sparsegrid_has_run(self):
+        """Tests SparseGrid.has_run counts runs of the given length."""
+        grid = SparseGrid(500)
+        for x, y in ((401, 3), (402, 2), (403, 1)):
+            grid.update(x, y, 'O')
+        grid.update(400, 4, 'X')
+        assert grid.has_run('O', 3) and not grid.has_run('O', 4)
+        assert grid.chars() == {'O', 'X'}
+
+    def test_sparsegrid_window(self):
+        """Tests only a window around the last move is shown."""
+        grid = SparseGrid(3)
+        grid.data = [
+            ['X','Y','V'],
+            ['V','','Y'],
+            ['X','Y','X']
+        ]
+        assert grid.window() == (range(3), range(3))
+        list_grid = Grid(3, NullRenderer())
+        list_grid.data = grid.data
+        renderer = AnsiRenderer()
+        assert renderer.format_grid(grid, grid.window()) == renderer.format_grid(list_grid)
+
+        grid = SparseGrid(500)
+        grid.update(10, 10, 'X')
+        grid.update(12, 300, 'O')
+        rows, cols = grid.window()
+        assert rows == range(9, 14)
+        assert cols == range(293, 308) and len(cols) == 15
+
+    def test_ai_decide_on_sparse_grid(self):
+        """Tests Player.ai_decide decides the same as on list based Grid."""
+        player = Player({'char': 'X', 'ai': True}, {'win_length': 4}, NullRenderer())
+        grid = Grid(7, NullRenderer())
+        sparse = SparseGrid(7, NullRenderer())
+        for rows, _ in make_positions(7, 3, 100, 0):
+            grid.data = [ list(row) for row in rows ]
+            sparse.data = rows
+            assert player.ai_decide(sparse) == player.ai_decide(grid)
+
+    def test_game_run_with_sparse_grid(self, capsys):
+        """Tests game run with AI players on a 100x100 sparse grid."""
+        config = GameConfig('tictactoe/tests/configs/config_with_sparse_grid.json')
+        assert config.is_valid()
+        game = Game(config)
+        assert isinstance(game.grid, SparseGrid)
+
+        game.run()
+        captured = capsys.readouterr()
+        assert "Game finished" in captured.out
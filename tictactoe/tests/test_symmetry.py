@@ -0,0 +1,42 @@
+import pytest
+
+from tictactoe import Grid
+from tictactoe.symmetry import (canonical, canonicalize, from_canonical,
+                                tables, to_canonical)
+
+
+class TestSymmetry:
+    """Tests tictactoe.symmetry functions."""
+
+    def test_tables(self):
+        """Test all 8 transforms are different and inverses undo them."""
+        symmetry = tables(4)
+        assert len(set(symmetry.permutations)) == 8
+        for perm, inverse in zip(symmetry.permutations, symmetry.inverses):
+            assert sorted(perm) == list(range(16))
+            assert all(inverse[perm[i]] == i for i in range(16))
+        assert tables(4) is symmetry
+
+    def test_equal_positions_share_canonical_form(self):
+        """Test rotated and reflected grids have the same canonical form."""
+        grid = Grid(3)
+        grid.update(0, 0, 'X')
+        grid.update(0, 1, 'O')
+        forms = set()
+        for perm in tables(3).permutations:
+            cells = [ grid.flat()[i] for i in perm ]
+            forms.add(canonical(cells, 3)[0])
+        assert len(forms) == 1
+        assert canonicalize(grid)[0] in forms
+
+    def test_move_mapping(self):
+        """Test moves are mapped between the grid and its canonical form."""
+        grid = Grid(5)
+        grid.update(4, 3, 'X')
+        grid.update(1, 0, 'O')
+        cells, transform = canonicalize(grid)
+        for x in range(5):
+            for y in range(5):
+                cx, cy = to_canonical(x, y, transform, 5)
+                assert cells[cx * 5 + cy] == grid[x][y]
+                assert from_canonical(cx, cy, transform, 5) == (x, y)
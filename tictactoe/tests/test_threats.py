@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from tictactoe import BitGrid, Grid, SparseGrid
+from tictactoe.lines import flat_line_index
+from tictactoe.renderer import NullRenderer
+from tictactoe.threats import BLOCK, FORK, WIN, ThreatBoard
+
+
+class TestThreatBoard:
+    """Tests tictactoe.threats.ThreatBoard class."""
+
+    def test_threat_counts(self):
+        """Test counts of threats are updated by moves."""
+        threats = ThreatBoard(3)
+        threats.play(0, 'X')
+        assert threats.twos['X'] == {1: 1, 2: 1, 3: 1, 6: 1, 4: 1, 8: 1}
+        threats.play(4, 'X')
+        assert threats.wins['X'] == {8: 1}
+        assert threats.twos['X'][1] == 2 and 4 not in threats.twos['X']
+        threats.play(8, 'O')
+        assert threats.wins['X'] == {}
+        assert threats.lines[(0, 4, 8)] == (None, 2)
+
+    def test_generated_lines(self):
+        """Test lines of large grids are the same as in the line index."""
+        for win_condition in ('standard', 'corners'):
+            index = flat_line_index(6, 4, win_condition)
+            threats = ThreatBoard(6, 4, win_condition)
+            threats.index = None
+            for position in range(36):
+                expected = [ index.lines[n] for n in index.cell_lines[position] ]
+                assert sorted(threats.lines_through(position)) == sorted(expected)
+        threats = ThreatBoard(1000, 5)
+        assert threats.index is None and len(threats.lines_through(500500)) == 20
+
+    def test_scores(self):
+        """Test wins rank before blocks of the next opponents and forks."""
+        threats = ThreatBoard(5)
+        for position, char in ((0, 'X'), (1, 'X'), (10, 'O'), (11, 'O'),
+                               (20, 'V'), (21, 'V'), (4, 'W'), (18, 'W')):
+            threats.play(position, char)
+        scores = threats.scores('X', ['X', 'O', 'V', 'W'])
+        assert scores[2] == (WIN, 1)
+        assert scores[12] == (BLOCK, 0, 1) and scores[22] == (BLOCK, -1, 1)
+        assert threats.best('X', ['X', 'O', 'V', 'W']) == 2
+        assert threats.best('V', ['X', 'O', 'V', 'W']) == 22
+        assert threats.best('W', ['X', 'O', 'V', 'W']) == 2
+        assert threats.best('W', ['W', 'O', 'V', 'X']) == 12
+        # Without turn order all opponents rank the same.
+        assert threats.best('W') == 2
+
+        threats = ThreatBoard(5)
+        for position in (0, 14):
+            threats.play(position, 'X')
+        assert threats.scores('X')[2] == (FORK, 2)
+        assert threats.best('X') == 2
+
+    @pytest.mark.parametrize('engine', [Grid, BitGrid, SparseGrid])
+    def test_sync(self, engine):
+        """Test the board follows moves and rewritten history of grids."""
+        rng = random.Random(0)
+        grid = engine(7, NullRenderer())
+        threats = ThreatBoard(7, 4)
+        order = rng.sample(range(49), 30)
+        for turn, position in enumerate(order):
+            grid.update(*divmod(position, 7), 'XOV'[turn % 3])
+            if turn % 4 == 0:
+                threats.sync(grid)
+        threats.sync(grid)
+        rebuilt = ThreatBoard(7, 4)
+        rebuilt.sync(grid)
+        assert threats.cells == rebuilt.cells and threats.lines == rebuilt.lines
+
+        grid.data = [ [''] * 7 for _ in range(7) ]
+        grid.update(3, 3, 'X')
+        threats.sync(grid)
+        assert threats.cells == {24: 'X'}
+        grid.update(3, 3, '')
+        threats.sync(grid)
+        assert threats.cells == {}
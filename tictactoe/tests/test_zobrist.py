@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from tictactoe import BitGrid, Grid, SparseGrid
+from tictactoe.renderer import NullRenderer
+from tictactoe.zobrist import zobrist_hash, zobrist_key, zobrist_keys
+
+
+class TestZobrist:
+    """Tests Zobrist keys and hashes kept by the grid engines."""
+
+    def test_keys_are_stable(self):
+        """Test keys are fixed 64 bit values which don't depend on the run."""
+        assert zobrist_key(3, 4, 'X') == 16826756155294638319
+        assert zobrist_key(1000, 999999, 'O') == 17763998783171243827
+        keys = zobrist_keys(10, 'X')
+        assert len(set(keys)) == 100 and all(0 <= key < 2 ** 64 for key in keys)
+        assert keys is zobrist_keys(10, 'X')
+        assert set(keys).isdisjoint(zobrist_keys(10, 'O'))
+        assert keys[:9] != zobrist_keys(3, 'X')
+
+    @pytest.mark.parametrize('engine', [Grid, BitGrid, SparseGrid])
+    def test_grid_hash(self, engine):
+        """Test grids update the hash with every move the same way."""
+        rng = random.Random(0)
+        grid = engine(5, NullRenderer())
+        assert grid.zobrist == 0
+        hashes = [0]
+        order = rng.sample(range(25), 25)
+        for turn, position in enumerate(order):
+            grid.update(*divmod(position, 5), 'XOV'[turn % 3])
+            hashes.append(grid.zobrist)
+        assert len(set(hashes)) == 26
+        cells = [ (position, 'XOV'[turn % 3]) for turn, position in enumerate(order) ]
+        assert grid.zobrist == zobrist_hash(5, cells)
+
+        # Same position reached in another order has the same hash.
+        other = engine(5, NullRenderer())
+        for position, char in reversed(cells):
+            other.update(*divmod(position, 5), char)
+        assert other.zobrist == grid.zobrist
+
+        copy = engine(5, NullRenderer())
+        copy.data = grid.data
+        assert copy.zobrist == grid.zobrist
+        grid.update(*divmod(order[0], 5), 'W')
+        replaced = [ (p, 'W' if p == order[0] else c) for p, c in cells ]
+        assert grid.zobrist == zobrist_hash(5, replaced)
+        grid.clear()
+        assert grid.zobrist == 0
+
+    def test_free_position(self):
+        """Test freeing a position restores the previous hash."""
+        for engine in (Grid, BitGrid, SparseGrid):
+            grid = engine(4, NullRenderer())
+            grid.update(1, 2, 'X')
+            before = grid.zobrist
+            grid.update(3, 3, 'O')
+            grid.update(3, 3, '')
+            assert grid.zobrist == before == zobrist_key(4, 6, 'X')
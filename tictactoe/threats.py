@@ -0,0 +1,171 @@
+from .lines import DIRECTIONS, flat_line_index
+
+
+# Largest grid size for which lines are taken from the cached line index.
+# Lines of larger grids are generated around every move instead.
+MAX_INDEX_SIZE = 32
+
+# Score categories of positions, higher ones are played first.
+WIN, BLOCK, FORK = 3, 2, 1
+
+
+class ThreatBoard:
+    """Keeps track of threats on the winning lines of a grid.
+
+    For every line with taken positions the board knows whether a single
+    player holds all of them and how many. Positions which complete a line
+    of a player and positions which get a line of a player one short of
+    winning are counted per player and updated with every move, so the
+    cost of a move only depends on the number of lines through it and
+    scoring the grid only visits positions with threats.
+
+    Moves of a grid are followed by `sync`, which applies new entries of
+    `grid.moves` and rebuilds the board when the history was replaced.
+
+    Args:
+        size (int): Size of the grid.
+        win_length (int): Number of positions in a winning line.
+        win_condition (str): Either "standard" or "corners".
+
+    Attributes:
+        cells (dict): Player char of every taken flat position.
+        lines (dict): Tuple of (char, count) for every line with taken
+            positions, char is None once several players took positions.
+        wins (dict): For every char, number of lines completed by each
+            free flat position.
+        twos (dict): For every char, number of lines a position short of
+            winning after taking each free flat position.
+    """
+    def __init__(self, size, win_length=3, win_condition='standard'):
+        self.size = size
+        self.win_length = win_length
+        self.win_condition = win_condition
+        if size <= MAX_INDEX_SIZE:
+            self.index = flat_line_index(size, win_length, win_condition)
+        else:
+            self.index = None
+        self.reset()
+
+    def reset(self):
+        """Forget all moves."""
+        self.cells = {}
+        self.lines = {}
+        self.wins = {}
+        self.twos = {}
+        self.moves = None
+        self.applied = 0
+
+    def sync(self, grid):
+        """Apply moves of the grid which weren't seen yet."""
+        if grid.moves is not self.moves:
+            self.reset()
+            self.moves = grid.moves
+        moves = self.moves
+        while self.applied < len(moves):
+            x, y = divmod(moves[self.applied], self.size)
+            self.play(moves[self.applied], grid[x][y])
+            self.applied += 1
+
+    def lines_through(self, position):
+        """Return tuples of flat positions of all lines through a position."""
+        if self.index:
+            lines = self.index.lines
+            return [ lines[n] for n in self.index.cell_lines[position] ]
+
+        size = self.size
+        k = self.win_length
+        x, y = divmod(position, size)
+        found = []
+        for dx, dy in DIRECTIONS:
+            step = dx * size + dy
+            for i in range(k):
+                start_x = x - dx * i
+                start_y = y - dy * i
+                end_x = start_x + dx * (k - 1)
+                end_y = start_y + dy * (k - 1)
+                if 0 <= start_x < size and 0 <= start_y < size and \
+                   0 <= end_x < size and 0 <= end_y < size:
+                    start = start_x * size + start_y
+                    found.append(tuple(range(start, start + step * k, step)))
+        last = size - 1
+        corners = (0, last, last * size, last * size + last)
+        if self.win_condition == 'corners' and position in corners:
+            found.append(corners)
+        return found
+
+    def play(self, position, char):
+        """Take a free position with the char and update its lines."""
+        self.cells[position] = char
+        for counts in self.wins.values():
+            counts.pop(position, None)
+        for counts in self.twos.values():
+            counts.pop(position, None)
+
+        for line in self.lines_through(position):
+            owner, count = self.lines.get(line, (char, 0))
+            if owner is None:
+                continue
+            length = len(line)
+            if owner != char:
+                # Another player took the line, it can't be won anymore.
+                self.lines[line] = (None, count)
+                if count == length - 2:
+                    self.count_free(self.twos, owner, line, -1)
+                continue
+            count += 1
+            self.lines[line] = (char, count)
+            if count == length - 2:
+                self.count_free(self.twos, char, line, 1)
+            elif count == length - 1:
+                self.count_free(self.twos, char, line, -1)
+                self.count_free(self.wins, char, line, 1)
+
+    def count_free(self, table, char, line, change):
+        """Add change to the counts of free positions of a line in table."""
+        counts = table.setdefault(char, {})
+        for position in line:
+            if position not in self.cells:
+                count = counts.get(position, 0) + change
+                if count > 0:
+                    counts[position] = count
+                else:
+                    counts.pop(position, None)
+
+    def scores(self, char, turn_order=None):
+        """Return score of every free position with a threat for the char.
+
+        Scores are tuples which compare in order of preference: completing
+        a line of the char, then blocking a line of an opponent ranked by
+        how soon the opponent moves after the char, then taking a position
+        which gets two or more lines of the char a position short of winning.
+
+        Args:
+            char (str): Char of the player to move.
+            turn_order (list): Chars of all players in order of their turns.
+                Without it all opponents are ranked the same.
+        """
+        if turn_order and char in turn_order:
+            i = turn_order.index(char)
+            opponents = list(turn_order[i + 1:]) + list(turn_order[:i])
+        else:
+            opponents = [ other for other in self.wins if other != char ]
+
+        scores = {}
+        for position, count in self.twos.get(char, {}).items():
+            if count >= 2:
+                scores[position] = (FORK, count)
+        for rank in range(len(opponents) - 1, -1, -1):
+            for position, count in self.wins.get(opponents[rank], {}).items():
+                scores[position] = (BLOCK, -rank if turn_order else 0, count)
+        for position, count in self.wins.get(char, {}).items():
+            scores[position] = (WIN, count)
+        return scores
+
+    def best(self, char, turn_order=None):
+        """Return flat position with the best score for the char or None.
+
+        Ties are broken by the lowest position.
+        """
+        scores = self.scores(char, turn_order)
+        if scores:
+            return max(scores, key=lambda position: (scores[position], -position))
@@ -0,0 +1,49 @@
+import random
+from functools import lru_cache
+
+
+MASK = 2 ** 64 - 1
+
+
+@lru_cache(maxsize=None)
+def char_seed(size, char):
+    """Return the 64 bit seed of the keys of a player char on a grid size.
+
+    Random is seeded with a string, which doesn't depend on the hash seed of
+    the interpreter, so seeds are the same in every process and run.
+    """
+    return random.Random('zobrist:{}:{}'.format(size, char)).getrandbits(64)
+
+
+def zobrist_key(size, position, char):
+    """Return the 64 bit Zobrist key of a char on a flat position.
+
+    Keys are the seed of the char mixed with the position by the splitmix64
+    finalizer, so they can be computed for any position of large grids
+    without building a table.
+
+    Args:
+        size (int): Size of the grid.
+        position (int): Flat position, i.e. `x * size + y`.
+        char (str): Player char.
+    """
+    z = (char_seed(size, char) + (position + 1) * 0x9E3779B97F4A7C15) & MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK
+    return z ^ (z >> 31)
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size, char):
+    """Return tuple of Zobrist keys of a char for every flat position."""
+    return tuple( zobrist_key(size, position, char)
+                  for position in range(size ** 2) )
+
+
+def zobrist_hash(size, cells):
+    """Return the Zobrist hash of (flat position, char) pairs of taken
+    positions, the same as `Grid.zobrist` of a grid holding them."""
+    value = 0
+    for position, char in cells:
+        value ^= zobrist_key(size, position, char)
+    return value